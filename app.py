@@ -13,6 +13,8 @@ from tqdm import tqdm
 from audio_processor import AudioProcessor
 from video_generator import VideoGenerator
 from lyric_effects import LyricEffects
+from batch_pipeline import LyricVideoPipeline
+from preview_transcriber import PreviewTranscriber
 
 # Set UI theme
 ctk.set_appearance_mode("dark")  # Mode: system (default), light, dark
@@ -41,6 +43,16 @@ class LyricVideoApp(ctk.CTk):
         self.whisper_model = tk.StringVar(value="base")
         self.text_position = tk.StringVar(value="center")
         self.color_effect = tk.StringVar(value="none")
+        self.sidecar_policy = tk.StringVar(value="prefer_whisper")
+        self.pipeline_mode = tk.BooleanVar(value=True)
+        self.use_vad = tk.BooleanVar(value=False)
+        self.fast_preview = tk.BooleanVar(value=False)
+        self.variable_frame_rate = tk.BooleanVar(value=False)
+        self.render_mode = tk.StringVar(value="moviepy")
+        self.subtitle_format = tk.StringVar(value="mov_text")
+        self.parallel_render = tk.BooleanVar(value=False)
+        self.ring_writer = tk.BooleanVar(value=False)
+        self.publish_variants = tk.BooleanVar(value=False)
         
         # Daftar font umum
         self.fonts = [
@@ -73,7 +85,8 @@ class LyricVideoApp(ctk.CTk):
             "glow",
             "shake",
             "wave",
-            "rainbow"
+            "rainbow",
+            "karaoke"
         ]
         
         # Posisi teks yang tersedia
@@ -116,6 +129,9 @@ class LyricVideoApp(ctk.CTk):
             "large"
         ]
         
+        # Kebijakan file lirik sidecar (.lrc/.srt/.vtt/.json)
+        self.sidecar_policies = list(AudioProcessor.SIDECAR_POLICIES)
+        
         # Create UI
         self.create_ui()
         
@@ -123,7 +139,13 @@ class LyricVideoApp(ctk.CTk):
         self.font_path = None
         
         # Inisialisasi processor dan generator
-        self.audio_processor = AudioProcessor(model_size=self.whisper_model.get())
+        self.audio_processor = AudioProcessor(
+            model_size=self.whisper_model.get(),
+            sidecar_policy=self.sidecar_policy.get(),
+            use_vad=self.use_vad.get(),
+            # Efek karaoke butuh timestamp per kata
+            word_timestamps=self.text_effect.get() == "karaoke"
+        )
         self.video_generator = VideoGenerator(
             output_path=self.output_folder.get(),
             font=self.selected_font.get(),
@@ -315,6 +337,56 @@ class LyricVideoApp(ctk.CTk):
         model_dropdown = ctk.CTkOptionMenu(video_frame, values=self.whisper_models, variable=self.whisper_model)
         model_dropdown.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
         
+        # Sidecar Lyrics
+        sidecar_label = ctk.CTkLabel(video_frame, text="Lyrics Source:")
+        sidecar_label.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        
+        sidecar_dropdown = ctk.CTkOptionMenu(video_frame, values=self.sidecar_policies, variable=self.sidecar_policy)
+        sidecar_dropdown.grid(row=5, column=1, padx=5, pady=5, sticky="ew")
+        
+        # Pipeline mode: render lagu N sambil transkrip lagu N+1
+        pipeline_check = ctk.CTkCheckBox(video_frame, text="Render while transcribing", variable=self.pipeline_mode)
+        pipeline_check.grid(row=6, column=1, padx=5, pady=5, sticky="w")
+        
+        # VAD: lewati intro/solo/outro instrumental sebelum Whisper
+        vad_check = ctk.CTkCheckBox(video_frame, text="Skip instrumental parts (VAD)", variable=self.use_vad)
+        vad_check.grid(row=7, column=1, padx=5, pady=5, sticky="w")
+        
+        # Preview cepat pakai model tiny, model pilihan jalan di background
+        preview_check = ctk.CTkCheckBox(video_frame, text="Fast preview (tiny model first)", variable=self.fast_preview)
+        preview_check.grid(row=8, column=1, padx=5, pady=5, sticky="w")
+        
+        # VFR: frame identik (gap instrumental, teks diam) tidak di-encode ulang
+        vfr_check = ctk.CTkCheckBox(video_frame, text="Variable frame rate (drop static frames)", variable=self.variable_frame_rate)
+        vfr_check.grid(row=9, column=1, padx=5, pady=5, sticky="w")
+        
+        # Render engine: moviepy (semua efek), ffmpeg + subtitle ASS (cepat),
+        # atau soft (still + audio + track lirik yang bisa dipilih, tanpa render teks)
+        render_label = ctk.CTkLabel(video_frame, text="Render Engine:")
+        render_label.grid(row=10, column=0, padx=5, pady=5, sticky="w")
+        
+        render_dropdown = ctk.CTkOptionMenu(video_frame, values=["moviepy", "ass", "soft"], variable=self.render_mode)
+        render_dropdown.grid(row=10, column=1, padx=5, pady=5, sticky="ew")
+        
+        # Format track lirik untuk engine 'soft' (mov_text -> .mp4, srt/webvtt -> .mkv)
+        subtitle_label = ctk.CTkLabel(video_frame, text="Subtitle Track:")
+        subtitle_label.grid(row=11, column=0, padx=5, pady=5, sticky="w")
+        
+        subtitle_dropdown = ctk.CTkOptionMenu(video_frame, values=["mov_text", "srt", "webvtt"], variable=self.subtitle_format)
+        subtitle_dropdown.grid(row=11, column=1, padx=5, pady=5, sticky="ew")
+        
+        # Render satu video paralel per potongan waktu (pakai semua core)
+        parallel_check = ctk.CTkCheckBox(video_frame, text="Parallel render (split video across cores)", variable=self.parallel_render)
+        parallel_check.grid(row=12, column=1, padx=5, pady=5, sticky="w")
+        
+        # Frame dirender ke ring buffer, thread terpisah mengirimnya ke ffmpeg
+        ring_check = ctk.CTkCheckBox(video_frame, text="Overlap render and encode (ring buffer writer)", variable=self.ring_writer)
+        ring_check.grid(row=13, column=1, padx=5, pady=5, sticky="w")
+        
+        # Satu job per lagu untuk landscape 1080p, portrait 1080x1920 dan preview 720p
+        variants_check = ctk.CTkCheckBox(video_frame, text="Publish set (landscape 1080p, portrait, 720p preview)", variable=self.publish_variants)
+        variants_check.grid(row=14, column=1, padx=5, pady=5, sticky="w")
+        
         # Configure grid
         video_frame.columnconfigure(1, weight=1)
         
@@ -684,9 +756,24 @@ class LyricVideoApp(ctk.CTk):
     def generate_videos(self):
         """Generate lyric videos (run in separate thread)"""
         try:
-            # Update audio processor settings
-            self.audio_processor = AudioProcessor(model_size=self.whisper_model.get())
+            # Update audio processor settings (model lama dilepas ke registry, tetap warm)
+            self.audio_processor.release_model()
+            self.audio_processor = AudioProcessor(
+                model_size=self.whisper_model.get(),
+                sidecar_policy=self.sidecar_policy.get(),
+                use_vad=self.use_vad.get(),
+                # Efek karaoke butuh timestamp per kata
+                word_timestamps=self.text_effect.get() == "karaoke"
+            )
             
+            if self.fast_preview.get() and self.whisper_model.get() != "tiny":
+                self.generate_videos_two_pass()
+                return
+                
+            if self.pipeline_mode.get():
+                self.generate_videos_pipelined()
+                return
+                
             # Process audio files
             self.log(f"📝 Transcribing audio files with Whisper model: {self.whisper_model.get()}")
             self.log("💡 This may take a while depending on the audio files...")
@@ -706,20 +793,7 @@ class LyricVideoApp(ctk.CTk):
                 self.log(f"  → Transcribed: {filename}")
                 
             # Update video generator settings
-            self.video_generator = VideoGenerator(
-                output_path=self.output_folder.get(),
-                background_image_path=self.image_folder.get(),
-                font=self.font_path if self.font_path else self.selected_font.get(),
-                font_size=self.font_size.get(),
-                font_color=self.font_color.get(),
-                text_effect=self.text_effect.get(),
-                quality=self.video_quality.get(),
-                text_position=self.text_position.get(),
-                color_effect=self.color_effect.get()
-            )
-            
-            # Tambahkan informasi audio_folder ke video_generator
-            self.video_generator.audio_folder = self.audio_folder.get()
+            self.video_generator = self.create_video_generator()
             
             # Generate videos
             self.log(f"🎬 Generating {self.video_ratio.get()} videos with {self.text_effect.get()} effect...")
@@ -741,7 +815,8 @@ class LyricVideoApp(ctk.CTk):
             
             output_videos = self.video_generator.batch_generate(
                 lyrics_dict, 
-                output_ratio=self.video_ratio.get()
+                output_ratio=self.video_ratio.get(),
+                workers=(os.cpu_count() or 1) if self.parallel_render.get() else 1
             )
             
             # Show completion
@@ -760,6 +835,118 @@ class LyricVideoApp(ctk.CTk):
             # Reset button state
             self.after(0, self.reset_ui)
             
+    def create_video_generator(self):
+        """Create video generator from current UI settings"""
+        video_generator = VideoGenerator(
+            output_path=self.output_folder.get(),
+            background_image_path=self.image_folder.get(),
+            font=self.font_path if self.font_path else self.selected_font.get(),
+            font_size=self.font_size.get(),
+            font_color=self.font_color.get(),
+            text_effect=self.text_effect.get(),
+            quality=self.video_quality.get(),
+            text_position=self.text_position.get(),
+            color_effect=self.color_effect.get(),
+            variable_frame_rate=self.variable_frame_rate.get(),
+            render_mode=self.render_mode.get(),
+            subtitle_format=self.subtitle_format.get(),
+            language=None if self.language.get() == "auto" else self.language.get(),
+            render_shards=(os.cpu_count() or 1) if self.parallel_render.get() else 1,
+            frame_writer="ring" if self.ring_writer.get() else "moviepy",
+            variants=VideoGenerator.PUBLISH_VARIANTS if self.publish_variants.get() else None
+        )
+        
+        if self.publish_variants.get():
+            variants = ", ".join(f"{ratio} {quality}" for ratio, quality in VideoGenerator.PUBLISH_VARIANTS)
+            self.log(f"🎞 Publish set ({self.render_mode.get()} render): {variants} per song (ratio setting ignored)")
+            if self.parallel_render.get():
+                self.log("⚠️ Parallel render is not used for publish sets")
+        
+        # Tambahkan informasi audio_folder ke video_generator
+        video_generator.audio_folder = self.audio_folder.get()
+        return video_generator
+        
+    def generate_videos_pipelined(self):
+        """Transcribe and render in a pipeline (song N renders while song N+1 transcribes)"""
+        self.video_generator = self.create_video_generator()
+        
+        self.log(f"📝 Transcribing with Whisper model: {self.whisper_model.get()} (pipeline mode)")
+        self.log(f"🎬 Rendering {self.video_ratio.get()} videos as soon as each song is transcribed...")
+        
+        def on_video(filename, output_video):
+            self.log(f"  → Video ready: {os.path.basename(output_video)}")
+            
+        pipeline = LyricVideoPipeline(self.audio_processor, self.video_generator)
+        lyrics_dict, output_videos = pipeline.run(
+            self.audio_folder.get(),
+            language=None if self.language.get() == "auto" else self.language.get(),
+            output_ratio=self.video_ratio.get(),
+            on_video=on_video
+        )
+        
+        if not lyrics_dict:
+            self.log("❌ No transcription results. Check audio files.")
+        elif output_videos:
+            self.log(f"✅ Generated {len(output_videos)} videos!")
+            self.log(f"⏱️ First video after {pipeline.first_video_latency:.1f}s, total {pipeline.total_time:.1f}s")
+            self.log(f"📂 Videos saved to: {self.output_folder.get()}")
+        else:
+            self.log("❌ No videos were generated. Check logs for errors.")
+            
+    def generate_videos_two_pass(self):
+        """Show a tiny-model preview first, then render with the refined transcript"""
+        self.video_generator = self.create_video_generator()
+        language = None if self.language.get() == "auto" else self.language.get()
+        audio_folder = self.audio_folder.get()
+        
+        self.log(f"⚡ Fast preview with tiny model, refining with: {self.whisper_model.get()}")
+        
+        transcriber = PreviewTranscriber(self.audio_processor)
+        output_videos = []
+        
+        try:
+            for audio_file in AudioProcessor.list_audio_files(audio_folder):
+                audio_path = os.path.join(audio_folder, audio_file)
+                
+                try:
+                    refinement = transcriber.start(audio_path, language)
+                    
+                    if not refinement.done:
+                        self.log(f"👀 Preview {audio_file}: {len(refinement.preview)} lines")
+                        for lyric in refinement.preview[:3]:
+                            self.log(f"  [{lyric['start']:.1f}s] {lyric['text']}")
+                        # Layout teks disiapkan dari preview selagi model final jalan
+                        self.video_generator.prepare_text_clips(refinement.preview, self.video_ratio.get())
+                        
+                    lyrics = refinement.wait()
+                    if refinement.preview is not lyrics:
+                        if refinement.dirty_ranges:
+                            changed = ", ".join(f"{start:.1f}-{end:.1f}s" for start, end in refinement.dirty_ranges[:5])
+                            self.log(f"🔁 Refined {audio_file}: changed {changed}")
+                        # Cuma baris di rentang yang berubah yang dibuat ulang
+                        self.video_generator.prepare_text_clips(
+                            lyrics, self.video_ratio.get(), dirty_ranges=refinement.dirty_ranges
+                        )
+                        
+                    self.audio_processor.save_result(audio_path, lyrics, refinement.source)
+                    
+                    for output_video in self.video_generator.generate_videos(
+                        lyrics, self.video_ratio.get(), audio_path=audio_path
+                    ):
+                        output_videos.append(output_video)
+                        self.log(f"  → Video ready: {os.path.basename(output_video)}")
+                        
+                except Exception as e:
+                    self.log(f"❌ Error processing {audio_file}: {str(e)}")
+        finally:
+            transcriber.close()
+            
+        if output_videos:
+            self.log(f"✅ Generated {len(output_videos)} videos!")
+            self.log(f"📂 Videos saved to: {self.output_folder.get()}")
+        else:
+            self.log("❌ No videos were generated. Check logs for errors.")
+            
     def reset_ui(self):
         """Reset UI state after processing"""
         generate_button = self.main_frame.winfo_children()[-1].winfo_children()[0]
@@ -0,0 +1,271 @@
+import colorsys
+import os
+import re
+
+import ffmpeg
+from PIL import ImageColor, ImageFont
+
+class AssRenderer:
+    """
+    Render video lirik langsung dengan ffmpeg + subtitle ASS (libass)
+
+    Lirik dan style diubah jadi script .ass, lalu ffmpeg membakar subtitle itu
+    di atas background still yang di-loop. Tidak ada render frame di Python,
+    jadi jauh lebih cepat dari jalur moviepy. Hanya efek yang bisa diekspresikan
+    dengan tag ASS yang didukung, sisanya tetap lewat moviepy.
+    """
+
+    # Efek yang bisa ditulis dengan tag ASS (\fad, \move, \t, \kf)
+    SUPPORTED_EFFECTS = (
+        "none", "fade_in", "fade_out", "fade_both",
+        "slide_left", "slide_right", "slide_top", "slide_bottom",
+        "zoom_in", "karaoke", "color_gradient", "color_spectrum", "rainbow"
+    )
+
+    RAINBOW_COLORS = ['red', 'orange', 'yellow', 'green', 'blue', 'purple']
+
+    @staticmethod
+    def supports(effect_name):
+        """
+        True kalau efek bisa dirender lewat ASS
+        """
+        return effect_name in AssRenderer.SUPPORTED_EFFECTS
+
+    @staticmethod
+    def ass_color(color):
+        """
+        Konversi warna (nama / hex / tuple RGB) ke format ASS &H00BBGGRR
+        """
+        if isinstance(color, str):
+            r, g, b = ImageColor.getrgb(color)[:3]
+        else:
+            r, g, b = [int(round(c)) for c in color[:3]]
+        return f"&H00{b:02X}{g:02X}{r:02X}"
+
+    @staticmethod
+    def ass_time(seconds):
+        """
+        Format waktu ASS: H:MM:SS.cc
+        """
+        centis = int(round(max(0.0, seconds) * 100))
+        hours, centis = divmod(centis, 360000)
+        minutes, centis = divmod(centis, 6000)
+        secs, centis = divmod(centis, 100)
+        return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+    @staticmethod
+    def escape_text(text):
+        """
+        Buang karakter yang punya arti khusus di ASS
+        """
+        text = text.replace("\\", "/").replace("{", "(").replace("}", ")")
+        return re.sub(r'\s*\n\s*', ' ', text)
+
+    @staticmethod
+    def font_info(font):
+        """
+        Nama font untuk style ASS dan folder font untuk libass
+
+        Returns:
+            tuple: (font_name, fonts_dir atau None)
+        """
+        if font and os.path.exists(font):
+            try:
+                family = ImageFont.truetype(font, 12).getname()[0]
+            except Exception:
+                family = os.path.splitext(os.path.basename(font))[0]
+            return family, os.path.dirname(os.path.abspath(font))
+        return font or "Arial", None
+
+    @staticmethod
+    def _karaoke_text(lyric):
+        """
+        Teks dengan tag \\kf per kata (durasi dalam centisecond)
+        """
+        start = lyric['start']
+        duration = lyric['end'] - start
+        words = lyric.get('words') or []
+
+        if words:
+            timed = [(word['word'], word['start'] - start, word['end'] - start) for word in words]
+        else:
+            # Tanpa word timestamp: durasi dibagi rata per jumlah karakter kata
+            tokens = lyric['text'].split()
+            total_chars = sum(len(token) for token in tokens) or 1
+            timed = []
+            t = 0.0
+            for token in tokens:
+                word_duration = duration * len(token) / total_chars
+                timed.append((token, t, t + word_duration))
+                t += word_duration
+
+        parts = []
+        cursor = 0.0
+        for i, (word, word_start, word_end) in enumerate(timed):
+            gap = int(round((word_start - cursor) * 100))
+            if gap > 0:
+                parts.append(f"{{\\k{gap}}}")
+            length = max(1, int(round((word_end - max(word_start, cursor)) * 100)))
+            separator = " " if i < len(timed) - 1 else ""
+            parts.append(f"{{\\kf{length}}}{AssRenderer.escape_text(word.strip())}{separator}")
+            cursor = max(cursor, word_end)
+        return "".join(parts)
+
+    @staticmethod
+    def _color_keyframes(effect_name, duration, gradient_colors=None):
+        """
+        Daftar (detik, warna RGB) untuk efek warna, diinterpolasi linear oleh \\t
+        """
+        if effect_name == "color_gradient":
+            colors = gradient_colors or ['#FF0000', '#0000FF']
+            return [(0.0, ImageColor.getrgb(colors[0])[:3]), (duration, ImageColor.getrgb(colors[1])[:3])]
+        elif effect_name == "color_spectrum":
+            keyframes = []
+            for k in range(7):
+                r, g, b = colorsys.hsv_to_rgb((k / 6.0) % 1.0, 1.0, 1.0)
+                keyframes.append((duration * k / 6.0, (r * 255, g * 255, b * 255)))
+            return keyframes
+        elif effect_name == "rainbow":
+            segment = duration / len(AssRenderer.RAINBOW_COLORS)
+            return [(i * segment, ImageColor.getrgb(color)[:3]) for i, color in enumerate(AssRenderer.RAINBOW_COLORS)]
+        return []
+
+    @staticmethod
+    def event_tags(lyric, effect_name, position, screen_size, gradient_colors=None):
+        """
+        Tag override ASS untuk satu baris lirik
+        """
+        width, height = screen_size
+        duration = lyric['end'] - lyric['start']
+        ms = lambda seconds: int(round(seconds * 1000))
+
+        # Posisi sama dengan LyricEffects.apply_text_position (tepi atas teks di 20% / 80%)
+        if position == "top":
+            tags = f"\\an8\\pos({width // 2},{int(height * 0.2)})"
+        elif position == "bottom":
+            tags = f"\\an8\\pos({width // 2},{int(height * 0.8)})"
+        else:
+            tags = f"\\an5\\pos({width // 2},{height // 2})"
+
+        fade = ms(min(duration / 3, 1.5))
+        if effect_name == "fade_in":
+            tags += f"\\fad({fade},0)"
+        elif effect_name == "fade_out":
+            tags += f"\\fad(0,{fade})"
+        elif effect_name == "fade_both":
+            tags += f"\\fad({fade},{fade})"
+        elif effect_name.startswith("slide_"):
+            # Sama seperti slide_effect: masuk dari luar layar ke tengah dalam 1.5 detik
+            cx, cy = width // 2, height // 2
+            start = {
+                "slide_left": (int(width * 1.5), cy),
+                "slide_right": (-width // 2, cy),
+                "slide_top": (cx, -height // 2),
+                "slide_bottom": (cx, int(height * 1.5)),
+            }[effect_name]
+            tags = f"\\an5\\move({start[0]},{start[1]},{cx},{cy},0,{ms(min(1.5, duration))})"
+        elif effect_name == "zoom_in":
+            tags += f"\\fscx0\\fscy0\\t(0,{ms(min(1.0, duration))},\\fscx100\\fscy100)"
+        else:
+            keyframes = AssRenderer._color_keyframes(effect_name, duration, gradient_colors)
+            if keyframes:
+                tags += f"\\1c{AssRenderer.ass_color(keyframes[0][1])}"
+                for (t0, _), (t1, color) in zip(keyframes[:-1], keyframes[1:]):
+                    tags += f"\\t({ms(t0)},{ms(t1)},\\1c{AssRenderer.ass_color(color)})"
+
+        return "{" + tags + "}"
+
+    @staticmethod
+    def build_script(lyrics, effect_name, font, font_size, font_color, position, screen_size,
+                     gradient_colors=None, highlight_color="#FFD700"):
+        """
+        Bikin isi script .ass dari list lirik + style
+
+        Parameters:
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            effect_name (str): Efek (harus salah satu SUPPORTED_EFFECTS)
+            font (str): Nama font atau path file font
+            font_size (int): Ukuran font
+            font_color (str): Warna font
+            position (str): 'top', 'center', 'bottom'
+            screen_size (tuple): Ukuran video (width, height)
+            gradient_colors (list): Warna awal/akhir untuk color_gradient
+            highlight_color (str): Warna kata yang sudah dinyanyikan (karaoke)
+
+        Returns:
+            str: Isi script ASS
+        """
+        width, height = screen_size
+        font_name, _ = AssRenderer.font_info(font)
+
+        # Di ASS, \k mengubah SecondaryColour jadi PrimaryColour saat kata dinyanyikan
+        if effect_name == "karaoke":
+            primary, secondary = AssRenderer.ass_color(highlight_color), AssRenderer.ass_color(font_color)
+        else:
+            primary = secondary = AssRenderer.ass_color(font_color)
+
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {width}",
+            f"PlayResY: {height}",
+            "WrapStyle: 2",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding",
+            f"Style: Default,{font_name},{font_size},{primary},{secondary},&H00000000,&H00000000,"
+            "0,0,0,0,100,100,0,0,1,0,0,5,0,0,0,1",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+
+        for lyric in lyrics:
+            if effect_name == "karaoke":
+                text = AssRenderer._karaoke_text(lyric)
+            else:
+                text = AssRenderer.escape_text(lyric['text'])
+            tags = AssRenderer.event_tags(lyric, effect_name, position, screen_size, gradient_colors)
+            lines.append(
+                f"Dialogue: 0,{AssRenderer.ass_time(lyric['start'])},{AssRenderer.ass_time(lyric['end'])},"
+                f"Default,,0,0,0,,{tags}{text}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def render(script_path, background_path, audio_path, output_file, font=None, fps=30,
+               bitrate="8000k", audio_bitrate="320k", preset="medium", audio_codec="aac"):
+        """
+        Burn script ASS di atas background still yang di-loop, satu process ffmpeg
+
+        Parameters:
+            script_path (str): Path file .ass
+            background_path (str): Gambar background yang sudah seukuran video
+            audio_path (str): Path file audio
+            output_file (str): Path video output
+            font (str): Font (kalau berupa file, foldernya dipakai sebagai fontsdir)
+            audio_codec (str): 'aac' (transcode) atau 'copy' (stream audio asli)
+        """
+        _, fonts_dir = AssRenderer.font_info(font)
+        ass_args = {"fontsdir": fonts_dir} if fonts_dir else {}
+
+        video = ffmpeg.input(background_path, loop=1, framerate=fps).filter("ass", script_path, **ass_args)
+        audio = ffmpeg.input(audio_path).audio
+        audio_args = {"acodec": audio_codec}
+        if audio_codec != "copy":
+            audio_args["audio_bitrate"] = audio_bitrate
+
+        (
+            ffmpeg
+            .output(video, audio, output_file,
+                    vcodec="libx264", video_bitrate=bitrate, preset=preset, tune="stillimage",
+                    pix_fmt="yuv420p", shortest=None, **audio_args)
+            .global_args("-nostdin", "-loglevel", "error")
+            .overwrite_output()
+            .run()
+        )
+        return output_file
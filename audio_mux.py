@@ -0,0 +1,128 @@
+import os
+
+import ffmpeg
+
+from audio_probe import AudioProbe
+
+class PreparedAudio:
+    """
+    Audio yang siap di-mux: file asli (stream copy) atau hasil transcode
+    yang sedang/sudah jalan di process ffmpeg terpisah
+    """
+
+    def __init__(self, path, copy, process=None):
+        self.path = path
+        # True = stream audio asli di-copy tanpa transcode
+        self.copy = copy
+        self.process = process
+
+    def wait(self):
+        """
+        Tunggu transcode selesai (langsung return kalau stream copy)
+
+        Returns:
+            str: Path audio yang siap di-mux
+        """
+        if self.process is not None:
+            self.process.wait()
+            if self.process.returncode != 0:
+                raise RuntimeError(f"Audio transcode failed with code {self.process.returncode}")
+            self.process = None
+        return self.path
+
+    def cancel(self):
+        """
+        Hentikan transcode yang masih jalan (misalnya render video gagal)
+        """
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+class AudioMuxer:
+    """
+    Mux audio lagu ke video lirik tanpa transcode kalau codec-nya didukung container
+
+    Video lirik tidak mengubah audio, jadi stream audio asli (misalnya AAC dari
+    .m4a) bisa di-copy apa adanya: lebih hemat CPU dan tidak ada generation loss.
+    Codec lain di-transcode ke AAC sekali per lagu di process ffmpeg sendiri,
+    jalan bersamaan dengan render video.
+    """
+
+    # Ekstensi container -> codec audio yang bisa di-copy ke container itu
+    COPY_CODECS = {
+        ".mp4": ("aac", "mp3", "alac"),
+        ".mkv": ("aac", "mp3", "alac", "flac", "opus", "vorbis"),
+    }
+
+    @staticmethod
+    def can_copy(audio_path, container=".mp4"):
+        """
+        True kalau stream audio bisa di-copy ke container tanpa transcode
+        """
+        try:
+            codec = AudioProbe.probe(audio_path)["codec"]
+        except Exception:
+            return False
+        return codec in AudioMuxer.COPY_CODECS.get(container.lower(), ())
+
+    @staticmethod
+    def audio_codec(audio_path, container=".mp4"):
+        """
+        Codec audio untuk output ffmpeg satu tahap: 'copy' atau 'aac'
+        """
+        return "copy" if AudioMuxer.can_copy(audio_path, container) else "aac"
+
+    @staticmethod
+    def prepare(audio_path, work_dir, container=".mp4", bitrate="320k"):
+        """
+        Siapkan audio untuk mux; transcode (kalau perlu) langsung dimulai di background
+
+        Parameters:
+            audio_path (str): Path audio asli
+            work_dir (str): Folder sementara untuk hasil transcode
+            container (str): Ekstensi container output
+            bitrate (str): Bitrate AAC kalau harus transcode
+
+        Returns:
+            PreparedAudio: Panggil wait() sebelum file-nya dipakai
+        """
+        if AudioMuxer.can_copy(audio_path, container):
+            print(f"Audio stream copy: {os.path.basename(audio_path)}")
+            return PreparedAudio(audio_path, copy=True)
+
+        print(f"Transcoding audio to AAC in background: {os.path.basename(audio_path)}")
+        output_path = os.path.join(work_dir, "audio.m4a")
+        process = (
+            ffmpeg
+            .input(audio_path)
+            .audio
+            .output(output_path, acodec="aac", audio_bitrate=bitrate)
+            .global_args("-nostdin", "-loglevel", "error")
+            .overwrite_output()
+            .run_async()
+        )
+        return PreparedAudio(output_path, copy=False, process=process)
+
+    @staticmethod
+    def mux(video, prepared, output_file):
+        """
+        Gabungkan stream video dan audio, dua-duanya di-copy tanpa re-encode
+
+        Parameters:
+            video: Stream video ffmpeg-python (misalnya ffmpeg.input(path).video)
+            prepared (PreparedAudio): Audio dari prepare()
+            output_file (str): Path video output
+
+        Returns:
+            str: Path ke file output
+        """
+        audio = ffmpeg.input(prepared.wait()).audio
+        (
+            ffmpeg
+            .output(video, audio, output_file, vcodec="copy", acodec="copy", movflags="+faststart")
+            .global_args("-nostdin", "-loglevel", "error")
+            .overwrite_output()
+            .run()
+        )
+        return output_file
@@ -0,0 +1,85 @@
+import os
+import threading
+
+import ffmpeg
+
+class AudioProbe:
+    """
+    Class untuk membaca metadata audio (durasi, sample rate, channel, codec)
+    dari header container pakai ffprobe, tanpa decode audionya
+
+    Hasil probe di-cache per (path, mtime, size), jadi file yang sama tidak
+    di-probe berulang kali selama isinya tidak berubah.
+    """
+
+    # Batas jumlah entry cache di memori
+    MAX_CACHE_ENTRIES = 4096
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(audio_path):
+        stat = os.stat(audio_path)
+        return (os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def probe(audio_path):
+        """
+        Probe metadata file audio
+
+        Parameters:
+            audio_path (str): Path ke file audio
+
+        Returns:
+            dict: {'duration', 'sample_rate', 'channels', 'codec', 'bit_rate', 'format'}
+        """
+        key = AudioProbe._cache_key(audio_path)
+        with AudioProbe._lock:
+            cached = AudioProbe._cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        data = ffmpeg.probe(audio_path, select_streams="a:0")
+        streams = data.get("streams", [])
+        if not streams:
+            raise ValueError(f"No audio stream found in {audio_path}")
+
+        stream = streams[0]
+        container = data.get("format", {})
+
+        # Durasi stream lebih akurat, tapi tidak semua container menyimpannya
+        duration = stream.get("duration") or container.get("duration")
+        bit_rate = stream.get("bit_rate") or container.get("bit_rate")
+
+        info = {
+            "duration": float(duration) if duration else None,
+            "sample_rate": int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+            "channels": int(stream["channels"]) if stream.get("channels") else None,
+            "codec": stream.get("codec_name"),
+            "bit_rate": int(bit_rate) if bit_rate else None,
+            "format": container.get("format_name"),
+        }
+
+        with AudioProbe._lock:
+            if len(AudioProbe._cache) >= AudioProbe.MAX_CACHE_ENTRIES:
+                # Buang entry paling lama (dict menyimpan urutan insert)
+                AudioProbe._cache.pop(next(iter(AudioProbe._cache)))
+            AudioProbe._cache[key] = info
+
+        return dict(info)
+
+    @staticmethod
+    def get_duration(audio_path):
+        """
+        Durasi audio dalam detik dari header (None kalau tidak diketahui)
+        """
+        return AudioProbe.probe(audio_path)["duration"]
+
+    @staticmethod
+    def clear_cache():
+        """
+        Kosongkan cache probe
+        """
+        with AudioProbe._lock:
+            AudioProbe._cache.clear()
@@ -1,88 +1,508 @@
 import os
 import whisper
 import tempfile
+import traceback
+import multiprocessing
+import numpy as np
 from tqdm import tqdm
-import datetime
 from pydub import AudioSegment
 
+from transcript_cache import TranscriptCache
+from lyric_sidecar import LyricSidecar
+from model_registry import get_model_registry
+from audio_probe import AudioProbe
+from vad import VoiceActivityDetector, RegionTimeline
+from batched_transcriber import BatchedTranscriber
+
+# AudioProcessor milik worker process, diisi sekali oleh _init_transcribe_worker
+_worker_processor = None
+
+def _init_transcribe_worker(processor_kwargs, torch_threads):
+    """
+    Initializer worker pool: batasi thread torch lalu load model sekali per worker
+    """
+    global _worker_processor
+    
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+        
+    # Cache di-handle oleh main process, worker cuma transkrip
+    _worker_processor = AudioProcessor(use_cache=False, **processor_kwargs)
+    _worker_processor.load_model()
+    
+def _transcribe_worker(task):
+    """
+    Transkrip satu file di worker process. Error ditangkap per file supaya
+    satu file gagal tidak menjatuhkan seluruh pool.
+    """
+    index, audio_path, language = task
+    try:
+        return index, _worker_processor.transcribe_audio(audio_path, language), None
+    except Exception:
+        return index, None, traceback.format_exc()
+
+def _transcribe_chunk_worker(task):
+    """
+    Transkrip satu potongan audio (dibaca dari file PCM 16 kHz bersama) di worker process
+    """
+    index, pcm_path, start_sample, end_sample, options = task
+    try:
+        samples = np.memmap(pcm_path, dtype=np.float32, mode="r")
+        chunk = np.array(samples[start_sample:end_sample])
+        return index, _worker_processor._run_model(chunk, options), None
+    except Exception:
+        return index, None, traceback.format_exc()
+
 class AudioProcessor:
     """
     Class untuk memproses file audio dan mengekstrak lirik
     """
     
-    def __init__(self, model_size="base"):
+    # Kebijakan pemakaian file lirik sidecar (.lrc/.srt/.vtt/.json)
+    SIDECAR_POLICIES = ("prefer_whisper", "prefer_sidecar", "newer_than_audio")
+    
+    def __init__(self, model_size="base", use_cache=True, cache_dir=None, sidecar_policy="prefer_whisper",
+                 device=None, dtype=None, use_vad=False, word_timestamps=False,
+                 chunk_workers=1, chunk_seconds=300, long_audio_seconds=900, chunk_overlap=2.0):
         """
         Initialize the audio processor
         
         Parameters:
             model_size (str): Ukuran model Whisper ('tiny', 'base', 'small', 'medium', 'large')
+            use_cache (bool): Simpan/pakai ulang hasil transkrip dari cache di disk
+            cache_dir (str): Folder cache transkrip (opsional)
+            sidecar_policy (str): 'prefer_whisper' (sidecar cuma fallback kalau transkripsi gagal),
+                                  'prefer_sidecar' (pakai sidecar kalau ada),
+                                  'newer_than_audio' (pakai sidecar kalau lebih baru dari audionya)
+            device (str): Device model ('cpu', 'cuda'; default otomatis)
+            dtype (str): 'float32' atau 'float16'
+            use_vad (bool): Deteksi bagian vokal dulu, Whisper cuma jalan di bagian itu
+            word_timestamps (bool): Simpan timestamp per kata di lirik (key 'words'), untuk efek karaoke
+            chunk_workers (int): Worker process untuk transkripsi audio panjang per potongan (1 = off)
+            chunk_seconds (float): Target panjang tiap potongan (dipotong di bagian paling hening)
+            long_audio_seconds (float): Audio lebih panjang dari ini yang dipotong-potong
+            chunk_overlap (float): Overlap antar potongan (detik) untuk konteks di tepi potongan
         """
+        if sidecar_policy not in self.SIDECAR_POLICIES:
+            raise ValueError(f"Unsupported sidecar policy: {sidecar_policy}")
+            
         self.model = None
         self.model_size = model_size
+        self.device = device
+        self.dtype = dtype
+        self.cache = TranscriptCache(cache_dir) if use_cache else None
+        self.sidecar_policy = sidecar_policy
+        self.use_vad = use_vad
+        self.vad = VoiceActivityDetector() if use_vad else None
+        self.word_timestamps = word_timestamps
+        self.chunk_workers = chunk_workers
+        self.chunk_seconds = chunk_seconds
+        self.long_audio_seconds = long_audio_seconds
+        self.chunk_overlap = chunk_overlap
+        
+    def worker_kwargs(self):
+        """
+        Argumen untuk bikin AudioProcessor yang setara di worker process
+        
+        Opsi chunking sengaja tidak ikut: worker pool (daemon) tidak boleh
+        bikin pool lagi di dalamnya.
+        """
+        return {
+            "model_size": self.model_size,
+            "device": self.device,
+            "dtype": self.dtype,
+            "use_vad": self.use_vad,
+            "word_timestamps": self.word_timestamps,
+        }
         
     def load_model(self):
         """
         Load model Whisper jika belum diload
+        
+        Model diambil dari registry global, jadi AudioProcessor baru dengan
+        model yang sama tidak perlu load ulang dari disk.
         """
         if self.model is None:
-            print(f"Loading Whisper model '{self.model_size}'...")
-            self.model = whisper.load_model(self.model_size)
-            print("Model loaded!")
+            self.model = get_model_registry().acquire(self.model_size, self.device, self.dtype)
             
-    def transcribe_audio(self, audio_path, language=None):
+    def release_model(self):
         """
-        Transcribe audio file dan return lirik + timestamps
-        
-        Parameters:
-            audio_path (str): Path ke file audio
-            language (str): Kode bahasa (opsional, ex: 'id', 'en', 'ja')
+        Lepas model ke registry. Model tetap warm sampai kena eviction.
+        """
+        if self.model is not None:
+            get_model_registry().release(self.model_size, self.device, self.dtype)
+            self.model = None
             
-        Returns:
-            list: List of dictionaries dengan format {'text': 'lyric line', 'start': start_time, 'end': end_time}
+    def transcribe_options(self, language=None):
+        """
+        Opsi yang dikirim ke model.transcribe (juga dipakai sebagai bagian cache key)
         """
-        self.load_model()
-        
-        print(f"Transcribing: {os.path.basename(audio_path)}")
-        
         # Set language-specific options
         options = {}
         if language:
             options["language"] = language
+        if self.word_timestamps:
+            options["word_timestamps"] = True
+        return options
         
-        # Transcribe audio file
-        result = self.model.transcribe(audio_path, **options)
+    def cache_key(self, audio_path, language=None, batched=False):
+        """
+        Cache key transkrip: opsi Whisper + opsi pre-processing yang mempengaruhi hasil
+        
+        Parameters:
+            batched (bool): Key untuk hasil BatchedTranscriber (decoder window tetap,
+                            tanpa fallback temperature dan tanpa timestamp per kata)
+        """
+        options = self.transcribe_options(language)
+        if batched:
+            options.pop("word_timestamps", None)
+            options["batched"] = BatchedTranscriber.DECODER_SETTINGS
+        if self.vad is not None:
+            options["vad"] = self.vad.params()
+        if self.chunk_workers > 1:
+            options["chunking"] = [self.chunk_seconds, self.long_audio_seconds, self.chunk_overlap]
+        return self.cache.make_key(audio_path, self.model_size, options)
+        
+    def _run_model(self, audio_input, options):
+        """
+        Jalankan model.transcribe dan ambil segment-nya ke format lirik
+        """
+        self.load_model()
+        result = self.model.transcribe(audio_input, **options)
         
         # Extract segments with timestamps
         segments = result["segments"]
         lyrics = []
         
         for segment in segments:
-            lyrics.append({
+            lyric = {
                 'text': segment['text'].strip(),
                 'start': segment['start'],
                 'end': segment['end']
-            })
+            }
+            if 'words' in segment:
+                lyric['words'] = [
+                    {'word': word['word'].strip(), 'start': word['start'], 'end': word['end']}
+                    for word in segment['words']
+                ]
+            lyrics.append(lyric)
+            
+        return lyrics
+        
+    def transcribe_audio(self, audio_path, language=None, decoded_audio=None):
+        """
+        Transcribe audio file dan return lirik + timestamps
+        
+        Parameters:
+            audio_path (str): Path ke file audio
+            language (str): Kode bahasa (opsional, ex: 'id', 'en', 'ja')
+            decoded_audio (DecodedAudio): PCM yang sudah di-decode (opsional),
+                                          kalau ada Whisper tidak decode file lagi
+            
+        Returns:
+            list: List of dictionaries dengan format {'text': 'lyric line', 'start': start_time, 'end': end_time}
+        """
+        options = self.transcribe_options(language)
+        
+        # Cek cache dulu, kalau hit tidak perlu load model sama sekali
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache_key(audio_path, language)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Using cached transcript: {os.path.basename(audio_path)}")
+                return cached
+        
+        print(f"Transcribing: {os.path.basename(audio_path)}")
+        
+        # Transcribe audio file
+        if self.vad is not None:
+            lyrics = self._transcribe_vocal_regions(audio_path, options, decoded_audio)
+        elif self._is_long_audio(audio_path, decoded_audio):
+            lyrics = self._transcribe_array(self._load_samples(audio_path, decoded_audio), options)
+        else:
+            audio_input = decoded_audio.whisper_audio() if decoded_audio is not None else audio_path
+            lyrics = self._run_model(audio_input, options)
+            
+        if cache_key is not None:
+            self.cache.put(cache_key, lyrics)
             
         return lyrics
         
+    @staticmethod
+    def _load_samples(audio_path, decoded_audio=None):
+        """
+        Audio 16 kHz mono float32 untuk Whisper
+        """
+        if decoded_audio is not None:
+            return decoded_audio.whisper_audio()
+        return whisper.load_audio(audio_path)
+        
+    def _is_long_audio(self, audio_path, decoded_audio=None):
+        """
+        Cek apakah audio perlu ditranskrip per potongan secara paralel
+        """
+        if self.chunk_workers <= 1:
+            return False
+        if decoded_audio is not None:
+            duration = decoded_audio.duration
+        else:
+            duration = self.get_audio_duration(audio_path)
+        return bool(duration) and duration > self.long_audio_seconds
+        
+    def _transcribe_array(self, samples, options):
+        """
+        Transkrip array audio; kalau panjang dan chunking aktif, dipotong lalu paralel
+        """
+        duration = len(samples) / float(whisper.audio.SAMPLE_RATE)
+        if self.chunk_workers > 1 and duration > self.long_audio_seconds:
+            return self._transcribe_chunked(samples, options)
+        return self._run_model(samples, options)
+        
+    def find_split_points(self, samples, sample_rate=16000, window_s=0.1):
+        """
+        Cari titik potong di bagian paling hening sekitar tiap kelipatan chunk_seconds
+        
+        Returns:
+            list: Titik potong dalam detik, termasuk 0 dan durasi total
+        """
+        duration = len(samples) / float(sample_rate)
+        window = int(window_s * sample_rate)
+        n_windows = len(samples) // window
+        
+        # RMS per window (vectorized, per blok biar tidak bikin salinan besar sekaligus)
+        rms = np.empty(n_windows, dtype=np.float32)
+        block = 6000
+        for start in range(0, n_windows, block):
+            end = min(n_windows, start + block)
+            frames = np.asarray(samples[start * window:end * window], dtype=np.float32).reshape(-1, window)
+            rms[start:end] = np.sqrt((frames ** 2).mean(axis=1))
+            
+        search = min(30.0, self.chunk_seconds / 4.0)
+        points = [0.0]
+        target = self.chunk_seconds
+        # Jangan sisakan potongan terakhir yang terlalu pendek
+        while duration - target > self.chunk_seconds / 4.0:
+            lo = max(0, int((target - search) / window_s))
+            hi = min(n_windows, int((target + search) / window_s))
+            if hi <= lo:
+                break
+            quietest = lo + int(np.argmin(rms[lo:hi]))
+            point = (quietest + 0.5) * window_s
+            points.append(point)
+            target = point + self.chunk_seconds
+        points.append(duration)
+        return points
+        
+    @staticmethod
+    def stitch_chunks(chunk_results):
+        """
+        Gabungkan hasil tiap potongan ke satu timeline
+        
+        Parameters:
+            chunk_results (list): List of (own_start, own_end, read_start, lyrics),
+                                  lyrics dengan timestamp relatif ke read_start
+                                  
+        Returns:
+            list: Lirik gabungan tanpa duplikat di tepi potongan
+        """
+        stitched = []
+        for own_start, own_end, read_start, lyrics in chunk_results:
+            for lyric in lyrics:
+                lyric = dict(lyric)
+                lyric['start'] += read_start
+                lyric['end'] += read_start
+                if 'words' in lyric:
+                    lyric['words'] = [
+                        dict(word, start=word['start'] + read_start, end=word['end'] + read_start)
+                        for word in lyric['words']
+                    ]
+                
+                # Segment di area overlap cuma dipakai oleh potongan yang "memiliki" titik tengahnya
+                middle = (lyric['start'] + lyric['end']) / 2.0
+                if not (own_start <= middle < own_end):
+                    continue
+                    
+                # Segment yang sama bisa muncul dua kali kalau titik tengahnya pas di batas
+                if stitched and stitched[-1]['text'] == lyric['text'] and lyric['start'] < stitched[-1]['end']:
+                    stitched[-1]['end'] = max(stitched[-1]['end'], lyric['end'])
+                    continue
+                    
+                stitched.append(lyric)
+                
+        stitched.sort(key=lambda lyric: lyric['start'])
+        return stitched
+        
+    def _transcribe_chunked(self, samples, options):
+        """
+        Potong audio panjang di bagian hening, transkrip potongan-potongannya
+        paralel di worker process, lalu gabungkan dengan offset yang benar
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        duration = len(samples) / float(sample_rate)
+        points = self.find_split_points(samples, sample_rate)
+        
+        chunks = []
+        for own_start, own_end in zip(points[:-1], points[1:]):
+            read_start = max(0.0, own_start - self.chunk_overlap)
+            read_end = min(duration, own_end + self.chunk_overlap)
+            chunks.append((own_start, own_end, read_start, read_end))
+            
+        if len(chunks) <= 1:
+            return self._run_model(samples, options)
+            
+        workers = min(self.chunk_workers, len(chunks))
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        print(f"Transcribing {len(chunks)} chunks of ~{self.chunk_seconds:.0f}s with {workers} workers")
+        
+        # Audio ditulis sekali ke file, worker baca potongannya lewat memmap
+        pcm_file = tempfile.NamedTemporaryFile(suffix=".f32", delete=False)
+        try:
+            np.asarray(samples, dtype=np.float32).tofile(pcm_file)
+            pcm_file.close()
+            
+            tasks = [
+                (index, pcm_file.name, int(read_start * sample_rate), int(read_end * sample_rate), options)
+                for index, (_, _, read_start, read_end) in enumerate(chunks)
+            ]
+            
+            results = [None] * len(chunks)
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers, initializer=_init_transcribe_worker,
+                              initargs=(self.worker_kwargs(), torch_threads)) as pool:
+                for index, lyrics, error in tqdm(pool.imap(_transcribe_chunk_worker, tasks),
+                                                 total=len(tasks), desc="Transcribing chunks"):
+                    if error is not None:
+                        # Satu potongan gagal = hasil tidak lengkap, lebih baik gagal sekalian
+                        raise RuntimeError(f"Chunk {index} failed:\n{error}")
+                    results[index] = lyrics
+        finally:
+            pcm_file.close()
+            try:
+                os.unlink(pcm_file.name)
+            except OSError:
+                pass
+                
+        return self.stitch_chunks([
+            (own_start, own_end, read_start, lyrics)
+            for (own_start, own_end, read_start, _), lyrics in zip(chunks, results)
+        ])
+        
+    def _transcribe_vocal_regions(self, audio_path, options, decoded_audio=None):
+        """
+        Transkrip hanya bagian vokal hasil VAD, lalu map timestamp ke timeline asli
+        """
+        samples = self._load_samples(audio_path, decoded_audio)
+        
+        regions = self.vad.detect(samples, whisper.audio.SAMPLE_RATE)
+        total = len(samples) / float(whisper.audio.SAMPLE_RATE)
+        vocal = sum(end - start for start, end in regions)
+        print(f"VAD: {len(regions)} vocal regions, {vocal:.1f}s of {total:.1f}s")
+        
+        if not regions:
+            return []
+            
+        timeline = RegionTimeline(regions, whisper.audio.SAMPLE_RATE)
+        lyrics = self._transcribe_array(timeline.pack(samples), options)
+        return timeline.map_lyrics(lyrics)
+        
+    def load_sidecar(self, audio_path, newer_only=False):
+        """
+        Baca lirik dari file sidecar pertama yang valid
+        
+        Parameters:
+            audio_path (str): Path ke file audio
+            newer_only (bool): Hanya pakai sidecar yang lebih baru dari file audio
+            
+        Returns:
+            tuple: (lyrics, sidecar_path) atau (None, None) kalau tidak ada
+        """
+        audio_mtime = os.path.getmtime(audio_path)
+        
+        for sidecar_path in LyricSidecar.find_sidecars(audio_path):
+            if newer_only and os.path.getmtime(sidecar_path) < audio_mtime:
+                continue
+                
+            try:
+                lyrics = LyricSidecar.load(sidecar_path)
+            except Exception as e:
+                print(f"✗ Cannot parse sidecar {os.path.basename(sidecar_path)}: {str(e)}")
+                continue
+                
+            if lyrics:
+                return lyrics, sidecar_path
+                
+        return None, None
+        
+    def lookup_lyrics(self, audio_path, language=None):
+        """
+        Cari lirik tanpa menjalankan Whisper: sidecar (sesuai policy) lalu cache
+        
+        Returns:
+            tuple: (lyrics, source) atau (None, None) kalau file perlu ditranskrip
+        """
+        if self.sidecar_policy != "prefer_whisper":
+            newer_only = self.sidecar_policy == "newer_than_audio"
+            lyrics, sidecar_path = self.load_sidecar(audio_path, newer_only=newer_only)
+            if lyrics is not None:
+                return lyrics, sidecar_path
+                
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_key(audio_path, language))
+            if cached is not None:
+                print(f"Using cached transcript: {os.path.basename(audio_path)}")
+                return cached, "whisper"
+                
+        return None, None
+        
+    def get_lyrics(self, audio_path, language=None, decoded_audio=None):
+        """
+        Ambil lirik untuk file audio sesuai sidecar_policy
+        
+        Parameters:
+            audio_path (str): Path ke file audio
+            language (str): Kode bahasa (opsional)
+            decoded_audio (DecodedAudio): PCM yang sudah di-decode (opsional)
+            
+        Returns:
+            tuple: (lyrics, source) dengan source = path sidecar atau 'whisper'
+        """
+        if self.sidecar_policy != "prefer_whisper":
+            newer_only = self.sidecar_policy == "newer_than_audio"
+            lyrics, sidecar_path = self.load_sidecar(audio_path, newer_only=newer_only)
+            if lyrics is not None:
+                return lyrics, sidecar_path
+            return self.transcribe_audio(audio_path, language, decoded_audio), "whisper"
+            
+        try:
+            return self.transcribe_audio(audio_path, language, decoded_audio), "whisper"
+        except Exception:
+            # Transkripsi gagal, coba pakai sidecar kalau ada
+            lyrics, sidecar_path = self.load_sidecar(audio_path)
+            if lyrics is None:
+                raise
+            print(f"Falling back to sidecar lyrics: {os.path.basename(sidecar_path)}")
+            return lyrics, sidecar_path
+        
     def format_lyrics(self, lyrics, formatting="srt"):
         """
         Format lirik ke format yang diinginkan
         
         Parameters:
             lyrics (list): List of lyric dictionaries
-            formatting (str): Format output ('srt', 'txt', 'json')
+            formatting (str): Format output ('srt', 'vtt', 'txt', 'json')
             
         Returns:
             str or dict: Formatted lyrics
         """
         if formatting == "srt":
-            srt_content = ""
-            for i, lyric in enumerate(lyrics):
-                start_time = str(datetime.timedelta(seconds=lyric['start'])).replace(".", ",")[:11]
-                end_time = str(datetime.timedelta(seconds=lyric['end'])).replace(".", ",")[:11]
-                srt_content += f"{i+1}\n{start_time} --> {end_time}\n{lyric['text']}\n\n"
-            return srt_content
+            return LyricSidecar.to_srt(lyrics)
+            
+        elif formatting == "vtt":
+            return LyricSidecar.to_vtt(lyrics)
             
         elif formatting == "txt":
             return "\n".join([lyric['text'] for lyric in lyrics])
@@ -93,13 +513,89 @@ class AudioProcessor:
         else:
             raise ValueError(f"Unsupported format: {formatting}")
             
-    def process_audio_directory(self, directory_path, language=None):
+    def _store_result(self, results, audio_path, lyrics, source):
+        """
+        Simpan lirik ke dict hasil dan tulis .srt kalau hasilnya dari Whisper
+        """
+        # Simpan hasil transkrip dengan nama file tanpa ekstensi
+        # Tetapi pastikan nama file mudah dicocokkan nanti
+        filename = os.path.splitext(os.path.basename(audio_path))[0]
+        print(f"Adding to results with key: {filename}")
+        results[filename] = lyrics
+        self.save_result(audio_path, lyrics, source)
+        
+    def save_result(self, audio_path, lyrics, source):
+        """
+        Tulis .srt di samping file audio kalau lirik hasil Whisper
+        (lirik dari sidecar tidak ditulis ulang)
+        
+        Parameters:
+            audio_path (str): Path ke file audio
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            source (str): 'whisper' atau path sidecar (dari get_lyrics)
+        """
+        filename = os.path.splitext(os.path.basename(audio_path))[0]
+        if source != "whisper":
+            print(f"✓ Loaded sidecar lyrics: {os.path.basename(source)}")
+            return
+            
+        # Save transcript to file
+        with open(f"{os.path.splitext(audio_path)[0]}.srt", "w", encoding="utf-8") as f:
+            f.write(self.format_lyrics(lyrics, formatting="srt"))
+            
+        print(f"✓ Transcribed: {filename}")
+        
+    @staticmethod
+    def list_audio_files(directory_path):
+        """
+        List file audio dalam direktori, diurutkan supaya hasilnya deterministik
+        """
+        return sorted(f for f in os.listdir(directory_path) 
+                      if f.lower().endswith(('.mp3', '.wav', '.flac', '.ogg', '.m4a')))
+        
+    def iter_audio_directory(self, directory_path, language=None, audio_store=None):
+        """
+        Versi streaming dari process_audio_directory: yield tiap file begitu
+        liriknya siap, supaya tahap berikutnya (render) bisa langsung jalan
+        
+        Parameters:
+            directory_path (str): Path ke direktori audio
+            language (str): Kode bahasa (opsional)
+            audio_store (DecodedAudioStore): Kalau diisi, tiap file di-decode sekali
+                                             dan PCM-nya ikut di-yield untuk tahap render.
+                                             Pemanggil wajib audio_store.release(audio_path).
+            
+        Yields:
+            tuple: (filename, audio_path, lyrics, decoded_audio atau None)
+        """
+        for audio_file in self.list_audio_files(directory_path):
+            audio_path = os.path.join(directory_path, audio_file)
+            decoded_audio = None
+            
+            try:
+                if audio_store is not None:
+                    decoded_audio = audio_store.acquire(audio_path)
+                lyrics, source = self.get_lyrics(audio_path, language, decoded_audio)
+                self.save_result(audio_path, lyrics, source)
+            except Exception as e:
+                print(f"✗ Error processing {audio_file}: {str(e)}")
+                traceback.print_exc()
+                if decoded_audio is not None:
+                    audio_store.release(audio_path)
+                continue
+                
+            yield os.path.splitext(audio_file)[0], audio_path, lyrics, decoded_audio
+            
+    def process_audio_directory(self, directory_path, language=None, workers=1, batch_size=None):
         """
         Process semua file audio dalam direktori dan return hasil transkrip
         
         Parameters:
             directory_path (str): Path ke direktori audio
             language (str): Kode bahasa (opsional)
+            workers (int): Jumlah worker process untuk transkripsi paralel (1 = serial)
+            batch_size (int): Kalau diisi, file pendek ditranskrip bareng dalam batch
+                              window 30 detik sebanyak ini (lihat transcribe_batch)
             
         Returns:
             dict: Dictionary dengan format {filename: lyrics}
@@ -107,8 +603,7 @@ class AudioProcessor:
         results = {}
         
         # List semua file audio
-        audio_files = [f for f in os.listdir(directory_path) 
-                      if f.lower().endswith(('.mp3', '.wav', '.flac', '.ogg', '.m4a'))]
+        audio_files = self.list_audio_files(directory_path)
         
         if not audio_files:
             print(f"No audio files found in {directory_path}")
@@ -117,33 +612,181 @@ class AudioProcessor:
         print(f"Found {len(audio_files)} audio files")
         print(f"Audio files: {', '.join(audio_files[:5])} {'and more...' if len(audio_files) > 5 else ''}")
         
-        # Proses tiap file
-        for audio_file in tqdm(audio_files, desc="Processing audio files"):
-            audio_path = os.path.join(directory_path, audio_file)
+        if workers and workers > 1:
+            results = self._process_parallel(directory_path, audio_files, language, workers)
+        elif batch_size and batch_size > 1:
+            results = self._process_batched(directory_path, audio_files, language, batch_size)
+        else:
+            # Proses tiap file
+            for audio_file in tqdm(audio_files, desc="Processing audio files"):
+                audio_path = os.path.join(directory_path, audio_file)
+                
+                try:
+                    lyrics, source = self.get_lyrics(audio_path, language)
+                    self._store_result(results, audio_path, lyrics, source)
+                    
+                except Exception as e:
+                    print(f"✗ Error processing {audio_file}: {str(e)}")
+                    traceback.print_exc()
+                    
+        print(f"Total results processed: {len(results)} files")
+        print(f"Result keys: {list(results.keys())}")
+        return results
+        
+    def _process_parallel(self, directory_path, audio_files, language, workers):
+        """
+        Transkripsi paralel pakai process pool
+        
+        Sidecar dan cache dicek dulu di main process, jadi hanya file yang
+        benar-benar perlu Whisper yang dikirim ke worker. Tiap worker load
+        model sekali lalu mengambil file dari antrian bersama.
+        """
+        audio_paths = [os.path.join(directory_path, f) for f in audio_files]
+        resolved, pending = self._lookup_all(audio_paths, language)
+        tasks = [(index, audio_paths[index], language) for index in pending]
+        
+        if tasks:
+            workers = min(workers, len(tasks))
+            # Bagi core ke tiap worker supaya thread torch tidak oversubscribe
+            torch_threads = max(1, (os.cpu_count() or 1) // workers)
+            print(f"Transcribing {len(tasks)} files with {workers} workers ({torch_threads} threads each)")
             
+            # 'spawn' lebih aman untuk torch dibanding fork
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers, initializer=_init_transcribe_worker,
+                              initargs=(self.worker_kwargs(), torch_threads)) as pool:
+                # imap (chunksize=1) = antrian bersama, hasil tetap urut sesuai input
+                for index, lyrics, error in tqdm(pool.imap(_transcribe_worker, tasks),
+                                                 total=len(tasks), desc="Processing audio files"):
+                    audio_path = audio_paths[index]
+                    
+                    if error is not None:
+                        print(f"✗ Error processing {os.path.basename(audio_path)}:\n{error}")
+                        if self.sidecar_policy == "prefer_whisper":
+                            # Sama seperti mode serial: sidecar jadi fallback
+                            sidecar_lyrics, sidecar_path = self.load_sidecar(audio_path)
+                            if sidecar_lyrics is not None:
+                                resolved[index] = (sidecar_lyrics, sidecar_path)
+                        continue
+                        
+                    if self.cache is not None:
+                        self.cache.put(self.cache_key(audio_path, language), lyrics)
+                    resolved[index] = (lyrics, "whisper")
+                    
+        return self._collect_results(audio_paths, resolved)
+        
+    def _lookup_all(self, audio_paths, language):
+        """
+        Cek sidecar/cache semua file di main process
+        
+        Returns:
+            tuple: (resolved, pending) - resolved[i] = (lyrics, source) atau None,
+                   pending = index file yang masih perlu Whisper
+        """
+        resolved = [None] * len(audio_paths)
+        pending = []
+        
+        for index, audio_path in enumerate(audio_paths):
             try:
-                lyrics = self.transcribe_audio(audio_path, language)
+                lyrics, source = self.lookup_lyrics(audio_path, language)
+            except Exception as e:
+                print(f"✗ Error processing {os.path.basename(audio_path)}: {str(e)}")
+                traceback.print_exc()
+                continue
+            if lyrics is not None:
+                resolved[index] = (lyrics, source)
+            else:
+                pending.append(index)
                 
-                # Simpan hasil transkrip dengan nama file tanpa ekstensi
-                # Tetapi pastikan nama file mudah dicocokkan nanti
-                filename = os.path.splitext(audio_file)[0]
-                print(f"Adding to results with key: {filename}")
-                results[filename] = lyrics
+        return resolved, pending
+        
+    def _collect_results(self, audio_paths, resolved):
+        """
+        Susun dict hasil sesuai urutan file (dan tulis .srt untuk hasil Whisper)
+        """
+        results = {}
+        for audio_path, item in zip(audio_paths, resolved):
+            if item is None:
+                continue
+            try:
+                self._store_result(results, audio_path, *item)
+            except Exception as e:
+                print(f"✗ Error processing {os.path.basename(audio_path)}: {str(e)}")
+                traceback.print_exc()
                 
-                # Save transcript to file
-                with open(f"{os.path.splitext(audio_path)[0]}.srt", "w", encoding="utf-8") as f:
-                    f.write(self.format_lyrics(lyrics, formatting="srt"))
-                    
-                print(f"✓ Transcribed: {filename}")
+        return results
+        
+    def transcribe_batch(self, audio_paths, language=None, batch_size=8):
+        """
+        Transkrip beberapa file sekaligus dalam satu batch encoder/decoder
+        
+        Parameters:
+            audio_paths (list): List path file audio
+            language (str): Kode bahasa (opsional)
+            batch_size (int): Jumlah window 30 detik per batch
+            
+        Returns:
+            list: List lirik per file, urutan sama dengan audio_paths
+        """
+        self.load_model()
+        print(f"Batch transcribing {len(audio_paths)} files: {', '.join(os.path.basename(p) for p in audio_paths)}")
+        
+        audio_list = [whisper.load_audio(audio_path) for audio_path in audio_paths]
+        transcriber = BatchedTranscriber(self.model, language=language, batch_size=batch_size)
+        return transcriber.transcribe(audio_list)
+        
+    def _process_batched(self, directory_path, audio_files, language, batch_size, max_seconds=360):
+        """
+        Transkripsi batch lintas file untuk lagu-lagu pendek
+        
+        File yang lebih panjang dari max_seconds (atau kalau VAD / timestamp per
+        kata aktif) tetap lewat jalur transcribe_audio biasa. Hasil batch
+        disimpan dengan cache key sendiri (batched=True), jadi tidak pernah
+        dipakai sebagai hasil model.transcribe biasa.
+        """
+        audio_paths = [os.path.join(directory_path, f) for f in audio_files]
+        resolved, pending = self._lookup_all(audio_paths, language)
+        
+        short, regular = [], []
+        for index in pending:
+            duration = self.get_audio_duration(audio_paths[index])
+            # Decode batch tidak menghasilkan timestamp per kata
+            if self.vad is None and not self.word_timestamps and duration and duration <= max_seconds:
+                cached = None
+                if self.cache is not None:
+                    cached = self.cache.get(self.cache_key(audio_paths[index], language, batched=True))
+                if cached is not None:
+                    resolved[index] = (cached, "whisper")
+                else:
+                    short.append(index)
+            else:
+                regular.append(index)
                 
+        # Satu grup = file secukupnya untuk mengisi beberapa batch, biar memori audio tetap kecil
+        group_size = max(1, batch_size)
+        for group_start in tqdm(range(0, len(short), group_size), desc="Batch transcribing"):
+            group = short[group_start:group_start + group_size]
+            try:
+                lyrics_list = self.transcribe_batch([audio_paths[i] for i in group], language, batch_size)
             except Exception as e:
-                print(f"✗ Error processing {audio_file}: {str(e)}")
-                import traceback
+                print(f"✗ Batch failed, falling back to per-file transcription: {str(e)}")
                 traceback.print_exc()
+                regular.extend(group)
+                continue
                 
-        print(f"Total results processed: {len(results)} files")
-        print(f"Result keys: {list(results.keys())}")
-        return results
+            for index, lyrics in zip(group, lyrics_list):
+                if self.cache is not None:
+                    self.cache.put(self.cache_key(audio_paths[index], language, batched=True), lyrics)
+                resolved[index] = (lyrics, "whisper")
+                
+        for index in sorted(regular):
+            try:
+                resolved[index] = self.get_lyrics(audio_paths[index], language)
+            except Exception as e:
+                print(f"✗ Error processing {os.path.basename(audio_paths[index])}: {str(e)}")
+                traceback.print_exc()
+                
+        return self._collect_results(audio_paths, resolved)
         
     @staticmethod
     def get_audio_duration(audio_path):
@@ -156,6 +799,14 @@ class AudioProcessor:
         Returns:
             float: Durasi audio dalam detik
         """
+        # Baca dari header dulu, jauh lebih murah daripada decode seluruh file
+        try:
+            duration = AudioProbe.get_duration(audio_path)
+            if duration:
+                return duration
+        except Exception as e:
+            print(f"Probe failed, decoding audio to get duration: {str(e)}")
+            
         try:
             audio = AudioSegment.from_file(audio_path)
             return len(audio) / 1000.0  # Convert milliseconds to seconds
@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import ffmpeg
+import numpy as np
+
+# Sample rate yang dipakai Whisper
+WHISPER_SAMPLE_RATE = 16000
+
+class DecodedAudio:
+    """
+    Satu file audio yang sudah di-decode sekali ke file PCM (memory-mapped)
+
+    Decode-nya sama persis dengan whisper.load_audio (ffmpeg, 16 kHz mono
+    s16le), jadi transkrip dari PCM ini identik dengan transkrip dari file
+    aslinya dan boleh memakai cache key yang sama. Durasi juga diambil dari
+    PCM ini. Audio untuk video tidak diambil dari sini: muxer memakai stream
+    audio asli (copy) atau transcode dari file sumber.
+    """
+
+    def __init__(self, audio_path, pcm_path):
+        """
+        Decode audio ke pcm_path
+
+        Parameters:
+            audio_path (str): Path ke file audio sumber
+            pcm_path (str): Path file PCM s16le yang akan ditulis
+        """
+        self.audio_path = audio_path
+        self.pcm_path = pcm_path
+        self.sample_rate = WHISPER_SAMPLE_RATE
+
+        self._decode()
+        self._samples = np.memmap(pcm_path, dtype=np.int16, mode="r")
+        self._whisper_audio = None
+
+    def _decode(self):
+        """
+        Decode pakai ffmpeg langsung ke file (streaming, tidak ditampung di memori)
+
+        Argumen ffmpeg sama dengan whisper.load_audio: -ac 1 -ar 16000 pcm_s16le
+        """
+        process = (
+            ffmpeg
+            .input(self.audio_path, threads=0)
+            .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=WHISPER_SAMPLE_RATE)
+            .global_args("-nostdin", "-loglevel", "error")
+            .run_async(pipe_stdout=True)
+        )
+        with open(self.pcm_path, "wb") as f:
+            shutil.copyfileobj(process.stdout, f, 1024 * 1024)
+        if process.wait() != 0 or os.path.getsize(self.pcm_path) == 0:
+            raise RuntimeError(f"ffmpeg failed to decode {self.audio_path}")
+
+    @property
+    def samples(self):
+        """
+        Array PCM 16 kHz mono int16, memory-mapped read-only
+        """
+        return self._samples
+
+    @property
+    def duration(self):
+        """
+        Durasi audio dalam detik
+        """
+        return len(self._samples) / float(self.sample_rate)
+
+    def whisper_audio(self):
+        """
+        Audio float32 untuk Whisper (dihitung sekali), konversi sama dengan whisper.load_audio
+        """
+        if self._whisper_audio is None:
+            self._whisper_audio = self._samples.astype(np.float32) / 32768.0
+        return self._whisper_audio
+
+    def close(self):
+        """
+        Lepas memmap dan hapus file PCM
+        """
+        self._samples = None
+        self._whisper_audio = None
+        try:
+            os.unlink(self.pcm_path)
+        except OSError:
+            pass
+
+class DecodedAudioStore:
+    """
+    Store PCM hasil decode, dibagi antara transkripsi (VAD, chunking, Whisper) dan durasi
+
+    acquire/release pakai reference counting, file PCM dihapus begitu job
+    terakhir yang memakainya selesai.
+    """
+
+    def __init__(self, store_dir=None):
+        """
+        Initialize the store
+
+        Parameters:
+            store_dir (str): Folder untuk file PCM (default: folder temporary baru)
+        """
+        self.store_dir = store_dir or tempfile.mkdtemp(prefix="alvg_pcm_")
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        # abspath -> [DecodedAudio, refcount]
+        self._entries = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, audio_path):
+        """
+        Ambil PCM untuk file audio (decode kalau belum ada)
+
+        Returns:
+            DecodedAudio: Audio yang sudah di-decode
+        """
+        key = os.path.abspath(audio_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+            self._counter += 1
+            pcm_path = os.path.join(self.store_dir, f"{self._counter}.s16")
+
+        # Decode di luar lock supaya file lain tetap bisa diproses
+        decoded = DecodedAudio(audio_path, pcm_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Thread lain sudah selesai decode duluan
+                entry[1] += 1
+                decoded.close()
+                return entry[0]
+            self._entries[key] = [decoded, 1]
+            return decoded
+
+    def release(self, audio_path):
+        """
+        Lepas PCM, hapus file-nya kalau sudah tidak dipakai
+        """
+        key = os.path.abspath(audio_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._entries[key]
+        entry[0].close()
+
+    def close(self):
+        """
+        Hapus semua PCM dan folder store
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for decoded, _ in entries:
+            decoded.close()
+        shutil.rmtree(self.store_dir, ignore_errors=True)
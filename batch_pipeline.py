@@ -0,0 +1,137 @@
+import time
+import queue
+import threading
+import traceback
+
+from audio_store import DecodedAudioStore
+
+# Penanda akhir antrian
+_DONE = object()
+
+class LyricVideoPipeline:
+    """
+    Class untuk menjalankan transkripsi dan render secara pipelined
+
+    Thread transkripsi mengisi antrian terbatas, sementara thread pemanggil
+    me-render video dari antrian itu. Jadi lagu N di-render sambil lagu N+1
+    ditranskrip, dan video pertama sudah jadi setelah satu lagu, bukan
+    setelah satu folder selesai ditranskrip.
+    """
+
+    def __init__(self, audio_processor, video_generator, queue_size=2, share_decoded_audio=True):
+        """
+        Initialize the pipeline
+
+        Parameters:
+            audio_processor (AudioProcessor): Processor untuk tahap transkripsi
+            video_generator (VideoGenerator): Generator untuk tahap render
+            queue_size (int): Maksimal lagu yang sudah ditranskrip tapi belum di-render
+            share_decoded_audio (bool): Decode tiap lagu sekali dan pakai PCM-nya
+                                        untuk transkripsi dan durasi video
+        """
+        self.audio_processor = audio_processor
+        self.video_generator = video_generator
+        self.queue_size = max(1, queue_size)
+        self.share_decoded_audio = share_decoded_audio
+
+        # Statistik run terakhir
+        self.first_video_latency = None
+        self.total_time = None
+
+    @staticmethod
+    def _put(work_queue, item, stop_event):
+        """
+        put dengan timeout supaya tidak macet kalau tahap render sudah berhenti
+        """
+        while not stop_event.is_set():
+            try:
+                work_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _transcribe_stage(self, directory_path, language, audio_store, work_queue, stop_event):
+        """
+        Tahap 1 (background thread): transkrip file satu per satu ke antrian
+        """
+        try:
+            for item in self.audio_processor.iter_audio_directory(directory_path, language, audio_store):
+                if not self._put(work_queue, item, stop_event):
+                    if audio_store is not None:
+                        audio_store.release(item[1])
+                    break
+        except Exception as e:
+            print(f"✗ Error in transcription stage: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self._put(work_queue, _DONE, stop_event)
+
+    def run(self, directory_path, language=None, output_ratio="landscape", on_video=None):
+        """
+        Jalankan pipeline untuk satu folder audio
+
+        Parameters:
+            directory_path (str): Path ke direktori audio
+            language (str): Kode bahasa (opsional)
+            output_ratio (str): 'landscape' atau 'portrait'
+            on_video (callable): Dipanggil on_video(filename, output_path) tiap video selesai
+
+        Returns:
+            tuple: (lyrics_dict, output_videos)
+        """
+        work_queue = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+
+        lyrics_dict = {}
+        output_videos = []
+        start_time = time.time()
+        self.first_video_latency = None
+        audio_store = DecodedAudioStore() if self.share_decoded_audio else None
+
+        producer = threading.Thread(
+            target=self._transcribe_stage,
+            args=(directory_path, language, audio_store, work_queue, stop_event),
+            daemon=True
+        )
+        producer.start()
+
+        try:
+            while True:
+                item = work_queue.get()
+                if item is _DONE:
+                    break
+
+                filename, audio_path, lyrics, decoded_audio = item
+                lyrics_dict[filename] = lyrics
+
+                print(f"Generating video for {filename} using audio: {audio_path}")
+                try:
+                    song_videos = self.video_generator.generate_videos(
+                        lyrics, output_ratio, audio_path=audio_path, decoded_audio=decoded_audio
+                    )
+                finally:
+                    # Job selesai, PCM-nya langsung dihapus
+                    if audio_store is not None:
+                        audio_store.release(audio_path)
+                if not song_videos:
+                    continue
+
+                output_videos.extend(song_videos)
+                if self.first_video_latency is None:
+                    self.first_video_latency = time.time() - start_time
+                    print(f"First video ready after {self.first_video_latency:.1f}s")
+
+                if on_video:
+                    for output_video in song_videos:
+                        on_video(filename, output_video)
+        finally:
+            # Kalau render berhenti di tengah jalan, hentikan juga tahap transkripsi
+            stop_event.set()
+            producer.join()
+            if audio_store is not None:
+                audio_store.close()
+
+        self.total_time = time.time() - start_time
+        print(f"Pipeline finished: {len(output_videos)} videos in {self.total_time:.1f}s")
+        return lyrics_dict, output_videos
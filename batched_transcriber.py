@@ -0,0 +1,155 @@
+import numpy as np
+import torch
+import whisper
+
+# Satu window Whisper = 30 detik audio
+WINDOW_SAMPLES = whisper.audio.N_SAMPLES
+SECONDS_PER_TIMESTAMP = 0.02
+
+class BatchedTranscriber:
+    """
+    Class untuk transkripsi banyak file pendek sekaligus
+
+    Audio tiap file dipotong per window 30 detik, window dari beberapa file
+    digabung jadi satu batch encoder/decoder, lalu hasilnya dipisah lagi ke
+    masing-masing file. Lebih hemat overhead daripada model.transcribe per file
+    untuk folder berisi banyak lagu pendek.
+
+    Catatan: window dipotong tetap per 30 detik (tanpa seek dinamis seperti
+    model.transcribe), jadi satu baris yang pas melewati batas window bisa
+    terbelah jadi dua segment.
+    """
+
+    # Setting decoder yang membuat hasilnya beda dari model.transcribe
+    # (dipakai sebagai bagian cache key supaya hasil batch tidak tertukar)
+    DECODER_SETTINGS = {
+        "window_seconds": 30,
+        "seek": "fixed",
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "word_timestamps": False,
+    }
+
+    def __init__(self, model, language=None, batch_size=8):
+        """
+        Parameters:
+            model (whisper.model.Whisper): Model yang sudah diload
+            language (str): Kode bahasa (None = deteksi per window)
+            batch_size (int): Jumlah window per batch
+        """
+        self.model = model
+        self.language = language
+        self.batch_size = max(1, batch_size)
+
+        self.tokenizer = self._get_tokenizer(model, language)
+
+    @staticmethod
+    def _get_tokenizer(model, language):
+        """
+        Tokenizer untuk membaca token hasil decode
+        """
+        try:
+            return whisper.tokenizer.get_tokenizer(
+                model.is_multilingual, num_languages=model.num_languages, language=language, task="transcribe"
+            )
+        except TypeError:
+            # Versi Whisper lama belum punya argumen num_languages
+            return whisper.tokenizer.get_tokenizer(model.is_multilingual, language=language, task="transcribe")
+
+    def _window_mel(self, samples):
+        """
+        Mel spectrogram satu window (audio di-pad/trim ke 30 detik)
+        """
+        audio = whisper.pad_or_trim(np.asarray(samples, dtype=np.float32))
+        n_mels = getattr(self.model.dims, "n_mels", 80)
+        try:
+            return whisper.log_mel_spectrogram(audio, n_mels=n_mels)
+        except TypeError:
+            return whisper.log_mel_spectrogram(audio)
+
+    def tokens_to_lyrics(self, tokens, offset, window_duration):
+        """
+        Ubah token hasil decode (dengan timestamp token) jadi list lirik
+
+        Parameters:
+            tokens (list): Token hasil DecodingResult
+            offset (float): Posisi window di file asli (detik)
+            window_duration (float): Panjang audio asli di window ini
+
+        Returns:
+            list: List of dictionaries {'text', 'start', 'end'}
+        """
+        timestamp_begin = self.tokenizer.timestamp_begin
+        eot = self.tokenizer.eot
+
+        lyrics = []
+        text_tokens = []
+        start = None
+        last_time = 0.0
+
+        def emit(end):
+            text = self.tokenizer.decode(text_tokens).strip()
+            if text:
+                segment_start = start if start is not None else last_time
+                lyrics.append({
+                    'text': text,
+                    'start': offset + min(segment_start, window_duration),
+                    'end': offset + min(max(end, segment_start), window_duration)
+                })
+
+        for token in tokens:
+            if token >= timestamp_begin:
+                time = (token - timestamp_begin) * SECONDS_PER_TIMESTAMP
+                if text_tokens:
+                    emit(time)
+                    text_tokens = []
+                    start = None
+                else:
+                    start = time
+                last_time = time
+            elif token < eot:
+                text_tokens.append(token)
+
+        # Teks terakhir tanpa timestamp penutup
+        if text_tokens:
+            emit(window_duration)
+
+        return lyrics
+
+    def transcribe(self, audio_list):
+        """
+        Transkrip banyak audio sekaligus
+
+        Parameters:
+            audio_list (list): List array audio 16 kHz mono float32
+
+        Returns:
+            list: List lirik per audio (urutan sama dengan input)
+        """
+        # (index audio, offset detik, durasi window, sampel window)
+        windows = []
+        for audio_index, samples in enumerate(audio_list):
+            for start in range(0, max(1, len(samples)), WINDOW_SAMPLES):
+                piece = samples[start:start + WINDOW_SAMPLES]
+                windows.append((audio_index, start / float(whisper.audio.SAMPLE_RATE),
+                                len(piece) / float(whisper.audio.SAMPLE_RATE), piece))
+
+        results = [[] for _ in audio_list]
+        fp16 = self.model.device.type != "cpu"
+        options = whisper.DecodingOptions(language=self.language, without_timestamps=False, fp16=fp16)
+
+        for batch_start in range(0, len(windows), self.batch_size):
+            batch = windows[batch_start:batch_start + self.batch_size]
+            mel_tensor = torch.stack([self._window_mel(piece) for _, _, _, piece in batch]).to(self.model.device)
+            if fp16:
+                mel_tensor = mel_tensor.half()
+
+            decoded = whisper.decode(self.model, mel_tensor, options)
+
+            for (audio_index, offset, duration, _), result in zip(batch, decoded):
+                # Aturan yang sama dengan model.transcribe untuk window tanpa vokal
+                if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                    continue
+                results[audio_index].extend(self.tokens_to_lyrics(result.tokens, offset, duration))
+
+        return results
@@ -0,0 +1,357 @@
+import bisect
+from collections import Counter
+
+import numpy as np
+from moviepy.editor import VideoClip
+
+class RenderCounters:
+    """
+    Counter statistik render LyricCompositor
+
+    Disimpan di object terpisah supaya copy clip dari moviepy (set_audio,
+    subclip, dll. yang mengembalikan copy) tetap menulis ke counter yang sama
+    dengan clip aslinya.
+    """
+
+    def __init__(self):
+        # Jumlah layer lirik aktif -> jumlah frame
+        self.layer_counts = Counter()
+        # Total pixel yang di-blend (luas union bounding box teks) untuk statistik
+        self.dirty_pixels = 0
+        # Frame yang dipakai ulang dari segment statis
+        self.static_frames = 0
+        # Jumlah array seukuran frame yang dialokasikan selama render
+        self.frame_allocations = 0
+
+class LyricCompositor(VideoClip):
+    """
+    Pengganti CompositeVideoClip untuk video lirik
+
+    Clip lirik disimpan terurut berdasarkan waktu mulai, plus prefix maksimum
+    waktu selesai. Untuk tiap frame, clip yang mungkin aktif dicari dengan
+    bisect, jadi yang dicek cuma clip di sekitar t (bukan semua baris lagu).
+    Jumlah layer aktif per frame dicatat untuk statistik.
+
+    Kalau background-nya statis, frame background disimpan sekali sebagai
+    buffer uint8. Frame tanpa lirik langsung memakai buffer itu, frame dengan
+    lirik cuma mem-blend bounding box tiap teks di copy buffer tersebut
+    (bukan blending full resolusi).
+
+    Timeline dibagi jadi segment di setiap titik mulai/selesai/berhenti
+    animasi clip. Segment yang isinya statis (tanpa lirik, atau semua lirik
+    aktif sudah tidak beranimasi) cukup dirender sekali, frame berikutnya
+    di segment itu memakai frame yang sama.
+
+    render_into() menulis frame langsung ke buffer milik pemanggil (misalnya
+    ring buffer writer), jadi tidak ada array frame baru per frame.
+    """
+
+    def __init__(self, bg_clip, clips, size=None, static_background=True, static_after=None):
+        """
+        Parameters:
+            bg_clip (VideoClip): Background (menentukan durasi video)
+            clips (list): Clip lirik yang sudah di-set start-nya
+            size (tuple): Ukuran frame (default: ukuran background)
+            static_background (bool): Background tidak berubah terhadap waktu
+                                      (ImageClip), frame-nya cukup diambil sekali
+            static_after (list): Per clip (urutan sama dengan clips), detik sejak
+                                 clip mulai sampai tampilannya tidak berubah lagi.
+                                 None = beranimasi terus (default untuk semua clip)
+        """
+        VideoClip.__init__(self, duration=bg_clip.duration)
+        self.bg_clip = bg_clip
+        self.size = size or bg_clip.size
+
+        self.background = None
+        if static_background:
+            self.background = np.ascontiguousarray(bg_clip.get_frame(0), dtype=np.uint8)
+            self.background.setflags(write=False)
+
+        if static_after is None:
+            static_after = [None] * len(clips)
+        order = sorted(range(len(clips)), key=lambda i: clips[i].start)
+
+        self.clips = [clips[i] for i in order]
+        self.starts = [clip.start for clip in self.clips]
+        self.ends = [clip.end if clip.end is not None else float("inf") for clip in self.clips]
+        self.static_from = [
+            clips[i].start + static_after[i] if static_after[i] is not None else float("inf")
+            for i in order
+        ]
+
+        # Di dalam satu segment (antara dua boundary) isi frame tidak berubah strukturnya
+        self.boundaries = sorted(set(
+            t for t in self.starts + self.ends + self.static_from if t != float("inf")
+        ))
+        self._cached_segment = None
+        self._cached_frame = None
+        self._cached_layers = 0
+
+        # max_ends[i] = waktu selesai paling akhir dari clip[0..i], selalu naik
+        self.max_ends = []
+        latest = float("-inf")
+        for end in self.ends:
+            latest = max(latest, end)
+            self.max_ends.append(latest)
+
+        # Counter statistik; copy clip (set_audio, subclip, ...) berbagi object yang sama
+        self.counters = RenderCounters()
+        # Buffer milik compositor untuk frame segment statis di render_into()
+        self._static_buffer = None
+
+        self.make_frame = self._make_frame
+
+    @property
+    def layer_counts(self):
+        """
+        Counter jumlah layer aktif -> jumlah frame
+        """
+        return self.counters.layer_counts
+
+    @property
+    def dirty_pixels(self):
+        """
+        Total pixel yang di-blend
+        """
+        return self.counters.dirty_pixels
+
+    @property
+    def static_frames(self):
+        """
+        Frame yang dipakai ulang dari segment statis
+        """
+        return self.counters.static_frames
+
+    @property
+    def frame_allocations(self):
+        """
+        Array seukuran frame yang dialokasikan
+        """
+        return self.counters.frame_allocations
+
+    def _active_indices(self, t):
+        """
+        Index clip lirik yang sedang tampil di waktu t
+        """
+        # Clip sesudah last belum mulai, clip sebelum first pasti sudah selesai
+        last = bisect.bisect_right(self.starts, t)
+        first = bisect.bisect_right(self.max_ends, t)
+        return [i for i in range(first, last) if self.ends[i] > t]
+
+    def active_clips(self, t):
+        """
+        Clip lirik yang sedang tampil di waktu t, urut sesuai waktu mulai
+        """
+        return [self.clips[i] for i in self._active_indices(t)]
+
+    def is_static_at(self, t):
+        """
+        True kalau frame di t sama persis dengan frame lain di segment yang sama
+        """
+        if self.background is None:
+            return False
+        return all(t >= self.static_from[i] for i in self._active_indices(t))
+
+    def static_runs(self):
+        """
+        Rentang waktu yang frame-nya tidak berubah (gap tanpa lirik / teks diam)
+
+        Returns:
+            list: List of (start, end) dalam detik
+        """
+        points = [0.0] + [b for b in self.boundaries if 0.0 < b < self.duration] + [self.duration]
+        runs = []
+        for start, end in zip(points[:-1], points[1:]):
+            if end <= start or not self.is_static_at(start):
+                continue
+            if runs and runs[-1][1] == start:
+                runs[-1] = (runs[-1][0], end)
+            else:
+                runs.append((start, end))
+        return runs
+
+    def _make_frame(self, t):
+        """
+        Background + clip yang aktif di t
+        """
+        segment = bisect.bisect_right(self.boundaries, t)
+        if self._cached_segment == segment:
+            # Masih di segment statis yang sama, frame tidak perlu dirender ulang
+            self.counters.static_frames += 1
+            self.counters.layer_counts[self._cached_layers] += 1
+            return self._cached_frame
+
+        indices = self._active_indices(t)
+        active = [self.clips[i] for i in indices]
+        self.counters.layer_counts[len(active)] += 1
+
+        if self.background is None:
+            frame = self.bg_clip.get_frame(t)
+            self.counters.frame_allocations += 1 + len(active)
+            for clip in active:
+                frame = clip.blit_on(frame, t)
+            return frame
+
+        if not active:
+            # Tidak ada lirik, frame = background yang sudah di-cache
+            self._remember(segment, self.background, 0)
+            return self.background
+
+        frame = self.background.copy()
+        self.counters.frame_allocations += 1
+        self._blend_active(frame, active, t)
+
+        if all(t >= self.static_from[i] for i in indices):
+            frame.setflags(write=False)
+            self._remember(segment, frame, len(active))
+        return frame
+
+    def render_into(self, out, t):
+        """
+        Render frame di t langsung ke buffer out (uint8, height x width x 3)
+
+        Background, clip lirik dan frame segment statis di-copy ke buffer yang
+        sudah ada, tanpa alokasi array seukuran frame (kecuali sekali untuk
+        buffer frame statis, atau kalau background-nya tidak statis).
+        """
+        if self.background is None:
+            np.copyto(out, self._make_frame(t), casting="unsafe")
+            return
+
+        segment = bisect.bisect_right(self.boundaries, t)
+        if self._cached_segment == segment:
+            self.counters.static_frames += 1
+            self.counters.layer_counts[self._cached_layers] += 1
+            np.copyto(out, self._cached_frame)
+            return
+
+        indices = self._active_indices(t)
+        active = [self.clips[i] for i in indices]
+        self.counters.layer_counts[len(active)] += 1
+
+        np.copyto(out, self.background)
+        if not active:
+            self._remember(segment, self.background, 0)
+            return
+
+        self._blend_active(out, active, t)
+
+        if all(t >= self.static_from[i] for i in indices):
+            # out milik pemanggil dan akan dipakai ulang, simpan salinannya
+            if self._static_buffer is None:
+                self._static_buffer = np.empty_like(out)
+                self.counters.frame_allocations += 1
+            np.copyto(self._static_buffer, out)
+            self._remember(segment, self._static_buffer, len(active))
+
+    def _blend_active(self, frame, active, t):
+        """
+        Blend semua clip aktif ke frame dan catat luas area yang berubah
+        """
+        dirty = None
+        for clip in active:
+            box = self._blend_clip(frame, clip, t)
+            if box is not None:
+                if dirty is None:
+                    dirty = box
+                else:
+                    dirty = (min(dirty[0], box[0]), min(dirty[1], box[1]),
+                             max(dirty[2], box[2]), max(dirty[3], box[3]))
+        if dirty is not None:
+            self.counters.dirty_pixels += (dirty[2] - dirty[0]) * (dirty[3] - dirty[1])
+
+    def _remember(self, segment, frame, layers):
+        """
+        Simpan frame segment statis untuk dipakai frame berikutnya
+        """
+        self._cached_segment = segment
+        self._cached_frame = frame
+        self._cached_layers = layers
+
+    @staticmethod
+    def _resolve_position(clip, ct, clip_size, frame_size):
+        """
+        Posisi pojok kiri atas clip dalam pixel (aturan sama dengan Clip.blit_on)
+        """
+        wi, hi = clip_size
+        wf, hf = frame_size
+        pos = clip.pos(ct)
+
+        # Singkatan posisi ('center', 'top', ...)
+        if isinstance(pos, str):
+            pos = {'center': ['center', 'center'], 'left': ['left', 'center'], 'right': ['right', 'center'],
+                   'top': ['center', 'top'], 'bottom': ['center', 'bottom']}[pos]
+        else:
+            pos = list(pos)
+
+        # Posisi relatif (persen ukuran frame)
+        if clip.relative_pos:
+            for i, dim in enumerate([wf, hf]):
+                if not isinstance(pos[i], str):
+                    pos[i] = dim * pos[i]
+
+        if isinstance(pos[0], str):
+            pos[0] = {'left': 0, 'center': (wf - wi) / 2, 'right': wf - wi}[pos[0]]
+        if isinstance(pos[1], str):
+            pos[1] = {'top': 0, 'center': (hf - hi) / 2, 'bottom': hf - hi}[pos[1]]
+
+        return int(pos[0]), int(pos[1])
+
+    def _blend_clip(self, frame, clip, t):
+        """
+        Blend satu clip ke frame, cuma di bounding box clip itu
+
+        Returns:
+            tuple or None: (x0, y0, x1, y1) area yang diubah, None kalau di luar frame
+        """
+        ct = t - clip.start
+        img = clip.get_frame(ct)
+        mask = clip.mask.get_frame(ct) if clip.mask is not None else None
+
+        if mask is not None and mask.shape[:2] != img.shape[:2]:
+            # Ukuran mask beda dengan frame clip, pakai jalur moviepy
+            frame[:] = clip.blit_on(frame, t)
+            self.counters.frame_allocations += 1
+            return (0, 0, frame.shape[1], frame.shape[0])
+
+        hi, wi = img.shape[:2]
+        hf, wf = frame.shape[:2]
+        x, y = self._resolve_position(clip, ct, (wi, hi), (wf, hf))
+
+        # Potong bagian clip yang keluar frame
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(wf, x + wi), min(hf, y + hi)
+        if x0 >= x1 or y0 >= y1:
+            return None
+
+        src = img[y0 - y:y1 - y, x0 - x:x1 - x, :3]
+        dst = frame[y0:y1, x0:x1]
+        if mask is None:
+            dst[:] = src
+        else:
+            alpha = mask[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.float32)
+            dst[:] = (src * alpha + dst * (1.0 - alpha)).astype(np.uint8)
+        return (x0, y0, x1, y1)
+
+    def stats(self):
+        """
+        Statistik layer aktif per frame
+
+        Returns:
+            dict: frames, max_active, mean_active, histogram {jumlah_layer: frame},
+                  dirty_fraction (rata-rata porsi frame yang di-blend),
+                  static_frames (frame yang dipakai ulang tanpa render),
+                  frame_allocations (array seukuran frame yang dialokasikan)
+        """
+        frames = sum(self.counters.layer_counts.values())
+        total = sum(layers * count for layers, count in self.counters.layer_counts.items())
+        frame_pixels = self.size[0] * self.size[1]
+        return {
+            "frames": frames,
+            "max_active": max(self.counters.layer_counts) if self.counters.layer_counts else 0,
+            "mean_active": total / frames if frames else 0.0,
+            "histogram": dict(sorted(self.counters.layer_counts.items())),
+            "dirty_fraction": self.counters.dirty_pixels / float(frames * frame_pixels) if frames else 0.0,
+            "static_frames": self.counters.static_frames,
+            "frame_allocations": self.counters.frame_allocations,
+        }
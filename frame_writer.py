@@ -0,0 +1,207 @@
+import queue
+import threading
+import time
+
+import ffmpeg
+import numpy as np
+from tqdm import tqdm
+
+class RingBufferFrameWriter:
+    """
+    Writer video tanpa moviepy: frame dirender ke ring buffer uint8 yang
+    dialokasikan sekali, lalu thread terpisah menulis buffer itu ke stdin ffmpeg
+
+    Selama frame N ditulis ke pipe, frame N+1 sudah dirender ke buffer
+    berikutnya, jadi compositing dan encoding jalan bersamaan. Buffer ditulis
+    langsung (tanpa konversi dtype atau copy). Output-nya video saja,
+    audio di-mux terpisah.
+
+    Frame yang sama bisa di-encode ke beberapa output sekaligus (scaled_outputs):
+    ffmpeg men-split frame, men-scale tiap cabang dan menjalankan encoder-nya
+    bersamaan.
+    """
+
+    def __init__(self, output_file, size, fps=30, ring_size=4, codec="libx264", bitrate=None,
+                 preset="medium", threads=None, ffmpeg_params=None, scaled_outputs=None, filters=None):
+        """
+        Parameters:
+            output_file (str): Path video output (tanpa audio)
+            size (tuple): Ukuran frame (width, height)
+            fps (int): Frame rate
+            ring_size (int): Jumlah buffer frame di ring
+            codec (str): Codec video
+            bitrate (str): Bitrate video (misalnya '8000k')
+            preset (str): Preset x264
+            threads (int): Thread encoder
+            ffmpeg_params (list): Argumen output tambahan berpasangan, format sama
+                                  dengan ffmpeg_params write_videofile
+            scaled_outputs (list): Output tambahan dari frame yang sama,
+                                   list of (output_file, (width, height), bitrate)
+            filters (list): Filter ffmpeg sebelum split, list of (nama, kwargs)
+        """
+        self.output_file = output_file
+        self.size = size
+        self.fps = fps
+        self.ring_size = max(2, ring_size)
+        self.codec = codec
+        self.bitrate = bitrate
+        self.preset = preset
+        self.threads = threads
+        self.ffmpeg_params = ffmpeg_params or []
+        self.scaled_outputs = scaled_outputs or []
+        self.filters = filters or []
+
+        self.frames = 0
+        self.allocations = 0
+        # Waktu thread writer tertahan di write() ke pipe ffmpeg (encoder lebih lambat)
+        self.pipe_blocked = 0.0
+        # Waktu compositor menunggu buffer kosong (ring penuh)
+        self.ring_wait = 0.0
+        self.elapsed = 0.0
+        self._error = None
+
+    def _output_args(self, bitrate):
+        """
+        Argumen output ffmpeg
+        """
+        args = {"vcodec": self.codec, "preset": self.preset, "pix_fmt": "yuv420p"}
+        if bitrate:
+            args["video_bitrate"] = bitrate
+        if self.threads:
+            args["threads"] = self.threads
+        for name, value in zip(self.ffmpeg_params[::2], self.ffmpeg_params[1::2]):
+            args[name.lstrip("-")] = value
+        return args
+
+    def _start_ffmpeg(self):
+        """
+        Jalankan ffmpeg yang membaca frame rawvideo dari stdin
+        """
+        width, height = self.size
+        stream = ffmpeg.input("pipe:", format="rawvideo", pix_fmt="rgb24", s=f"{width}x{height}",
+                              framerate=self.fps)
+        for name, kwargs in self.filters:
+            stream = stream.filter(name, **kwargs)
+
+        targets = [(self.output_file, tuple(self.size), self.bitrate)] + list(self.scaled_outputs)
+        if len(targets) == 1:
+            streams = [stream]
+        else:
+            split = stream.filter_multi_output("split", len(targets))
+            streams = [split[i] for i in range(len(targets))]
+
+        outputs = []
+        for stream, (output_file, size, bitrate) in zip(streams, targets):
+            if tuple(size) != tuple(self.size):
+                stream = stream.filter("scale", size[0], size[1], flags="lanczos")
+            outputs.append(ffmpeg.output(stream, output_file, **self._output_args(bitrate)))
+
+        return (
+            ffmpeg
+            .merge_outputs(*outputs)
+            .global_args("-nostdin", "-loglevel", "error")
+            .overwrite_output()
+            .run_async(pipe_stdin=True)
+        )
+
+    def _write_loop(self, process, buffers, filled, free):
+        """
+        Thread writer: tulis buffer yang sudah terisi ke stdin ffmpeg
+        """
+        while True:
+            index = filled.get()
+            if index is None:
+                return
+            if self._error is None:
+                try:
+                    started = time.perf_counter()
+                    process.stdin.write(buffers[index].data)
+                    self.pipe_blocked += time.perf_counter() - started
+                except Exception as e:
+                    # ffmpeg mati, sisa frame tetap dikembalikan supaya compositor tidak macet
+                    self._error = e
+            free.put(index)
+
+    def write(self, clip, duration=None, progress=True):
+        """
+        Render semua frame clip dan encode ke output_file
+
+        Parameters:
+            clip (VideoClip): Clip video; kalau punya render_into() (LyricCompositor),
+                              frame dirender langsung ke buffer ring
+            duration (float): Durasi yang dirender (default: clip.duration)
+            progress (bool): Tampilkan progress bar
+
+        Returns:
+            dict: Statistik writer (lihat stats())
+        """
+        width, height = self.size
+        duration = clip.duration if duration is None else duration
+        total_frames = int(np.ceil(duration * self.fps))
+
+        buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self.ring_size)]
+        free = queue.Queue()
+        filled = queue.Queue()
+        for index in range(self.ring_size):
+            free.put(index)
+
+        render_into = getattr(clip, "render_into", None)
+        clip_allocations = getattr(clip, "frame_allocations", 0)
+
+        process = self._start_ffmpeg()
+        writer = threading.Thread(target=self._write_loop, args=(process, buffers, filled, free), daemon=True)
+        writer.start()
+
+        started = time.perf_counter()
+        try:
+            for n in tqdm(range(total_frames), desc="Writing frames", disable=not progress):
+                if self._error is not None:
+                    break
+                wait_started = time.perf_counter()
+                index = free.get()
+                self.ring_wait += time.perf_counter() - wait_started
+
+                t = n / float(self.fps)
+                if render_into is not None:
+                    render_into(buffers[index], t)
+                else:
+                    np.copyto(buffers[index], clip.get_frame(t)[:, :, :3], casting="unsafe")
+                    self.allocations += 1
+                filled.put(index)
+                self.frames += 1
+        finally:
+            filled.put(None)
+            writer.join()
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.wait()
+            self.elapsed = time.perf_counter() - started
+
+        if render_into is not None:
+            self.allocations += clip.frame_allocations - clip_allocations
+        if self._error is not None:
+            raise RuntimeError(f"ffmpeg pipe closed while writing frame {self.frames}: {self._error}")
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with code {process.returncode}")
+        return self.stats()
+
+    def stats(self):
+        """
+        Statistik writer
+
+        Returns:
+            dict: frames, allocations (array seukuran frame di luar ring),
+                  allocations_per_frame, pipe_blocked (detik tertahan di pipe),
+                  ring_wait (detik menunggu buffer kosong), elapsed, fps
+        """
+        return {
+            "frames": self.frames,
+            "allocations": self.allocations,
+            "allocations_per_frame": self.allocations / float(self.frames) if self.frames else 0.0,
+            "pipe_blocked": self.pipe_blocked,
+            "ring_wait": self.ring_wait,
+            "elapsed": self.elapsed,
+            "fps": self.frames / self.elapsed if self.elapsed else 0.0,
+        }
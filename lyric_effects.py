@@ -1,78 +1,151 @@
 import numpy as np
-from moviepy.editor import TextClip, CompositeVideoClip, ColorClip, ImageClip
+from moviepy.editor import TextClip, CompositeVideoClip, ImageClip, VideoClip
 import random
+import re
 import os
-from PIL import Image, ImageDraw, ImageFont
-import tempfile
+import functools
+from PIL import Image, ImageDraw, ImageFont, ImageColor
 import colorsys
 
+from text_raster_cache import get_text_raster_cache
+
 class LyricEffects:
     """
     Class untuk menerapkan berbagai efek animasi pada teks lirik
     """
     
+    # Efek yang tampilannya berubah sepanjang durasi baris
+    ANIMATED_EFFECTS = (
+        "typing", "fade_out", "fade_both", "zoom_out", "bounce", "glow", "shake", "wave", "karaoke",
+        "rainbow", "color_gradient", "color_pulse", "color_spectrum"
+    )
+    
     @staticmethod
-    def create_text_clip(text, font, fontsize, color, duration=None):
+    def create_text_clip(text, font, fontsize, color, duration=None, stroke_color=None, stroke_width=0):
         """
-        Buat text clip tanpa bergantung pada ImageMagick
-        Metode alternatif menggunakan PIL untuk membuat gambar teks
+        Buat text clip dari raster teks yang di-cache
+        
+        Teks yang sama (font, ukuran, warna, stroke sama) cuma di-rasterize
+        sekali, clip berikutnya dibuat langsung dari array di cache.
+        """
+        raster = LyricEffects.render_text_rgba(text, font, fontsize, color, stroke_color, stroke_width)
+        
+        clip = ImageClip(raster[:, :, :3])
+        clip = clip.set_mask(ImageClip(raster[:, :, 3] / 255.0, ismask=True))
+        if duration:
+            clip = clip.set_duration(duration)
+            
+        return clip
+        
+    @staticmethod
+    def _rasterize_text(text, font, fontsize, color, stroke_color=None, stroke_width=0):
+        """
+        Rasterize teks jadi array RGBA uint8 (h, w, 4) tanpa cache
+        
+        Pakai TextClip (ImageMagick) dulu, kalau gagal pakai PIL supaya
+        tidak bergantung pada ImageMagick.
         """
         try:
             # Coba cara biasa dulu
-            return TextClip(text, font=font, fontsize=fontsize, color=color, method='label')
+            clip = TextClip(text, font=font, fontsize=fontsize, color=color, method='label',
+                            stroke_color=stroke_color, stroke_width=stroke_width if stroke_color else 1)
+            rgb = clip.get_frame(0)
+            if clip.mask is not None:
+                alpha = clip.mask.get_frame(0) * 255
+            else:
+                alpha = np.full(rgb.shape[:2], 255)
+            return np.dstack([rgb, alpha]).astype(np.uint8)
         except Exception as e:
             print(f"Error creating text clip with default method: {str(e)}")
             print("Trying alternative method with PIL...")
             
-            # Buat gambar dengan PIL
-            font_path = font
-            if font in ["Arial", "Times New Roman", "Calibri", "Verdana", "Helvetica"]:
-                # Untuk font default sistem, gunakan PIL default
-                font_path = None
+            # Siapkan font
+            pil_font = LyricEffects.load_pil_font(font, fontsize)
+            stroke = stroke_width if stroke_color else 0
             
-            # Buat gambar kosong dengan ukuran besar
+            # Buat gambar kosong, ukurannya dari bounding box teks kalau PIL mendukung
             width, height = 1000, 200
+            probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+            if hasattr(probe, "textbbox"):
+                left, top, right, bottom = probe.textbbox((0, 0), text, font=pil_font, stroke_width=stroke)
+                width, height = max(1, right + 20), max(1, bottom + 20)
             img = Image.new('RGBA', (width, height), color=(0, 0, 0, 0))
             draw = ImageDraw.Draw(img)
-            
-            # Siapkan font
-            try:
-                if font_path and os.path.exists(font_path):
-                    pil_font = ImageFont.truetype(font_path, fontsize)
-                else:
-                    # Gunakan font default jika tidak ditemukan
-                    pil_font = ImageFont.truetype("arial.ttf", fontsize)
-            except Exception:
-                # Fallback ke default PIL font
-                pil_font = ImageFont.load_default()
                 
             # Gambar teks
-            draw.text((10, 10), text, fill=color, font=pil_font)
+            draw.text((10, 10), text, fill=color, font=pil_font, stroke_width=stroke, stroke_fill=stroke_color)
             
             # Crop ke ukuran teks
             bbox = img.getbbox()
             if bbox:
                 img = img.crop(bbox)
+                
+            return np.array(img.convert('RGBA'), dtype=np.uint8)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def load_pil_font(font, fontsize):
+        """
+        Load font PIL dari path file font, fallback ke arial / font default PIL
+        
+        Font object (beserta cache glyph di dalamnya) dipakai ulang per (font, ukuran).
+        """
+        font_path = font
+        if font in ["Arial", "Times New Roman", "Calibri", "Verdana", "Helvetica"]:
+            # Untuk font default sistem, gunakan PIL default
+            font_path = None
             
-            # Simpan ke file temporary
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            img.save(temp_file.name)
+        try:
+            if font_path and os.path.exists(font_path):
+                return ImageFont.truetype(font_path, fontsize)
+            # Gunakan font default jika tidak ditemukan
+            return ImageFont.truetype("arial.ttf", fontsize)
+        except Exception:
+            # Fallback ke default PIL font
+            return ImageFont.load_default()
             
-            # Buat clip dari file
-            clip = ImageClip(temp_file.name)
-            if duration:
-                clip = clip.set_duration(duration)
-                
-            # Jadwalkan penghapusan file sementara
-            def cleanup():
-                try:
-                    os.unlink(temp_file.name)
-                except:
-                    pass
-            clip.cleanup = cleanup
+    @staticmethod
+    def parse_color(color):
+        """
+        Konversi warna (nama atau hex) ke tuple RGB
+        """
+        return ImageColor.getrgb(color)[:3]
+        
+    @staticmethod
+    def render_text_rgba(text, font, fontsize, color="white", stroke_color=None, stroke_width=0):
+        """
+        Raster teks RGBA uint8 (h, w, 4), diambil dari cache kalau sudah pernah dibuat
+        
+        Returns:
+            np.ndarray: Array read-only, copy dulu kalau mau diubah
+        """
+        cache = get_text_raster_cache()
+        key = cache.make_key(text, font, fontsize, color, stroke_color, stroke_width)
+        raster = cache.get(key)
+        if raster is None:
+            raster = cache.put(key, LyricEffects._rasterize_text(text, font, fontsize, color, stroke_color, stroke_width))
+        return raster
+        
+    @staticmethod
+    def glyph_offsets(text, font, fontsize, width):
+        """
+        Posisi x (pixel) akhir tiap prefix teks, diskalakan ke lebar raster
+        
+        Returns:
+            np.ndarray: offsets[i] = lebar text[:i], panjang len(text) + 1
+        """
+        pil_font = LyricEffects.load_pil_font(font, fontsize)
+        
+        def text_width(s):
+            if hasattr(pil_font, "getlength"):
+                return pil_font.getlength(s)
+            return pil_font.getsize(s)[0]
             
-            return clip
-    
+        prefix = np.array([text_width(text[:i]) for i in range(len(text) + 1)], dtype=np.float64)
+        if prefix[-1] > 0:
+            prefix *= width / prefix[-1]
+        return prefix
+        
     @staticmethod
     def apply_text_position(clip, position, screen_size):
         """
@@ -100,6 +173,38 @@ class LyricEffects:
             
         return clip.set_position(pos)
     
+    @staticmethod
+    def tint_raster(raster, rgb):
+        """
+        Warnai raster teks putih dengan warna rgb (tuple/array 0-255)
+        
+        Returns:
+            np.ndarray: Frame RGB uint8 (h, w, 3)
+        """
+        shade = raster[:, :, :3].astype(np.float32) / 255.0
+        return (shade * np.asarray(rgb, dtype=np.float32)).astype(np.uint8)
+        
+    @staticmethod
+    def tinted_text_clip(text, font, fontsize, duration, color_at):
+        """
+        Satu clip teks yang warnanya berubah tiap frame
+        
+        Teks di-rasterize sekali (putih) dan alpha-nya jadi mask. Tiap frame
+        cuma perkalian raster dengan warna color_at(t) di bounding box teks,
+        tanpa bikin clip baru per warna.
+        
+        Parameters:
+            color_at (callable): Fungsi t -> array RGB float (0-255)
+        """
+        raster = LyricEffects.render_text_rgba(text, font, fontsize, "white")
+        shade = raster[:, :, :3].astype(np.float32) / 255.0
+        
+        def make_frame(t):
+            return (shade * color_at(t)).astype(np.uint8)
+            
+        mask = ImageClip(raster[:, :, 3] / 255.0, ismask=True).set_duration(duration)
+        return VideoClip(make_frame, duration=duration).set_mask(mask)
+        
     @staticmethod
     def color_gradient_effect(text, font, fontsize, colors, duration):
         """
@@ -115,41 +220,15 @@ class LyricEffects:
         Returns:
             VideoClip: Clip dengan efek gradient
         """
-        clips = []
-        start_color = colors[0]
-        end_color = colors[1]
-        
-        # Buat 10 frame untuk transisi warna halus
-        steps = 10
-        
-        # Konversi warna hex ke RGB untuk interpolasi
-        def hex_to_rgb(hex_color):
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        start_rgb = np.array(LyricEffects.parse_color(colors[0]), dtype=np.float32)
+        end_rgb = np.array(LyricEffects.parse_color(colors[1]), dtype=np.float32)
         
-        def rgb_to_hex(rgb):
-            return '#{:02x}{:02x}{:02x}'.format(int(rgb[0]), int(rgb[1]), int(rgb[2]))
-        
-        start_rgb = hex_to_rgb(start_color)
-        end_rgb = hex_to_rgb(end_color)
-        
-        # Buat beberapa clip dengan warna berbeda untuk transisi
-        for i in range(steps):
-            # Interpolasi warna
-            t = i / (steps - 1)
-            r = start_rgb[0] + (end_rgb[0] - start_rgb[0]) * t
-            g = start_rgb[1] + (end_rgb[1] - start_rgb[1]) * t
-            b = start_rgb[2] + (end_rgb[2] - start_rgb[2]) * t
-            
-            color = rgb_to_hex((r, g, b))
-            start_time = duration * (i / steps)
-            clip_duration = duration / steps
+        # Interpolasi warna kontinu dari warna awal ke warna akhir
+        def color_at(t):
+            progress = min(1.0, max(0.0, t / duration)) if duration > 0 else 1.0
+            return start_rgb + (end_rgb - start_rgb) * progress
             
-            txt_clip = LyricEffects.create_text_clip(text, font, fontsize, color)
-            txt_clip = txt_clip.set_start(start_time).set_duration(clip_duration)
-            clips.append(txt_clip)
-            
-        return CompositeVideoClip(clips).set_duration(duration)
+        return LyricEffects.tinted_text_clip(text, font, fontsize, duration, color_at)
     
     @staticmethod
     def color_pulse_effect(text, font, fontsize, color, duration):
@@ -189,34 +268,22 @@ class LyricEffects:
         Returns:
             VideoClip: Clip dengan efek perubahan spektrum warna
         """
-        clips = []
-        steps = 20  # Jumlah langkah untuk animasi
-        
-        for i in range(steps):
-            # Menggunakan HSV untuk transisi warna halus melalui spektrum
-            hue = i / steps
-            sat = 1.0
-            val = 1.0
+        # Menggunakan HSV untuk transisi warna halus melalui spektrum
+        def color_at(t):
+            hue = (t / duration) % 1.0 if duration > 0 else 0.0
+            r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
+            return np.array([r, g, b], dtype=np.float32) * 255
             
-            # Konversi HSV ke RGB
-            r, g, b = colorsys.hsv_to_rgb(hue, sat, val)
-            color = '#{:02x}{:02x}{:02x}'.format(int(r*255), int(g*255), int(b*255))
-            
-            start_time = duration * (i / steps)
-            clip_duration = duration / steps
-            
-            txt_clip = LyricEffects.create_text_clip(text, font, fontsize, color)
-            txt_clip = txt_clip.set_start(start_time).set_duration(clip_duration)
-            clips.append(txt_clip)
-            
-        return CompositeVideoClip(clips).set_duration(duration)
+        return LyricEffects.tinted_text_clip(text, font, fontsize, duration, color_at)
     
     @staticmethod
     def typing_effect(text, font, fontsize, color, duration, bg_color=None):
         """
         Efek ketik satu per satu (typing effect)
+        
+        Baris di-rasterize sekali, tiap frame cuma membuka mask sampai posisi
+        x akhir prefix yang sedang tampil (dari offset tiap glyph).
         """
-        clips = []
         total_chars = len(text)
         
         # Kalo tekstnya kosong, return clip kosong
@@ -225,23 +292,33 @@ class LyricEffects:
             
         char_duration = duration / total_chars
         
-        for i in range(1, total_chars + 1):
-            current_text = text[:i]
-            t_start = (i - 1) * char_duration
-            
-            txt_clip = LyricEffects.create_text_clip(current_text, font, fontsize, color)
-            txt_clip = txt_clip.set_start(t_start).set_duration(char_duration)
-            
-            if bg_color:
-                # Bikin background clip kalo ada
-                txt_w, txt_h = txt_clip.size
-                bg_clip = ColorClip(size=(txt_w, txt_h), color=bg_color)
-                bg_clip = bg_clip.set_opacity(0.5).set_duration(char_duration).set_start(t_start)
-                clips.append(bg_clip)
-                
-            clips.append(txt_clip)
-            
-        return CompositeVideoClip(clips).set_duration(duration)
+        raster = LyricEffects.render_text_rgba(text, font, fontsize, color)
+        height, width = raster.shape[:2]
+        offsets = np.round(LyricEffects.glyph_offsets(text, font, fontsize, width)).astype(int)
+        
+        rgb = raster[:, :, :3]
+        alpha = raster[:, :, 3].astype(np.float32) / 255.0
+        
+        if bg_color:
+            # Background semi transparan (opacity 0.5) di belakang prefix
+            bg_rgb = np.array(LyricEffects.parse_color(bg_color) if isinstance(bg_color, str) else bg_color[:3],
+                              dtype=np.float32)
+            a = alpha[:, :, None]
+            rgb = (rgb * a + bg_rgb * 0.5 * (1 - a)) / (a + 0.5 * (1 - a))
+            rgb = rgb.astype(np.uint8)
+            alpha = alpha + 0.5 * (1 - alpha)
+            
+        def make_mask(t):
+            shown = min(total_chars, int(t / char_duration) + 1) if char_duration > 0 else total_chars
+            x = offsets[shown]
+            if x >= width:
+                return alpha
+            frame = np.zeros_like(alpha)
+            frame[:, :x] = alpha[:, :x]
+            return frame
+            
+        mask = VideoClip(make_mask, ismask=True, duration=duration)
+        return ImageClip(rgb).set_duration(duration).set_mask(mask)
         
     @staticmethod
     def fade_effect(text, font, fontsize, color, duration, fade_type="in"):
@@ -383,19 +460,110 @@ class LyricEffects:
         """
         Efek warna berubah-ubah / rainbow
         """
-        # Untuk rainbow kita perlu membuat beberapa clip untuk setiap perubahan warna
-        clips = []
         colors = ['red', 'orange', 'yellow', 'green', 'blue', 'purple']
         segment_duration = duration / len(colors)
         
-        for i, color in enumerate(colors):
-            start_time = i * segment_duration
-            txt_clip = LyricEffects.create_text_clip(text, font, fontsize, color)
-            txt_clip = txt_clip.set_start(start_time).set_duration(segment_duration)
-            clips.append(txt_clip)
+        # Tiap warna mulai di awal segmennya, lalu bergeser halus ke warna berikutnya
+        knots_t = np.arange(len(colors)) * segment_duration
+        knots_rgb = np.array([LyricEffects.parse_color(color) for color in colors], dtype=np.float32)
+        
+        def color_at(t):
+            return np.array([np.interp(t, knots_t, knots_rgb[:, c]) for c in range(3)], dtype=np.float32)
             
-        return CompositeVideoClip(clips).set_duration(duration)
+        return LyricEffects.tinted_text_clip(text, font, fontsize, duration, color_at)
 
+    @staticmethod
+    def _karaoke_knots(text, words, offsets, duration):
+        """
+        Titik (waktu, posisi x) sapuan highlight berdasarkan batas kata
+        
+        Kalau tidak ada word timestamp, durasi dibagi rata per jumlah karakter kata.
+        """
+        spans = []
+        pos = 0
+        for word in words or []:
+            token = word['word'].strip()
+            index = text.find(token, pos) if token else -1
+            if index < 0:
+                continue
+            spans.append((index, index + len(token), word['start'], word['end']))
+            pos = index + len(token)
+            
+        if not spans:
+            matches = list(re.finditer(r'\S+', text))
+            total_chars = sum(len(m.group()) for m in matches) or 1
+            t = 0.0
+            for m in matches:
+                word_duration = duration * len(m.group()) / total_chars
+                spans.append((m.start(), m.end(), t, t + word_duration))
+                t += word_duration
+                
+        knots_t = [0.0]
+        knots_x = [0.0]
+        for char_start, char_end, word_start, word_end in spans:
+            knots_t += [word_start, word_end]
+            knots_x += [offsets[char_start], offsets[char_end]]
+        knots_t.append(duration)
+        knots_x.append(offsets[-1])
+        
+        # np.interp butuh waktu yang tidak turun
+        knots_t = np.maximum.accumulate(np.clip(knots_t, 0.0, duration))
+        return knots_t, np.array(knots_x)
+        
+    @staticmethod
+    def karaoke_effect(text, font, fontsize, color, duration, words=None, highlight_color="#FFD700"):
+        """
+        Efek karaoke: highlight menyapu teks mengikuti timing tiap kata
+        
+        Baris di-rasterize sekali (putih), lalu di-tint jadi versi warna dasar dan
+        versi highlight. Tiap frame cuma menyalin kolom di kiri posisi sapuan dari
+        versi highlight, tanpa bikin clip baru per kata/karakter.
+        
+        Parameters:
+            words (list): List {'word', 'start', 'end'} dengan waktu relatif ke awal baris
+            highlight_color (str): Warna teks yang sudah dinyanyikan
+        """
+        raster = LyricEffects.render_text_rgba(text, font, fontsize, "white")
+        height, width = raster.shape[:2]
+        
+        base = LyricEffects.tint_raster(raster, LyricEffects.parse_color(color))
+        highlight = LyricEffects.tint_raster(raster, LyricEffects.parse_color(highlight_color))
+        
+        offsets = LyricEffects.glyph_offsets(text, font, fontsize, width)
+        knots_t, knots_x = LyricEffects._karaoke_knots(text, words, offsets, duration)
+        
+        def make_frame(t):
+            x = int(round(np.interp(t, knots_t, knots_x)))
+            if x <= 0:
+                return base
+            if x >= width:
+                return highlight
+            frame = base.copy()
+            frame[:, :x] = highlight[:, :x]
+            return frame
+            
+        mask = ImageClip(raster[:, :, 3] / 255.0, ismask=True).set_duration(duration)
+        return VideoClip(make_frame, duration=duration).set_mask(mask)
+        
+    @staticmethod
+    def static_after(effect_name, duration):
+        """
+        Berapa detik sejak baris mulai sampai tampilannya berhenti berubah
+        
+        Returns:
+            float or None: 0 untuk teks diam, None kalau beranimasi sampai akhir
+        """
+        if effect_name == "fade_in":
+            return min(duration / 3, 1.5)
+        elif effect_name == "zoom_in":
+            return min(1.0, duration)
+        elif effect_name in ["slide_left", "slide_right", "slide_top", "slide_bottom"]:
+            return min(1.5, duration)
+        elif effect_name in LyricEffects.ANIMATED_EFFECTS:
+            return None
+        # Efek lain = teks statis (lihat default di apply_effect)
+        return 0.0
+        
     @staticmethod
     def apply_effect(text, effect_name, font="Arial", fontsize=70, color="white", duration=3.0, position="center", screen_size=(1920, 1080), **kwargs):
         """
@@ -444,6 +612,8 @@ class LyricEffects:
             clip = LyricEffects.shake_effect(text, font, fontsize, color, duration)
         elif effect_name == "wave":
             clip = LyricEffects.wave_effect(text, font, fontsize, color, duration)
+        elif effect_name == "karaoke":
+            clip = LyricEffects.karaoke_effect(text, font, fontsize, color, duration, **kwargs)
         
         # Efek warna
         elif effect_name == "rainbow":
@@ -0,0 +1,245 @@
+import os
+import re
+import json
+
+class LyricSidecar:
+    """
+    Class untuk membaca file lirik sidecar (.lrc, .srt, .vtt, .json) yang ada
+    di samping file audio, dan mengubahnya ke format {'text', 'start', 'end'}
+    yang sama dengan hasil transkrip Whisper
+    """
+
+    # Urutan prioritas: .lrc biasanya timing berlisensi, .srt biasanya hasil transkrip sebelumnya
+    EXTENSIONS = ('.lrc', '.srt', '.vtt', '.json')
+
+    # Durasi baris terakhir LRC kalau tidak ada penanda akhir (detik)
+    LRC_LAST_LINE_DURATION = 5.0
+
+    _CUE_TIME = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[,.](\d+))?')
+    _LRC_TIME = re.compile(r'\[(\d+):(\d{1,2})(?:[.:](\d+))?\]')
+    _LRC_OFFSET = re.compile(r'\[offset:\s*([+-]?\d+)\s*\]', re.IGNORECASE)
+    _LRC_WORD_TIME = re.compile(r'<\d+:\d{1,2}(?:[.:]\d+)?>')
+    _TAG = re.compile(r'<[^>]+>')
+
+    @staticmethod
+    def find_sidecars(audio_path):
+        """
+        Cari semua file sidecar untuk sebuah file audio
+
+        Parameters:
+            audio_path (str): Path ke file audio
+
+        Returns:
+            list: List path sidecar yang ada, urut sesuai prioritas
+        """
+        base = os.path.splitext(audio_path)[0]
+        found = []
+        for ext in LyricSidecar.EXTENSIONS:
+            for candidate in (base + ext, base + ext.upper()):
+                if os.path.exists(candidate):
+                    found.append(candidate)
+                    break
+        return found
+
+    @staticmethod
+    def load(path):
+        """
+        Parse file sidecar berdasarkan ekstensinya
+
+        Parameters:
+            path (str): Path ke file sidecar
+
+        Returns:
+            list: List of dictionaries {'text', 'start', 'end'}
+        """
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, "r", encoding="utf-8-sig") as f:
+            content = f.read()
+
+        if ext == ".srt":
+            return LyricSidecar.parse_srt(content)
+        elif ext == ".vtt":
+            return LyricSidecar.parse_vtt(content)
+        elif ext == ".lrc":
+            return LyricSidecar.parse_lrc(content)
+        elif ext == ".json":
+            return LyricSidecar.parse_json(content)
+        else:
+            raise ValueError(f"Unsupported sidecar format: {ext}")
+
+    @staticmethod
+    def _parse_cue_time(value):
+        """
+        Parse timestamp SRT/VTT ('0:00:01,500', '00:01.500', '01:02:03.4') ke detik
+        """
+        match = LyricSidecar._CUE_TIME.fullmatch(value.strip())
+        if not match:
+            raise ValueError(f"Invalid timestamp: {value}")
+        hours, minutes, seconds, fraction = match.groups()
+        total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+        if fraction:
+            total += float(f"0.{fraction}")
+        return total
+
+    @staticmethod
+    def _parse_cues(content):
+        """
+        Parser bersama untuk SRT dan VTT (blok dipisah baris kosong, timing pakai '-->')
+        """
+        lyrics = []
+        blocks = re.split(r'\n\s*\n', content.replace('\r\n', '\n').replace('\r', '\n'))
+
+        for block in blocks:
+            lines = [line.strip() for line in block.strip().split('\n')]
+            timing_index = next((i for i, line in enumerate(lines) if '-->' in line), None)
+            if timing_index is None:
+                # Header WEBVTT, NOTE, STYLE, dll
+                continue
+
+            start_str, end_str = lines[timing_index].split('-->', 1)
+            # VTT boleh punya cue settings setelah end time (ex: 'align:start')
+            end_str = end_str.strip().split(' ')[0]
+
+            text = " ".join(line for line in lines[timing_index + 1:] if line)
+            text = LyricSidecar._TAG.sub('', text).strip()
+            if not text:
+                continue
+
+            lyrics.append({
+                'text': text,
+                'start': LyricSidecar._parse_cue_time(start_str),
+                'end': LyricSidecar._parse_cue_time(end_str)
+            })
+
+        lyrics.sort(key=lambda lyric: lyric['start'])
+        return lyrics
+
+    @staticmethod
+    def parse_srt(content):
+        """
+        Parse isi file SRT
+        """
+        return LyricSidecar._parse_cues(content)
+
+    @staticmethod
+    def parse_vtt(content):
+        """
+        Parse isi file WebVTT
+        """
+        return LyricSidecar._parse_cues(content)
+
+    @staticmethod
+    def parse_lrc(content):
+        """
+        Parse isi file LRC
+
+        Satu baris bisa punya beberapa timestamp ('[00:12.00][01:30.00]reff'),
+        end time tiap baris = start baris berikutnya. Baris timestamp tanpa teks
+        dipakai sebagai penanda akhir baris sebelumnya.
+        """
+        offset = 0.0
+        offset_match = LyricSidecar._LRC_OFFSET.search(content)
+        if offset_match:
+            # Offset positif = lirik muncul lebih awal
+            offset = -int(offset_match.group(1)) / 1000.0
+
+        timed_lines = []
+        for line in content.splitlines():
+            line = line.strip()
+            stamps = []
+            pos = 0
+            while True:
+                match = LyricSidecar._LRC_TIME.match(line, pos)
+                if not match:
+                    break
+                minutes, seconds, fraction = match.groups()
+                start = int(minutes) * 60 + int(seconds)
+                if fraction:
+                    start += float(f"0.{fraction}")
+                stamps.append(max(0.0, start + offset))
+                pos = match.end()
+
+            if not stamps:
+                # Metadata tag ([ar:], [ti:], ...) atau baris kosong
+                continue
+
+            # Enhanced LRC: buang timestamp per kata '<mm:ss.xx>'
+            text = LyricSidecar._LRC_WORD_TIME.sub('', line[pos:]).strip()
+            for start in stamps:
+                timed_lines.append((start, text))
+
+        timed_lines.sort(key=lambda item: item[0])
+
+        lyrics = []
+        for i, (start, text) in enumerate(timed_lines):
+            if not text:
+                continue
+            if i + 1 < len(timed_lines):
+                end = timed_lines[i + 1][0]
+            else:
+                end = start + LyricSidecar.LRC_LAST_LINE_DURATION
+            lyrics.append({'text': text, 'start': start, 'end': end})
+
+        return lyrics
+
+    @staticmethod
+    def parse_json(content):
+        """
+        Parse JSON: list lirik (output format_lyrics 'json') atau hasil Whisper ({'segments': [...]})
+        """
+        data = json.loads(content)
+        if isinstance(data, dict):
+            data = data.get("segments", data.get("lyrics", []))
+
+        lyrics = []
+        for item in data:
+            lyric = {
+                'text': str(item['text']).strip(),
+                'start': float(item['start']),
+                'end': float(item['end'])
+            }
+            if item.get('words'):
+                lyric['words'] = [
+                    {'word': str(word['word']).strip(), 'start': float(word['start']), 'end': float(word['end'])}
+                    for word in item['words']
+                ]
+            if lyric['text']:
+                lyrics.append(lyric)
+
+        lyrics.sort(key=lambda lyric: lyric['start'])
+        return lyrics
+
+    @staticmethod
+    def format_time(seconds, separator=","):
+        """
+        Format detik ke timestamp SRT ('00:01:02,500') atau VTT (separator '.')
+        """
+        millis = int(round(max(0.0, seconds) * 1000))
+        hours, millis = divmod(millis, 3600000)
+        minutes, millis = divmod(millis, 60000)
+        secs, millis = divmod(millis, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+    @staticmethod
+    def to_srt(lyrics):
+        """
+        Tulis lirik sebagai isi file SRT
+        """
+        blocks = []
+        for i, lyric in enumerate(lyrics):
+            start = LyricSidecar.format_time(lyric['start'])
+            end = LyricSidecar.format_time(lyric['end'])
+            blocks.append(f"{i+1}\n{start} --> {end}\n{lyric['text']}\n")
+        return "\n".join(blocks)
+
+    @staticmethod
+    def to_vtt(lyrics):
+        """
+        Tulis lirik sebagai isi file WebVTT
+        """
+        blocks = ["WEBVTT\n"]
+        for lyric in lyrics:
+            start = LyricSidecar.format_time(lyric['start'], ".")
+            end = LyricSidecar.format_time(lyric['end'], ".")
+            blocks.append(f"{start} --> {end}\n{lyric['text']}\n")
+        return "\n".join(blocks)
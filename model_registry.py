@@ -0,0 +1,208 @@
+import gc
+import threading
+from collections import OrderedDict
+
+import whisper
+
+class ModelRegistry:
+    """
+    Registry model Whisper untuk satu process
+
+    Model disimpan per (size, device, dtype) dengan reference counting.
+    Model yang sudah tidak dipakai (refcount 0) tetap disimpan supaya
+    ganti-ganti model di GUI tidak load ulang, dan baru dibuang (LRU)
+    kalau total memori melebihi budget.
+    """
+
+    # Perkiraan ukuran parameter fp32 (MB), dipakai sebelum model benar-benar diload
+    ESTIMATED_SIZE_MB = {
+        "tiny": 160,
+        "base": 300,
+        "small": 980,
+        "medium": 3100,
+        "large": 6200,
+    }
+
+    def __init__(self, memory_budget_mb=8192):
+        """
+        Initialize the model registry
+
+        Parameters:
+            memory_budget_mb (float): Batas total memori model yang disimpan (MB)
+        """
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+
+        # key -> {'model', 'refcount', 'size_bytes'}, urutan = LRU (paling lama di depan)
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def resolve_device(device=None):
+        """
+        Pilih device default: cuda kalau ada, selain itu cpu
+        """
+        if device:
+            return device
+        try:
+            import torch
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        except ImportError:
+            return "cpu"
+
+    @staticmethod
+    def model_size_bytes(model):
+        """
+        Hitung ukuran parameter + buffer model dalam bytes
+        """
+        total = 0
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+        return total
+
+    def make_key(self, model_size, device=None, dtype=None):
+        """
+        Key registry: (size, device, dtype)
+        """
+        return (model_size, self.resolve_device(device), dtype or "float32")
+
+    def acquire(self, model_size, device=None, dtype=None):
+        """
+        Ambil model dari registry (load kalau belum ada) dan naikkan refcount
+
+        Parameters:
+            model_size (str): Ukuran model Whisper
+            device (str): 'cpu', 'cuda', dll (default: otomatis)
+            dtype (str): 'float32' atau 'float16'
+
+        Returns:
+            whisper.model.Whisper: Model yang siap dipakai
+        """
+        key = self.make_key(model_size, device, dtype)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["refcount"] += 1
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["model"]
+
+            # Kosongkan tempat dulu sebelum load supaya peak memori tidak dobel
+            estimated = self.ESTIMATED_SIZE_MB.get(model_size, 0) * 1024 * 1024
+            self._evict(extra_bytes=estimated)
+
+            print(f"Loading Whisper model '{model_size}' on {key[1]} ({key[2]})...")
+            model = whisper.load_model(model_size, device=key[1])
+            if key[2] == "float16":
+                model = model.half()
+            print("Model loaded!")
+
+            self._entries[key] = {
+                "model": model,
+                "refcount": 1,
+                "size_bytes": self.model_size_bytes(model),
+            }
+            self.loads += 1
+
+            self._evict()
+            return model
+
+    def release(self, model_size, device=None, dtype=None):
+        """
+        Turunkan refcount model. Model tetap disimpan (warm) sampai kena eviction.
+        """
+        key = self.make_key(model_size, device, dtype)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["refcount"] = max(0, entry["refcount"] - 1)
+            self._evict()
+
+    def _evict(self, extra_bytes=0):
+        """
+        Buang model idle yang paling lama tidak dipakai sampai total di bawah budget.
+        Model yang masih dipakai (refcount > 0) tidak pernah dibuang.
+        """
+        total = sum(entry["size_bytes"] for entry in self._entries.values()) + extra_bytes
+
+        evicted = False
+        for key in list(self._entries.keys()):
+            if total <= self.memory_budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry["refcount"] > 0:
+                continue
+            total -= entry["size_bytes"]
+            del self._entries[key]
+            self.evictions += 1
+            evicted = True
+            print(f"Evicted Whisper model '{key[0]}' ({key[1]}, {key[2]}) from registry")
+
+        if evicted:
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except ImportError:
+                pass
+
+    def set_memory_budget(self, memory_budget_mb):
+        """
+        Ubah budget memori dan langsung jalankan eviction
+        """
+        with self._lock:
+            self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        """
+        Buang semua model idle
+        """
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e["refcount"] == 0]:
+                del self._entries[key]
+            gc.collect()
+
+    def stats(self):
+        """
+        Statistik registry untuk logging/debugging
+
+        Returns:
+            dict: loads, hits, evictions, dan daftar model yang sedang disimpan
+        """
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "models": [
+                    {
+                        "model_size": key[0],
+                        "device": key[1],
+                        "dtype": key[2],
+                        "refcount": entry["refcount"],
+                        "size_mb": entry["size_bytes"] / (1024 * 1024),
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_model_registry():
+    """
+    Registry global (satu per process)
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
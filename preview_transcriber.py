@@ -0,0 +1,158 @@
+import difflib
+import os
+import threading
+import traceback
+
+from audio_processor import AudioProcessor
+
+class Refinement:
+    """
+    Status satu lagu di mode dua tahap: lirik preview, lalu lirik hasil refine
+    """
+
+    def __init__(self, audio_path, preview, source="whisper"):
+        self.audio_path = audio_path
+        self.preview = preview
+        # Versi terbaru yang sudah siap (preview dulu, lalu hasil refine)
+        self.lyrics = preview
+        self.source = source
+        # Rentang waktu (start, end) yang berubah setelah refine
+        self.dirty_ranges = []
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        """
+        True kalau refine sudah selesai (atau tidak diperlukan)
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Tunggu sampai refine selesai
+
+        Returns:
+            list: Lirik terbaru
+        """
+        self._done.wait(timeout)
+        return self.lyrics
+
+class PreviewTranscriber:
+    """
+    Transkripsi dua tahap untuk preview cepat
+
+    Model kecil (default 'tiny') dipakai dulu supaya lirik langsung ada untuk
+    preview dan layout, lalu model pilihan jalan di background thread. Begitu
+    selesai, hasilnya menggantikan preview dan rentang waktu yang berubah
+    dilaporkan supaya cuma bagian render itu yang perlu dibuat ulang.
+    """
+
+    def __init__(self, audio_processor, preview_model="tiny"):
+        """
+        Parameters:
+            audio_processor (AudioProcessor): Processor dengan model final
+            preview_model (str): Model Whisper untuk preview
+        """
+        self.audio_processor = audio_processor
+        self.preview_model = preview_model
+
+        kwargs = audio_processor.worker_kwargs()
+        kwargs["model_size"] = preview_model
+        self.preview_processor = AudioProcessor(sidecar_policy="prefer_whisper", **kwargs)
+
+    def start(self, audio_path, language=None, on_refined=None):
+        """
+        Transkrip preview sekarang, refine di background
+
+        Parameters:
+            audio_path (str): Path ke file audio
+            language (str): Kode bahasa (opsional)
+            on_refined (callable): Dipanggil dengan Refinement begitu refine selesai
+                                   (dari background thread)
+
+        Returns:
+            Refinement: refinement.lyrics langsung berisi lirik preview
+        """
+        # Sidecar / cache model final sudah final, tidak perlu preview
+        lyrics, source = self.audio_processor.lookup_lyrics(audio_path, language)
+        if lyrics is None and self.audio_processor.model_size == self.preview_model:
+            lyrics, source = self.audio_processor.get_lyrics(audio_path, language)
+        if lyrics is not None:
+            refinement = Refinement(audio_path, lyrics, source)
+            refinement._done.set()
+            if on_refined:
+                on_refined(refinement)
+            return refinement
+
+        print(f"Preview transcription ({self.preview_model}): {os.path.basename(audio_path)}")
+        preview = self.preview_processor.transcribe_audio(audio_path, language)
+        refinement = Refinement(audio_path, preview)
+
+        thread = threading.Thread(target=self._refine, args=(refinement, language, on_refined), daemon=True)
+        thread.start()
+        return refinement
+
+    def _refine(self, refinement, language, on_refined):
+        """
+        Jalankan model final dan tukar lirik preview dengan hasilnya
+        """
+        try:
+            lyrics, source = self.audio_processor.get_lyrics(refinement.audio_path, language)
+            refinement.dirty_ranges = self.diff_lyrics(refinement.preview, lyrics)
+            refinement.lyrics = lyrics
+            refinement.source = source
+            print(f"✓ Refined: {os.path.basename(refinement.audio_path)} "
+                  f"({len(refinement.dirty_ranges)} changed range(s))")
+        except Exception as e:
+            # Refine gagal, preview tetap dipakai
+            print(f"✗ Error refining {os.path.basename(refinement.audio_path)}: {str(e)}")
+            traceback.print_exc()
+            refinement.error = e
+        finally:
+            refinement._done.set()
+
+        if on_refined:
+            on_refined(refinement)
+
+    @staticmethod
+    def diff_lyrics(old, new, tolerance=0.05):
+        """
+        Bandingkan dua versi lirik dan cari rentang waktu yang berubah
+
+        Parameters:
+            old (list): Lirik lama (preview)
+            new (list): Lirik baru (hasil refine)
+            tolerance (float): Selisih waktu (detik) yang dianggap sama
+
+        Returns:
+            list: List of (start, end) yang urut dan tidak overlap
+        """
+        def key(lyric):
+            words = tuple((word['word'], round(word['start'] / tolerance)) for word in lyric.get('words', []))
+            return (lyric['text'], round(lyric['start'] / tolerance), round(lyric['end'] / tolerance), words)
+
+        matcher = difflib.SequenceMatcher(None, [key(lyric) for lyric in old], [key(lyric) for lyric in new],
+                                          autojunk=False)
+
+        ranges = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            changed = old[i1:i2] + new[j1:j2]
+            ranges.append((min(lyric['start'] for lyric in changed), max(lyric['end'] for lyric in changed)))
+
+        ranges.sort()
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def close(self):
+        """
+        Lepas model preview ke registry
+        """
+        self.preview_processor.release_model()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+
+import ffmpeg
+
+from lyric_sidecar import LyricSidecar
+
+class SoftSubtitleMuxer:
+    """
+    Output cepat tanpa render teks: background still + audio asli + track lirik
+
+    Lirik disimpan sebagai track subtitle yang bisa dipilih di player
+    (mov_text di MP4, atau SRT/WebVTT di MKV). Video cuma satu gambar diam
+    dengan frame rate rendah, jadi encode-nya jauh lebih cepat dari durasi lagu.
+    """
+
+    # format -> (ekstensi output, codec subtitle, format file lirik sementara)
+    SUBTITLE_FORMATS = {
+        "mov_text": (".mp4", "mov_text", "srt"),
+        "srt": (".mkv", "srt", "srt"),
+        "webvtt": (".mkv", "webvtt", "vtt"),
+    }
+
+    # Kode bahasa Whisper (ISO 639-1) -> ISO 639-2 untuk metadata track
+    LANGUAGE_CODES = {
+        "id": "ind", "en": "eng", "ja": "jpn", "ko": "kor", "zh": "zho",
+        "es": "spa", "fr": "fra", "de": "deu", "it": "ita", "ru": "rus",
+    }
+
+    @staticmethod
+    def language_tag(language):
+        """
+        Kode bahasa untuk metadata track (ISO 639-2), None kalau tidak diketahui
+        """
+        if not language:
+            return None
+        language = language.lower()
+        if len(language) == 3:
+            return language
+        return SoftSubtitleMuxer.LANGUAGE_CODES.get(language)
+
+    @staticmethod
+    def output_extension(subtitle_format):
+        """
+        Ekstensi container untuk format subtitle
+        """
+        return SoftSubtitleMuxer.SUBTITLE_FORMATS[subtitle_format][0]
+
+    @staticmethod
+    def mux(background_path, audio_path, lyrics, output_file, subtitle_format="mov_text",
+            fps=1, audio_bitrate="320k", language=None, audio_codec="aac"):
+        """
+        Gabungkan background, audio dan lirik jadi satu file
+
+        Parameters:
+            background_path (str): Gambar background yang sudah seukuran video
+            audio_path (str): Path file audio
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            output_file (str): Path output (ekstensinya harus cocok dengan format)
+            subtitle_format (str): 'mov_text', 'srt' atau 'webvtt'
+            fps (int): Frame rate video still
+            language (str): Kode bahasa ISO 639-1 atau 639-2 untuk track lirik (opsional)
+            audio_codec (str): 'aac' (transcode) atau 'copy' (stream audio asli)
+
+        Returns:
+            str: Path ke file output
+        """
+        if subtitle_format not in SoftSubtitleMuxer.SUBTITLE_FORMATS:
+            raise ValueError(f"Unsupported subtitle format: {subtitle_format}")
+        _, subtitle_codec, file_format = SoftSubtitleMuxer.SUBTITLE_FORMATS[subtitle_format]
+
+        work_dir = tempfile.mkdtemp(prefix="alvg_subs_")
+        try:
+            subtitle_path = os.path.join(work_dir, f"lyrics.{file_format}")
+            with open(subtitle_path, "w", encoding="utf-8") as f:
+                f.write(LyricSidecar.to_vtt(lyrics) if file_format == "vtt" else LyricSidecar.to_srt(lyrics))
+
+            video = ffmpeg.input(background_path, loop=1, framerate=fps)
+            audio = ffmpeg.input(audio_path).audio
+            subtitles = ffmpeg.input(subtitle_path)["s"]
+
+            output_args = {
+                "vcodec": "libx264",
+                "tune": "stillimage",
+                "preset": "veryfast",
+                "pix_fmt": "yuv420p",
+                "acodec": audio_codec,
+                "scodec": subtitle_codec,
+                "shortest": None,
+            }
+            if audio_codec != "copy":
+                output_args["audio_bitrate"] = audio_bitrate
+            language_tag = SoftSubtitleMuxer.language_tag(language)
+            if language_tag:
+                output_args["metadata:s:s:0"] = f"language={language_tag}"
+
+            (
+                ffmpeg
+                .output(video, audio, subtitles, output_file, **output_args)
+                .global_args("-nostdin", "-loglevel", "error")
+                .overwrite_output()
+                .run()
+            )
+            return output_file
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
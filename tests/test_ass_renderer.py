@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("ffmpeg")
+pytest.importorskip("PIL")
+
+from ass_renderer import AssRenderer
+
+LYRICS = [
+    {"text": "first {line}", "start": 1.5, "end": 3.0},
+    {"text": "second\nline", "start": 3661.25, "end": 3663.0},
+]
+
+def dialogues(script):
+    return [line for line in script.splitlines() if line.startswith("Dialogue:")]
+
+def test_ass_time_and_color():
+    assert AssRenderer.ass_time(1.5) == "0:00:01.50"
+    assert AssRenderer.ass_time(3661.256) == "1:01:01.26"
+    assert AssRenderer.ass_time(-1.0) == "0:00:00.00"
+    assert AssRenderer.ass_color("#102030") == "&H00302010"
+
+def test_build_script_header_and_events():
+    script = AssRenderer.build_script(LYRICS, "fade_in", "Arial", 48, "#FFFFFF", "bottom", (1920, 1080))
+
+    assert script.startswith("[Script Info]\n")
+    assert "PlayResX: 1920\nPlayResY: 1080\n" in script
+    assert "Style: Default,Arial,48,&H00FFFFFF,&H00FFFFFF," in script
+
+    events = dialogues(script)
+    assert events[0] == "Dialogue: 0,0:00:01.50,0:00:03.00,Default,,0,0,0,,{\\an8\\pos(960,864)\\fad(500,0)}first (line)"
+    assert events[1].startswith("Dialogue: 0,1:01:01.25,1:01:03.00,")
+    assert events[1].endswith("}second line")
+
+def test_karaoke_uses_word_timings_and_highlight_color():
+    lyric = {
+        "text": "a b", "start": 1.0, "end": 3.0,
+        "words": [{"word": " a", "start": 1.0, "end": 1.5}, {"word": " b", "start": 1.7, "end": 3.0}],
+    }
+    script = AssRenderer.build_script([lyric], "karaoke", "Arial", 48, "#FFFFFF", "center", (1280, 720),
+                                      highlight_color="#FF0000")
+
+    assert "Style: Default,Arial,48,&H000000FF,&H00FFFFFF," in script
+    assert dialogues(script)[0].endswith("{\\kf50}a {\\k20}{\\kf130}b")
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("ffmpeg")
+
+from audio_mux import AudioMuxer
+from audio_probe import AudioProbe
+
+def probe_codec(monkeypatch, codec):
+    def probe(audio_path):
+        if codec is None:
+            raise ValueError(f"No audio stream found in {audio_path}")
+        return {"codec": codec}
+    monkeypatch.setattr(AudioProbe, "probe", staticmethod(probe))
+
+@pytest.mark.parametrize("codec, container, expected", [
+    ("aac", ".mp4", "copy"),
+    ("mp3", ".mp4", "copy"),
+    ("alac", ".mp4", "copy"),
+    ("pcm_s16le", ".mp4", "aac"),
+    ("flac", ".mp4", "aac"),
+    ("flac", ".mkv", "copy"),
+    ("opus", ".MKV", "copy"),
+    ("aac", ".webm", "aac"),
+    (None, ".mp4", "aac"),
+])
+def test_audio_codec_copies_only_container_compatible_streams(monkeypatch, codec, container, expected):
+    probe_codec(monkeypatch, codec)
+
+    assert AudioMuxer.audio_codec("song", container) == expected
+    assert AudioMuxer.can_copy("song", container) == (expected == "copy")
+
+def test_prepare_stream_copy_uses_source_file(monkeypatch, tmp_path):
+    probe_codec(monkeypatch, "aac")
+
+    prepared = AudioMuxer.prepare("song.m4a", str(tmp_path))
+
+    assert prepared.copy
+    assert prepared.process is None
+    assert prepared.wait() == "song.m4a"
+
+def test_prepare_transcodes_incompatible_audio_in_background(monkeypatch, tmp_path):
+    import ffmpeg
+
+    probe_codec(monkeypatch, "pcm_s16le")
+    started = []
+    def run_async(stream, *args, **kwargs):
+        started.append(stream.get_args())
+        return None
+    monkeypatch.setattr(ffmpeg.nodes.OutputStream, "run_async", run_async)
+
+    prepared = AudioMuxer.prepare("song.wav", str(tmp_path), bitrate="256k")
+
+    assert not prepared.copy
+    assert prepared.path == str(tmp_path / "audio.m4a")
+    args = started[0]
+    assert args[args.index("-acodec") + 1] == "aac"
+    assert args[args.index("-b:a") + 1] == "256k"
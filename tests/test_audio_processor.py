@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("whisper")
+pytest.importorskip("pydub")
+
+from audio_processor import AudioProcessor
+
+SAMPLE_RATE = 16000
+
+def test_split_points_land_in_quietest_window():
+    processor = AudioProcessor(use_cache=False, chunk_seconds=10)
+    samples = np.full(25 * SAMPLE_RATE, 0.5, dtype=np.float32)
+    # Satu-satunya bagian hening di sekitar target 10 detik
+    samples[int(11.0 * SAMPLE_RATE):int(11.1 * SAMPLE_RATE)] = 0.0
+
+    points = processor.find_split_points(samples, SAMPLE_RATE)
+
+    assert points[0] == 0.0
+    assert points[-1] == pytest.approx(25.0)
+    assert points[1] == pytest.approx(11.05)
+
+def test_short_tail_is_not_split_off():
+    processor = AudioProcessor(use_cache=False, chunk_seconds=10)
+    samples = np.full(12 * SAMPLE_RATE, 0.5, dtype=np.float32)
+
+    assert processor.find_split_points(samples, SAMPLE_RATE) == [0.0, pytest.approx(12.0)]
+
+def test_stitch_shifts_times_and_keeps_owned_segments():
+    chunks = [
+        (0.0, 10.0, 0.0, [
+            {"text": "one", "start": 1.0, "end": 2.0},
+            {"text": "overlap", "start": 10.5, "end": 11.5},
+        ]),
+        (10.0, 20.0, 8.0, [
+            {"text": "before", "start": 0.5, "end": 1.5},
+            {"text": "overlap", "start": 2.5, "end": 3.5,
+             "words": [{"word": "overlap", "start": 2.5, "end": 3.5}]},
+        ]),
+    ]
+
+    stitched = AudioProcessor.stitch_chunks(chunks)
+
+    assert [lyric["text"] for lyric in stitched] == ["one", "overlap"]
+    assert stitched[1]["start"] == pytest.approx(10.5)
+    assert stitched[1]["words"][0]["start"] == pytest.approx(10.5)
+    # Input tidak diubah
+    assert chunks[1][3][1]["start"] == 2.5
+
+def test_stitch_merges_duplicate_at_boundary():
+    chunks = [
+        (0.0, 10.0, 0.0, [{"text": "same", "start": 9.0, "end": 10.5}]),
+        (10.0, 20.0, 9.0, [{"text": "same", "start": 0.2, "end": 1.8}]),
+    ]
+
+    stitched = AudioProcessor.stitch_chunks(chunks)
+
+    assert len(stitched) == 1
+    assert stitched[0]["end"] == pytest.approx(10.8)
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("moviepy")
+
+from moviepy.editor import ColorClip
+
+from compositor import LyricCompositor
+
+SIZE = (64, 36)
+
+def make_background(duration=10):
+    return ColorClip(SIZE, color=(0, 0, 0)).set_duration(duration)
+
+def make_lyric(start, end):
+    return ColorClip((16, 8), color=(255, 255, 255)).set_start(start).set_duration(end - start)
+
+def test_active_clips_follow_start_and_end():
+    # Sengaja tidak urut, dan clip panjang pertama menutupi clip pendek sesudahnya
+    clips = [make_lyric(4, 6), make_lyric(0, 5), make_lyric(1, 2)]
+    compositor = LyricCompositor(make_background(), clips)
+
+    assert compositor.active_clips(0.5) == [clips[1]]
+    assert compositor.active_clips(1.5) == [clips[1], clips[2]]
+    # Clip berhenti tepat di end-nya
+    assert compositor.active_clips(2.0) == [clips[1]]
+    assert compositor.active_clips(4.5) == [clips[1], clips[0]]
+    assert compositor.active_clips(7.0) == []
+
+def test_static_runs_cover_gaps_and_settled_text():
+    clips = [make_lyric(2, 4), make_lyric(6, 8)]
+    compositor = LyricCompositor(make_background(), clips, static_after=[None, 0.5])
+
+    assert compositor.static_runs() == [(0.0, 2.0), (4.0, 6.0), (6.5, 10.0)]
+
+def test_counters_are_shared_with_clip_copies():
+    compositor = LyricCompositor(make_background(), [make_lyric(1, 2)])
+    copy = compositor.set_duration(5)
+
+    copy.get_frame(0.5)
+    copy.get_frame(1.5)
+
+    assert copy is not compositor
+    assert compositor.stats()["frames"] == 2
+    assert compositor.layer_counts == {0: 1, 1: 1}
+    assert copy.stats() == compositor.stats()
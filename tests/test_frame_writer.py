@@ -0,0 +1,92 @@
+import math
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("ffmpeg")
+pytest.importorskip("moviepy")
+
+from moviepy.editor import ColorClip, VideoClip
+
+from compositor import LyricCompositor
+from frame_writer import RingBufferFrameWriter
+
+# Pengganti ffmpeg: baca semua frame dari stdin, tulis jumlah byte-nya ke stdout
+CONSUMER = "import sys; print(len(sys.stdin.buffer.read()))"
+
+def fake_ffmpeg(monkeypatch, script, exited=False):
+    import ffmpeg
+
+    processes = []
+    def run_async(stream, pipe_stdin=False, **kwargs):
+        assert pipe_stdin
+        process = subprocess.Popen([sys.executable, "-c", script],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        if exited:
+            process.wait()
+        processes.append(process)
+        return process
+    monkeypatch.setattr(ffmpeg.nodes.OutputStream, "run_async", run_async)
+    return processes
+
+def make_compositor(size=(64, 36), duration=1.0):
+    background = ColorClip(size, color=(0, 0, 0)).set_duration(duration)
+    lyric = ColorClip((16, 8), color=(255, 255, 255)).set_start(0.2).set_duration(0.5)
+    return LyricCompositor(background, [lyric])
+
+def test_compositor_frames_are_rendered_into_the_ring(monkeypatch):
+    processes = fake_ffmpeg(monkeypatch, CONSUMER)
+    clip = make_compositor()
+    writer = RingBufferFrameWriter("out.mp4", clip.size, fps=30, ring_size=3)
+
+    stats = writer.write(clip, 0.95, progress=False)
+
+    frames = math.ceil(0.95 * 30)
+    assert stats["frames"] == frames
+    assert stats["allocations"] == 0
+    assert stats["allocations_per_frame"] == 0.0
+    assert int(processes[0].stdout.read()) == frames * 64 * 36 * 3
+
+def test_plain_clip_counts_one_allocation_per_frame(monkeypatch):
+    fake_ffmpeg(monkeypatch, CONSUMER)
+    clip = VideoClip(lambda t: np.full((36, 64, 3), int(t * 100), dtype=np.uint8), duration=0.5)
+    writer = RingBufferFrameWriter("out.mp4", (64, 36), fps=10)
+
+    stats = writer.write(clip, progress=False)
+
+    assert stats["frames"] == 5
+    assert stats["allocations"] == 5
+    assert stats["allocations_per_frame"] == 1.0
+
+def test_dead_ffmpeg_raises_instead_of_hanging(monkeypatch):
+    processes = fake_ffmpeg(monkeypatch, "import sys; sys.exit(1)", exited=True)
+    # Frame lebih besar dari buffer pipe, jadi write langsung gagal
+    clip = make_compositor(size=(320, 240), duration=2.0)
+    writer = RingBufferFrameWriter("out.mp4", clip.size, fps=30, ring_size=2)
+
+    with pytest.raises(RuntimeError, match="ffmpeg pipe closed"):
+        writer.write(clip, progress=False)
+    assert writer.frames < 60
+    assert processes[0].returncode == 1
+
+def test_ffmpeg_error_exit_code_raises(monkeypatch):
+    fake_ffmpeg(monkeypatch, "import sys; sys.stdin.buffer.read(); sys.exit(3)")
+    clip = make_compositor()
+    writer = RingBufferFrameWriter("out.mp4", clip.size, fps=10)
+
+    with pytest.raises(RuntimeError, match="code 3"):
+        writer.write(clip, progress=False)
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg binary not installed")
+def test_encodes_with_real_ffmpeg(tmp_path):
+    import ffmpeg
+
+    output = str(tmp_path / "out.mp4")
+    writer = RingBufferFrameWriter(output, (64, 36), fps=30, preset="ultrafast")
+    stats = writer.write(make_compositor(), progress=False)
+
+    stream = ffmpeg.probe(output, count_frames=None)["streams"][0]
+    assert int(stream["nb_read_frames"]) == stats["frames"] == 30
@@ -0,0 +1,88 @@
+import colorsys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("moviepy")
+pytest.importorskip("PIL")
+
+from lyric_effects import LyricEffects
+
+@pytest.fixture
+def white_raster(monkeypatch):
+    # Kolom 0 putih penuh, kolom 1 anti-alias setengah terang
+    raster = np.zeros((4, 2, 4), dtype=np.uint8)
+    raster[:, 0, :3] = 255
+    raster[:, 1, :3] = 128
+    raster[:, :, 3] = 255
+    monkeypatch.setattr(LyricEffects, "render_text_rgba",
+                        staticmethod(lambda text, font, fontsize, color="white", *args: raster))
+    return raster
+
+def pixel(clip, t):
+    return clip.get_frame(t)[0, 0].astype(int).tolist()
+
+def test_tint_scales_shade_by_colour():
+    raster = np.zeros((1, 2, 4), dtype=np.uint8)
+    raster[0, :, :3] = [[255, 255, 255], [128, 128, 128]]
+
+    tinted = LyricEffects.tint_raster(raster, (200, 100, 0))
+
+    assert tinted.tolist() == [[[200, 100, 0], [100, 50, 0]]]
+
+def test_gradient_runs_from_start_to_end_colour(white_raster):
+    clip = LyricEffects.color_gradient_effect("x", "Arial", 70, ["#FF0000", "#0000FF"], 4.0)
+
+    assert pixel(clip, 0.0) == [255, 0, 0]
+    assert pixel(clip, 2.0) == [127, 0, 127]
+    assert pixel(clip, 4.0) == [0, 0, 255]
+    # Pixel anti-alias ikut diwarnai sebanding terangnya
+    assert clip.get_frame(4.0)[0, 1].tolist() == [0, 0, 128]
+
+def test_spectrum_matches_old_stepped_colours_at_step_starts(white_raster):
+    duration, steps = 4.0, 20
+    clip = LyricEffects.color_spectrum_effect("x", "Arial", 70, duration)
+
+    for i in (0, 5, 13):
+        # Versi lama: clip per step dengan warna hue i / steps
+        expected = [int(c * 255) for c in colorsys.hsv_to_rgb(i / float(steps), 1.0, 1.0)]
+        actual = pixel(clip, duration * i / steps)
+        assert all(abs(a - e) <= 1 for a, e in zip(actual, expected))
+
+def test_rainbow_hits_each_colour_at_its_segment_start(white_raster):
+    colors = [(255, 0, 0), (255, 165, 0), (255, 255, 0), (0, 128, 0), (0, 0, 255), (128, 0, 128)]
+    clip = LyricEffects.rainbow_effect("x", "Arial", 70, 6.0)
+
+    for i, color in enumerate(colors):
+        assert pixel(clip, float(i)) == list(color)
+    # Di tengah segmen warnanya campuran dua warna berurutan
+    assert pixel(clip, 0.5) == [255, 82, 0]
+
+def test_glyph_offsets_cover_every_prefix():
+    text = "hello world"
+    offsets = LyricEffects.glyph_offsets(text, "Arial", 40, 300)
+
+    assert len(offsets) == len(text) + 1
+    assert offsets[0] == 0
+    assert offsets[-1] == pytest.approx(300)
+    assert np.all(np.diff(offsets) >= 0)
+
+def test_typing_reveals_prefix_by_character_count(monkeypatch):
+    text, width, duration = "typing!", 140, 3.5
+    raster = np.full((10, width, 4), 255, dtype=np.uint8)
+    monkeypatch.setattr(LyricEffects, "render_text_rgba",
+                        staticmethod(lambda text, font, fontsize, color="white", *args: raster))
+    offsets = np.round(LyricEffects.glyph_offsets(text, "Arial", 40, width)).astype(int)
+    clip = LyricEffects.typing_effect(text, "Arial", 40, "white", duration)
+    char_duration = duration / len(text)
+
+    revealed = []
+    for t in np.linspace(0.0, duration - 1e-3, 29):
+        shown = min(len(text), int(t / char_duration) + 1)
+        columns = int(np.count_nonzero(clip.mask.get_frame(t).any(axis=0)))
+        assert columns == offsets[shown]
+        revealed.append(columns)
+
+    assert revealed == sorted(revealed)
+    # Karakter terakhir ikut tampil di akhir baris
+    assert revealed[-1] == width
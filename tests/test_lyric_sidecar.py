@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+from lyric_sidecar import LyricSidecar
+
+def test_parse_srt():
+    content = (
+        "1\r\n00:00:01,500 --> 00:00:03,000\r\nHello <i>world</i>\r\n\r\n"
+        "2\r\n00:00:04,000 --> 00:00:06,250\r\nsecond\r\nline\r\n"
+    )
+    assert LyricSidecar.parse_srt(content) == [
+        {'text': 'Hello world', 'start': 1.5, 'end': 3.0},
+        {'text': 'second line', 'start': 4.0, 'end': 6.25},
+    ]
+
+def test_parse_vtt_skips_header_and_cue_settings():
+    content = (
+        "WEBVTT\n\nNOTE generated\n\n"
+        "00:01.000 --> 00:02.500 align:start\nfirst\n\n"
+        "intro\n01:00:00.000 --> 01:00:01.000\nlast\n"
+    )
+    assert LyricSidecar.parse_vtt(content) == [
+        {'text': 'first', 'start': 1.0, 'end': 2.5},
+        {'text': 'last', 'start': 3600.0, 'end': 3601.0},
+    ]
+
+def test_parse_lrc_repeated_stamps_end_marker_and_offset():
+    content = (
+        "[ar:Someone]\n"
+        "[offset:+500]\n"
+        "[00:10.00][00:30.00]reff\n"
+        "[00:20.00]<00:20.00>verse <00:21.00>line\n"
+        "[00:25.00]\n"
+    )
+    assert LyricSidecar.parse_lrc(content) == [
+        {'text': 'reff', 'start': 9.5, 'end': 19.5},
+        {'text': 'verse line', 'start': 19.5, 'end': 24.5},
+        {'text': 'reff', 'start': 29.5, 'end': 29.5 + LyricSidecar.LRC_LAST_LINE_DURATION},
+    ]
+
+def test_parse_json_whisper_segments_keeps_words():
+    content = json.dumps({"segments": [
+        {"text": " second ", "start": 2, "end": 3},
+        {"text": "first", "start": 0, "end": 1,
+         "words": [{"word": " first", "start": 0, "end": 0.8}]},
+        {"text": "  ", "start": 4, "end": 5},
+    ]})
+    assert LyricSidecar.parse_json(content) == [
+        {'text': 'first', 'start': 0.0, 'end': 1.0, 'words': [{'word': 'first', 'start': 0.0, 'end': 0.8}]},
+        {'text': 'second', 'start': 2.0, 'end': 3.0},
+    ]
+
+def test_find_sidecars_in_priority_order(tmp_path):
+    audio = tmp_path / "song.mp3"
+    audio.write_bytes(b"")
+    for ext in (".json", ".srt", ".lrc"):
+        (tmp_path / f"song{ext}").write_text("", encoding="utf-8")
+
+    found = LyricSidecar.find_sidecars(str(audio))
+    assert [os.path.basename(path) for path in found] == ["song.lrc", "song.srt", "song.json"]
+
+def test_load_rejects_unknown_extension(tmp_path):
+    path = tmp_path / "song.txt"
+    path.write_text("text", encoding="utf-8")
+    with pytest.raises(ValueError):
+        LyricSidecar.load(str(path))
+
+ROUND_TRIP = [
+    {'text': 'first', 'start': 1.5, 'end': 3.0},
+    {'text': 'second', 'start': 3723.045, 'end': 3725.0},
+]
+
+def test_format_time():
+    assert LyricSidecar.format_time(3723.045) == "01:02:03,045"
+    assert LyricSidecar.format_time(1.5, ".") == "00:00:01.500"
+    assert LyricSidecar.format_time(-2) == "00:00:00,000"
+
+def test_srt_round_trip():
+    content = LyricSidecar.to_srt(ROUND_TRIP)
+    assert content.startswith("1\n00:00:01,500 --> 00:00:03,000\nfirst\n\n2\n")
+    assert LyricSidecar.parse_srt(content) == ROUND_TRIP
+
+def test_vtt_round_trip():
+    content = LyricSidecar.to_vtt(ROUND_TRIP)
+    assert content.startswith("WEBVTT\n\n00:00:01.500 --> 00:00:03.000\nfirst\n")
+    assert LyricSidecar.parse_vtt(content) == ROUND_TRIP
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("whisper")
+pytest.importorskip("pydub")
+
+from preview_transcriber import PreviewTranscriber
+
+PREVIEW = [
+    {"text": "one", "start": 0.0, "end": 1.0},
+    {"text": "two", "start": 2.0, "end": 3.0},
+    {"text": "three", "start": 4.0, "end": 5.0},
+]
+
+def test_identical_lyrics_have_no_dirty_ranges():
+    assert PreviewTranscriber.diff_lyrics(PREVIEW, [dict(lyric) for lyric in PREVIEW]) == []
+
+def test_inserted_line():
+    refined = PREVIEW[:2] + [{"text": "extra", "start": 3.2, "end": 3.8}] + PREVIEW[2:]
+    assert PreviewTranscriber.diff_lyrics(PREVIEW, refined) == [(3.2, 3.8)]
+
+def test_deleted_line():
+    refined = [PREVIEW[0], PREVIEW[2]]
+    assert PreviewTranscriber.diff_lyrics(PREVIEW, refined) == [(2.0, 3.0)]
+
+def test_shifted_timing_covers_old_and_new_position():
+    refined = [PREVIEW[0], dict(PREVIEW[1], start=2.5, end=3.5), PREVIEW[2]]
+    assert PreviewTranscriber.diff_lyrics(PREVIEW, refined) == [(2.0, 3.5)]
+
+def test_shift_within_tolerance_is_not_dirty():
+    refined = [PREVIEW[0], dict(PREVIEW[1], end=3.01), PREVIEW[2]]
+    assert PreviewTranscriber.diff_lyrics(PREVIEW, refined) == []
+
+def test_changed_word_timing_and_text_are_dirty():
+    old = [dict(PREVIEW[0], words=[{"word": "one", "start": 0.0, "end": 1.0}])] + PREVIEW[1:]
+    new = [dict(PREVIEW[0], words=[{"word": "one", "start": 0.4, "end": 1.0}]),
+           dict(PREVIEW[1], text="too")] + PREVIEW[2:]
+    assert PreviewTranscriber.diff_lyrics(old, new) == [(0.0, 3.0)]
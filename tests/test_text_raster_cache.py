@@ -0,0 +1,98 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import text_raster_cache
+from text_raster_cache import TextRasterCache
+
+MB = 1024 * 1024
+
+def raster(value=0, shape=(16, 64, 4)):
+    return np.full(shape, value, dtype=np.uint8)
+
+def cache_for(entries, shape=(16, 64, 4)):
+    # Budget pas untuk sejumlah raster dengan ukuran shape
+    return TextRasterCache(max_size_mb=entries * raster(shape=shape).nbytes / float(MB))
+
+def test_get_counts_hits_and_misses():
+    cache = cache_for(4)
+    key = cache.make_key("hello", "Arial", 70, "white")
+
+    assert cache.get(key) is None
+    stored = cache.put(key, raster(1))
+    assert cache.get(key) is stored
+    assert cache.get(key) is stored
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3.0)
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = cache_for(3)
+    for name in "abc":
+        cache.put(name, raster())
+    # a baru dipakai, jadi b yang paling lama
+    cache.get("a")
+    cache.put("d", raster())
+
+    assert cache.get("b") is None
+    assert all(cache.get(name) is not None for name in "acd")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_mb"] == pytest.approx(3 * raster().nbytes / float(MB))
+
+def test_replacing_a_key_does_not_double_count():
+    cache = cache_for(2)
+    cache.put("a", raster(1))
+    cache.put("a", raster(2))
+    cache.put("b", raster())
+
+    assert cache.stats()["evictions"] == 0
+    assert cache.get("a")[0, 0, 0] == 2
+
+def test_raster_larger_than_budget_is_not_stored():
+    cache = cache_for(1)
+    big = cache.put("big", raster(shape=(32, 64, 4)))
+
+    assert not big.flags.writeable
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
+
+def test_set_max_size_evicts_immediately():
+    cache = cache_for(4)
+    for name in "abcd":
+        cache.put(name, raster())
+
+    cache.set_max_size(2 * raster().nbytes / float(MB))
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("d") is not None
+
+def test_stored_rasters_are_read_only():
+    cache = cache_for(1)
+    stored = cache.put("a", raster())
+
+    with pytest.raises(ValueError):
+        stored[0, 0, 0] = 255
+
+def test_render_text_rgba_rasterizes_each_style_once(monkeypatch):
+    pytest.importorskip("moviepy")
+    pytest.importorskip("PIL")
+    from lyric_effects import LyricEffects
+
+    monkeypatch.setattr(text_raster_cache, "_cache", TextRasterCache())
+    calls = []
+    def fake_rasterize(text, font, fontsize, color, stroke_color=None, stroke_width=0):
+        calls.append((text, color))
+        return raster(len(calls))
+    monkeypatch.setattr(LyricEffects, "_rasterize_text", staticmethod(fake_rasterize))
+
+    first = LyricEffects.render_text_rgba("reff", "Arial", 70, "white")
+    again = LyricEffects.render_text_rgba("reff", "Arial", 70, "white")
+    other = LyricEffects.render_text_rgba("reff", "Arial", 70, "red")
+
+    assert again is first
+    assert other is not first
+    assert calls == [("reff", "white"), ("reff", "red")]
+    assert not first.flags.writeable
+    assert text_raster_cache.get_text_raster_cache().stats()["hits"] == 1
@@ -0,0 +1,67 @@
+import os
+import time
+
+from transcript_cache import TranscriptCache
+
+LYRICS = [{"text": "hello", "start": 0.0, "end": 1.5}]
+
+def write_audio(path, content=b"fake audio"):
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+def test_key_follows_content_not_path(tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"))
+    first = write_audio(tmp_path / "a.mp3")
+    renamed = write_audio(tmp_path / "b.mp3")
+    changed = write_audio(tmp_path / "c.mp3", b"other audio")
+
+    assert cache.make_key(first, "base") == cache.make_key(renamed, "base")
+    assert cache.make_key(first, "base") != cache.make_key(changed, "base")
+
+def test_key_depends_on_model_and_options(tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"))
+    audio = write_audio(tmp_path / "a.mp3")
+
+    base = cache.make_key(audio, "base", {"language": "id"})
+    assert base == cache.make_key(audio, "base", {"language": "id"})
+    assert base != cache.make_key(audio, "small", {"language": "id"})
+    assert base != cache.make_key(audio, "base", {"language": "en"})
+    assert base != cache.make_key(audio, "base", {"language": "id", "word_timestamps": True})
+
+def test_put_get_roundtrip_and_counters(tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"))
+    key = cache.make_key(write_audio(tmp_path / "a.mp3"), "base")
+
+    assert cache.get(key) is None
+    cache.put(key, LYRICS)
+    assert cache.get(key) == LYRICS
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_evict_removes_least_recently_used_over_size_limit(tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"), max_size_mb=1)
+    keys = [cache.make_key(write_audio(tmp_path / f"{i}.mp3", bytes([i])), "base") for i in range(3)]
+    for key in keys:
+        cache.put(key, LYRICS)
+
+    # Entry pertama paling lama tidak dipakai
+    now = time.time()
+    for age, key in zip((300, 200, 100), keys):
+        os.utime(cache._entry_path(key), (now - age, now - age))
+    cache.max_size_bytes = sum(os.path.getsize(cache._entry_path(key)) for key in keys[1:])
+
+    assert cache.evict() == 1
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) == LYRICS
+    assert cache.get(keys[2]) == LYRICS
+
+def test_evict_removes_expired_entries(tmp_path):
+    cache = TranscriptCache(cache_dir=str(tmp_path / "cache"), max_age_days=1)
+    key = cache.make_key(write_audio(tmp_path / "a.mp3"), "base")
+    cache.put(key, LYRICS)
+
+    old = time.time() - 2 * 24 * 3600
+    os.utime(cache._entry_path(key), (old, old))
+
+    assert cache.evict() == 1
+    assert cache.get(key) is None
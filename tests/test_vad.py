@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vad import VoiceActivityDetector, RegionTimeline
+
+def tone_then_silence(sample_rate=16000):
+    # 1 detik noise pelan, 2 detik nada 440 Hz, 2 detik noise pelan
+    t = np.arange(5 * sample_rate) / float(sample_rate)
+    samples = (np.random.default_rng(0).standard_normal(len(t)) * 1e-4).astype(np.float32)
+    tone = (t >= 1.0) & (t < 3.0)
+    samples[tone] += 0.5 * np.sin(2 * np.pi * 440 * t[tone])
+    return samples
+
+def test_detect_region_ends_at_last_active_frame():
+    detector = VoiceActivityDetector(padding_s=0.0)
+    frame_s = detector.frame_ms / 1000.0
+
+    regions = detector.detect(tone_then_silence())
+
+    assert len(regions) == 1
+    start, end = regions[0]
+    # Frame cuma aktif kalau overlap dengan nada, jadi batasnya paling jauh satu frame dari nada
+    assert 1.0 - frame_s < start <= 1.0
+    assert 3.0 <= end < 3.0 + frame_s
+
+def test_detect_pads_regions():
+    detector = VoiceActivityDetector(padding_s=0.3)
+    unpadded = VoiceActivityDetector(padding_s=0.0).detect(tone_then_silence())[0]
+
+    start, end = detector.detect(tone_then_silence())[0]
+    assert start == pytest.approx(unpadded[0] - 0.3)
+    assert end == pytest.approx(unpadded[1] + 0.3)
+
+def test_to_original_maps_packed_time_back_to_regions():
+    timeline = RegionTimeline([(10.0, 12.0), (20.0, 23.0)], gap_s=0.5)
+
+    assert timeline.packed_starts == [0.0, 2.5]
+    assert timeline.to_original(0.0) == 10.0
+    assert timeline.to_original(1.0) == 11.0
+    assert timeline.to_original(3.0) == 20.5
+    # Jeda hening setelah region pertama di-clamp ke akhir region itu
+    assert timeline.to_original(2.2) == 12.0
+
+def test_map_lyrics_maps_lines_and_words_without_mutating_input():
+    timeline = RegionTimeline([(10.0, 12.0), (20.0, 23.0)], gap_s=0.5)
+    lyrics = [
+        {'text': 'a', 'start': 0.5, 'end': 1.5},
+        {'text': 'b', 'start': 2.5, 'end': 4.0,
+         'words': [{'word': 'b', 'start': 2.5, 'end': 3.0}]},
+    ]
+
+    mapped = timeline.map_lyrics(lyrics)
+
+    assert mapped == [
+        {'text': 'a', 'start': 10.5, 'end': 11.5},
+        {'text': 'b', 'start': 20.0, 'end': 21.5,
+         'words': [{'word': 'b', 'start': 20.0, 'end': 20.5}]},
+    ]
+    assert lyrics[1]['start'] == 2.5
+
+def test_map_lyrics_end_never_before_start():
+    timeline = RegionTimeline([(10.0, 12.0), (20.0, 23.0)], gap_s=0.5)
+    # Baris yang mulai di jeda hening: start di-clamp ke akhir region
+    mapped = timeline.map_lyrics([{'text': 'x', 'start': 2.3, 'end': 2.4}])
+    assert mapped[0]['start'] == mapped[0]['end'] == 12.0
+
+def test_pack_concatenates_regions_with_silence():
+    samples = np.arange(100, dtype=np.float32)
+    timeline = RegionTimeline([(1.0, 2.0), (5.0, 6.0)], sample_rate=10, gap_s=0.5)
+
+    packed = timeline.pack(samples)
+
+    assert packed.dtype == np.float32
+    np.testing.assert_array_equal(packed[:10], samples[10:20])
+    np.testing.assert_array_equal(packed[10:15], np.zeros(5))
+    np.testing.assert_array_equal(packed[15:25], samples[50:60])
+    assert len(packed) == 30
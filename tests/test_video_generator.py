@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+pytest.importorskip("ffmpeg")
+pytest.importorskip("moviepy")
+
+from audio_probe import AudioProbe
+from video_generator import VideoGenerator
+
+LYRICS = [{"text": "hello", "start": 0.5, "end": 2.0}]
+
+@pytest.fixture
+def generator(tmp_path):
+    return VideoGenerator(output_path=str(tmp_path / "output"))
+
+def test_shard_ranges_split_on_gop_boundaries(generator):
+    gop_seconds = generator.SHARD_GOP_FRAMES / float(generator.FPS)
+    ranges = generator.shard_ranges(10.0, 3)
+
+    assert ranges == [(0.0, 4.0), (4.0, 8.0), (8.0, 10.0)]
+    for start, _ in ranges:
+        assert (start / gop_seconds) == pytest.approx(round(start / gop_seconds))
+
+def test_shard_ranges_cover_whole_duration(generator):
+    ranges = generator.shard_ranges(10.01, 4)
+
+    assert ranges[0][0] == 0.0
+    assert ranges[-1][1] == pytest.approx(10.01)
+    for (_, end), (start, _) in zip(ranges[:-1], ranges[1:]):
+        assert end == start
+    assert generator.shard_ranges(1.0, 8) == [(0.0, 1.0)]
+
+def test_shard_lyrics_shift_times_and_keep_overlapping_lines():
+    lyrics = [
+        {"text": "before", "start": 0.0, "end": 3.0},
+        {"text": "across", "start": 3.5, "end": 5.0,
+         "words": [{"word": "across", "start": 3.5, "end": 5.0}]},
+        {"text": "inside", "start": 5.0, "end": 6.0},
+        {"text": "after", "start": 8.0, "end": 9.0},
+    ]
+
+    shard = VideoGenerator.shard_lyrics(lyrics, 4.0, 8.0)
+
+    assert [lyric["text"] for lyric in shard] == ["across", "inside"]
+    assert (shard[0]["start"], shard[0]["end"]) == (-0.5, 1.0)
+    assert shard[0]["words"][0]["start"] == -0.5
+    assert (shard[1]["start"], shard[1]["end"]) == (1.0, 2.0)
+    # Input tidak diubah
+    assert lyrics[1]["start"] == 3.5
+
+def test_render_duration_falls_back_to_last_lyric(generator, monkeypatch):
+    monkeypatch.setattr(AudioProbe, "get_duration", staticmethod(lambda audio_path: None))
+
+    assert generator.render_duration("song.mp3", [{"text": "a", "start": 1.0, "end": 42.5}]) == 42.5
+    with pytest.raises(ValueError):
+        generator.render_duration("song.mp3", [])
+
+def test_cpu_budget_limits_workers_by_jobs_and_cores():
+    # 16 core, 2 core minimal per lagu: maksimal 8 lagu bersamaan
+    assert VideoGenerator.plan_cpu_budget(12, 20, total_cores=16) == (8, 1)
+    assert VideoGenerator.plan_cpu_budget(4, 20, total_cores=16) == (4, 3)
+    # Tidak lebih banyak worker dari jumlah lagu
+    assert VideoGenerator.plan_cpu_budget(4, 2, total_cores=16) == (2, 7)
+
+def test_cpu_budget_never_drops_below_one():
+    assert VideoGenerator.plan_cpu_budget(4, 3, total_cores=1) == (1, 1)
+    assert VideoGenerator.plan_cpu_budget(0, 0, total_cores=8) == (1, 7)
+
+@pytest.fixture
+def background(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / "bg.png"
+    Image.new("RGB", (64, 36), (10, 20, 30)).save(path)
+    return str(path)
+
+def test_soft_mode_renders_every_variant(tmp_path, background, monkeypatch):
+    from audio_mux import AudioMuxer
+    from soft_subtitle import SoftSubtitleMuxer
+
+    muxed = []
+    def fake_mux(background_path, audio_path, lyrics, output_file, **kwargs):
+        from PIL import Image
+        muxed.append((Image.open(background_path).size, output_file))
+    monkeypatch.setattr(SoftSubtitleMuxer, "mux", staticmethod(fake_mux))
+    monkeypatch.setattr(AudioMuxer, "audio_codec", staticmethod(lambda audio_path, container=".mp4": "aac"))
+
+    generator = VideoGenerator(output_path=str(tmp_path / "output"), background_image_path=background,
+                               render_mode="soft", variants=VideoGenerator.PUBLISH_VARIANTS)
+    outputs = generator.generate_videos(LYRICS, "portrait", audio_path="song.mp3")
+
+    names = [os.path.basename(path) for path in outputs]
+    assert names == ["song_lyric_video_landscape_1080p.mp4", "song_lyric_video_portrait_1080p.mp4",
+                     "song_lyric_video_landscape_720p.mp4"]
+    assert [size for size, _ in muxed] == [(1920, 1080), (1080, 1920), (1280, 720)]
+
+def test_ass_mode_renders_every_variant_from_the_largest_script(tmp_path, background, monkeypatch):
+    from audio_mux import AudioMuxer
+    from ass_renderer import AssRenderer
+
+    rendered = []
+    def fake_render(script_path, background_path, audio_path, output_file, **kwargs):
+        with open(script_path, encoding="utf-8") as f:
+            play_res = [line for line in f.read().splitlines() if line.startswith("PlayRes")]
+        rendered.append((os.path.basename(output_file), play_res, kwargs["bitrate"]))
+    monkeypatch.setattr(AssRenderer, "render", staticmethod(fake_render))
+    monkeypatch.setattr(AudioMuxer, "audio_codec", staticmethod(lambda audio_path, container=".mp4": "aac"))
+
+    generator = VideoGenerator(output_path=str(tmp_path / "output"), background_image_path=background,
+                               render_mode="ass", variants=VideoGenerator.PUBLISH_VARIANTS)
+    outputs = generator.generate_videos(LYRICS, "landscape", audio_path="song.mp3")
+
+    assert len(outputs) == 3
+    assert rendered[1][:2] == ("song_lyric_video_portrait_1080p.mp4", ["PlayResX: 1080", "PlayResY: 1920"])
+    # 720p memakai script 1080p, libass yang men-scale
+    assert rendered[2][:2] == ("song_lyric_video_landscape_720p.mp4", ["PlayResX: 1920", "PlayResY: 1080"])
+    assert rendered[2][2] == generator.video_bitrate("720p")
+
+@pytest.fixture
+def built_effects(monkeypatch):
+    from moviepy.editor import ColorClip
+    from lyric_effects import LyricEffects
+
+    built = []
+    def fake_apply_effect(text, effect_name, duration=3.0, **kwargs):
+        built.append((text, duration))
+        return ColorClip((8, 8), color=(255, 255, 255)).set_duration(duration)
+    monkeypatch.setattr(LyricEffects, "apply_effect", staticmethod(fake_apply_effect))
+    return built
+
+@pytest.mark.parametrize("effect, rebuilt", [("none", []), ("fade_both", [("two", 2.25)])])
+def test_refine_reuses_shifted_clips_only_for_static_effects(tmp_path, built_effects, effect, rebuilt):
+    generator = VideoGenerator(output_path=str(tmp_path / "output"), text_effect=effect)
+    preview = [{"text": "one", "start": 0.0, "end": 1.0}, {"text": "two", "start": 2.0, "end": 4.0}]
+    refined = [{"text": "one", "start": 0.0, "end": 1.0}, {"text": "two", "start": 2.0, "end": 4.25}]
+
+    generator.build_text_clips(preview, (64, 36))
+    del built_effects[:]
+    clips = generator.build_text_clips(refined, (64, 36), dirty_ranges=[])
+
+    assert built_effects == rebuilt
+    assert clips[1].duration == pytest.approx(2.25)
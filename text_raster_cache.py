@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+
+class TextRasterCache:
+    """
+    Cache LRU untuk hasil rasterize teks (array RGBA uint8)
+
+    Key-nya (text, font, fontsize, color, stroke_color, stroke_width). Baris
+    reff yang muncul berkali-kali, dan efek yang merender teks yang sama
+    beberapa kali, cukup di-rasterize sekali. Total memori dibatasi, entry
+    paling lama tidak dipakai dibuang duluan.
+    """
+
+    def __init__(self, max_size_mb=256):
+        """
+        Initialize the cache
+
+        Parameters:
+            max_size_mb (float): Batas total memori raster yang disimpan (MB)
+        """
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+
+        # key -> array RGBA, urutan = LRU (paling lama di depan)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text, font, fontsize, color, stroke_color=None, stroke_width=0):
+        """
+        Key cache untuk satu raster teks
+        """
+        return (text, font, fontsize, color, stroke_color, stroke_width)
+
+    def get(self, key):
+        """
+        Ambil raster dari cache
+
+        Returns:
+            np.ndarray or None: Array RGBA read-only, None kalau belum ada
+        """
+        with self._lock:
+            raster = self._entries.get(key)
+            if raster is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return raster
+
+    def put(self, key, raster):
+        """
+        Simpan raster ke cache (dibuat read-only supaya tidak diubah pemakainya)
+
+        Returns:
+            np.ndarray: Raster yang disimpan
+        """
+        raster.setflags(write=False)
+        size = raster.nbytes
+        if size > self.max_bytes:
+            # Lebih besar dari seluruh budget, tidak usah disimpan
+            return raster
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = raster
+            self._bytes += size
+            self._evict()
+        return raster
+
+    def _evict(self):
+        """
+        Buang entry LRU sampai total memori di bawah batas (dipanggil dengan lock)
+        """
+        while self._bytes > self.max_bytes and self._entries:
+            _, raster = self._entries.popitem(last=False)
+            self._bytes -= raster.nbytes
+            self.evictions += 1
+
+    def set_max_size(self, max_size_mb):
+        """
+        Ubah batas memori dan langsung jalankan eviction
+        """
+        with self._lock:
+            self.max_bytes = int(max_size_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        """
+        Kosongkan cache (counter tidak di-reset)
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Statistik cache untuk logging/debugging
+
+        Returns:
+            dict: entries, size_mb, hits, misses, evictions, hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_mb": self._bytes / (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_text_raster_cache():
+    """
+    Cache raster global (satu per process)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TextRasterCache()
+        return _cache
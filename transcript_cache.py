@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+class TranscriptCache:
+    """
+    Cache transkrip Whisper di disk (content-addressed)
+
+    Key-nya hash dari isi file audio + ukuran model + bahasa + opsi Whisper,
+    jadi file yang di-rename atau dipindah tetap kena cache, sedangkan file
+    yang isinya berubah otomatis ditranskrip ulang.
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb=256, max_age_days=90):
+        """
+        Initialize the transcript cache
+
+        Parameters:
+            cache_dir (str): Folder cache (default: ~/.cache/alvg/transcripts)
+            max_size_mb (float): Batas total ukuran cache dalam MB
+            max_age_days (float): Entry yang tidak dipakai lebih lama dari ini dihapus
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "alvg", "transcripts")
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+        self.hits = 0
+        self.misses = 0
+
+        # Memo hash per (path, mtime, size) biar file yang sama tidak di-hash berulang kali
+        self._hash_memo = {}
+        self._lock = threading.Lock()
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path, chunk_size=1024 * 1024):
+        """
+        Hitung SHA-256 dari isi file (dibaca per chunk biar hemat memori)
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def content_hash(self, path):
+        """
+        Hash isi file, di-memo berdasarkan path + mtime + size
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hash_memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        digest = self.hash_file(path)
+        with self._lock:
+            self._hash_memo[memo_key] = digest
+        return digest
+
+    def make_key(self, audio_path, model_size, options=None):
+        """
+        Bikin cache key dari isi audio + model + opsi transkripsi
+
+        Parameters:
+            audio_path (str): Path ke file audio
+            model_size (str): Ukuran model Whisper
+            options (dict): Opsi yang dikirim ke model.transcribe (termasuk language)
+
+        Returns:
+            str: Cache key (hex)
+        """
+        payload = json.dumps({
+            "audio": self.content_hash(audio_path),
+            "model": model_size,
+            "options": options or {},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Ambil lirik dari cache
+
+        Returns:
+            list or None: List lirik kalau ada di cache, None kalau miss
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lyrics = json.load(f)["lyrics"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        # Update mtime supaya eviction berbasis "terakhir dipakai"
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return lyrics
+
+    def put(self, key, lyrics):
+        """
+        Simpan lirik ke cache (atomic write), lalu jalankan eviction
+        """
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "lyrics": lyrics}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Hapus entry yang kadaluarsa, lalu entry paling lama tidak dipakai
+        sampai total ukuran cache di bawah batas
+
+        Returns:
+            int: Jumlah entry yang dihapus
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                if now - stat.st_mtime > self.max_age_seconds:
+                    try:
+                        os.unlink(path)
+                        removed += 1
+                    except OSError:
+                        pass
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        if total_size > self.max_size_bytes:
+            # Yang paling lama tidak dipakai dihapus duluan
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    removed += 1
+                    total_size -= size
+                except OSError:
+                    pass
+
+        return removed
+
+    def clear(self):
+        """
+        Hapus semua entry cache
+        """
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    try:
+                        os.unlink(os.path.join(root, name))
+                    except OSError:
+                        pass
@@ -0,0 +1,204 @@
+import bisect
+
+import numpy as np
+
+class VoiceActivityDetector:
+    """
+    Deteksi bagian vokal (heuristik energi + spektral, vectorized NumPy)
+
+    Frame dianggap vokal kalau energinya cukup di atas noise floor, porsi
+    energi di band vokal (default 200-4000 Hz) cukup besar, dan spektrumnya
+    tidak terlalu "flat" (noise/perkusi). Ini heuristik murah untuk membuang
+    intro, solo dan outro panjang sebelum Whisper, bukan pemisah vokal.
+    """
+
+    def __init__(self,
+                 frame_ms=32,
+                 hop_ms=16,
+                 energy_threshold_db=12.0,
+                 band=(200.0, 4000.0),
+                 min_band_ratio=0.45,
+                 max_flatness=0.5,
+                 min_speech_s=0.4,
+                 min_gap_s=1.0,
+                 padding_s=0.3):
+        """
+        Initialize the detector
+
+        Parameters:
+            frame_ms (float): Panjang frame analisis (ms)
+            hop_ms (float): Jarak antar frame (ms)
+            energy_threshold_db (float): Minimal dB di atas noise floor
+            band (tuple): Band frekuensi vokal (Hz)
+            min_band_ratio (float): Minimal porsi energi di band vokal
+            max_flatness (float): Maksimal spectral flatness (0 = tonal, 1 = noise)
+            min_speech_s (float): Region lebih pendek dari ini dibuang
+            min_gap_s (float): Gap lebih pendek dari ini digabung
+            padding_s (float): Padding kiri-kanan tiap region
+        """
+        self.frame_ms = frame_ms
+        self.hop_ms = hop_ms
+        self.energy_threshold_db = energy_threshold_db
+        self.band = band
+        self.min_band_ratio = min_band_ratio
+        self.max_flatness = max_flatness
+        self.min_speech_s = min_speech_s
+        self.min_gap_s = min_gap_s
+        self.padding_s = padding_s
+
+    def params(self):
+        """
+        Parameter detector (dipakai sebagai bagian cache key transkrip)
+        """
+        return dict(self.__dict__)
+
+    def frame_features(self, samples, sample_rate=16000, block_frames=4096):
+        """
+        Hitung fitur per frame: energi (dB), rasio band vokal, spectral flatness
+
+        Frame diproses per blok supaya memori FFT tetap kecil untuk lagu panjang.
+
+        Returns:
+            tuple: (energy_db, band_ratio, flatness) masing-masing array (n_frames,)
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        frame_len = int(sample_rate * self.frame_ms / 1000)
+        hop = int(sample_rate * self.hop_ms / 1000)
+
+        if len(samples) < frame_len:
+            samples = np.pad(samples, (0, frame_len - len(samples)))
+        n_frames = 1 + (len(samples) - frame_len) // hop
+
+        window = np.hanning(frame_len).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame_len, 1.0 / sample_rate)
+        in_band = (freqs >= self.band[0]) & (freqs <= self.band[1])
+
+        energy_db = np.empty(n_frames, dtype=np.float32)
+        band_ratio = np.empty(n_frames, dtype=np.float32)
+        flatness = np.empty(n_frames, dtype=np.float32)
+
+        frames_view = np.lib.stride_tricks.as_strided(
+            samples,
+            shape=(n_frames, frame_len),
+            strides=(samples.strides[0] * hop, samples.strides[0]),
+            writeable=False
+        )
+
+        eps = 1e-10
+        for start in range(0, n_frames, block_frames):
+            block = frames_view[start:start + block_frames] * window
+            power = np.abs(np.fft.rfft(block, axis=1)).astype(np.float32) ** 2 + eps
+
+            total = power.sum(axis=1)
+            energy_db[start:start + len(block)] = 10.0 * np.log10(total / frame_len)
+            band_ratio[start:start + len(block)] = power[:, in_band].sum(axis=1) / total
+            # Flatness = geometric mean / arithmetic mean
+            flatness[start:start + len(block)] = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+
+        return energy_db, band_ratio, flatness
+
+    def detect(self, samples, sample_rate=16000):
+        """
+        Cari region vokal
+
+        Parameters:
+            samples (np.ndarray): Audio mono float32
+            sample_rate (int): Sample rate audio
+
+        Returns:
+            list: List of (start, end) dalam detik
+        """
+        energy_db, band_ratio, flatness = self.frame_features(samples, sample_rate)
+        hop_s = self.hop_ms / 1000.0
+        duration = len(samples) / float(sample_rate)
+
+        # Noise floor = persentil bawah energi lagu ini
+        noise_floor = np.percentile(energy_db, 10)
+        active = (
+            (energy_db > noise_floor + self.energy_threshold_db)
+            & (band_ratio >= self.min_band_ratio)
+            & (flatness <= self.max_flatness)
+        )
+
+        # Cari awal/akhir run frame aktif secara vectorized
+        edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * hop_s
+        # edges == -1 menandai frame pertama yang tidak aktif; akhir region = akhir frame aktif terakhir
+        ends = (np.flatnonzero(edges == -1) - 1) * hop_s + self.frame_ms / 1000.0
+
+        regions = []
+        for start, end in zip(starts, ends):
+            start = max(0.0, start - self.padding_s)
+            end = min(duration, end + self.padding_s)
+            if regions and start - regions[-1][1] < self.min_gap_s:
+                regions[-1][1] = max(regions[-1][1], end)
+            else:
+                regions.append([start, end])
+
+        return [(start, end) for start, end in regions if end - start >= self.min_speech_s]
+
+class RegionTimeline:
+    """
+    Gabungkan region vokal jadi satu audio pendek, lalu map timestamp hasil
+    transkrip audio gabungan itu balik ke timeline asli
+    """
+
+    def __init__(self, regions, sample_rate=16000, gap_s=0.5):
+        """
+        Parameters:
+            regions (list): List of (start, end) dalam detik di timeline asli
+            sample_rate (int): Sample rate audio
+            gap_s (float): Hening yang disisipkan antar region
+        """
+        self.regions = list(regions)
+        self.sample_rate = sample_rate
+        self.gap_s = gap_s
+
+        # Posisi awal tiap region di audio gabungan
+        self.packed_starts = []
+        position = 0.0
+        for start, end in self.regions:
+            self.packed_starts.append(position)
+            position += (end - start) + gap_s
+
+    def pack(self, samples):
+        """
+        Potong region dari audio asli dan gabungkan dengan jeda hening
+
+        Returns:
+            np.ndarray: Audio gabungan float32
+        """
+        gap = np.zeros(int(self.gap_s * self.sample_rate), dtype=np.float32)
+        pieces = []
+        for start, end in self.regions:
+            pieces.append(np.asarray(samples[int(start * self.sample_rate):int(end * self.sample_rate)], dtype=np.float32))
+            pieces.append(gap)
+        if not pieces:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(pieces)
+
+    def to_original(self, t):
+        """
+        Map waktu di audio gabungan ke waktu di audio asli
+        """
+        index = max(0, bisect.bisect_right(self.packed_starts, t) - 1)
+        start, end = self.regions[index]
+        # Waktu yang jatuh di jeda hening di-clamp ke akhir region
+        return min(end, start + (t - self.packed_starts[index]))
+
+    def map_lyrics(self, lyrics):
+        """
+        Map start/end semua lirik ke timeline asli
+        """
+        mapped = []
+        for lyric in lyrics:
+            lyric = dict(lyric)
+            lyric['start'] = self.to_original(lyric['start'])
+            lyric['end'] = max(lyric['start'], self.to_original(lyric['end']))
+            if 'words' in lyric:
+                lyric['words'] = [
+                    dict(word, start=self.to_original(word['start']), end=self.to_original(word['end']))
+                    for word in lyric['words']
+                ]
+            mapped.append(lyric)
+        return mapped
@@ -1,18 +1,70 @@
 import os
 import random
-from moviepy.editor import TextClip, ImageClip, AudioFileClip, CompositeVideoClip, ColorClip
+import shutil
+import tempfile
+import multiprocessing
+import ffmpeg
+from moviepy.editor import ImageClip
 from PIL import Image
 import numpy as np
 from tqdm import tqdm
 import traceback
 
 from lyric_effects import LyricEffects
+from audio_probe import AudioProbe
+from text_raster_cache import get_text_raster_cache
+from compositor import LyricCompositor
+from ass_renderer import AssRenderer
+from soft_subtitle import SoftSubtitleMuxer
+from frame_writer import RingBufferFrameWriter
+from audio_mux import AudioMuxer
+
+def _render_shard_worker(task):
+    """
+    Render satu shard video (tanpa audio) di worker process
+    """
+    index, generator, lyrics, output_ratio, bg_image_path, start, end, shard_path, threads = task
+    try:
+        # Cuma lirik yang kelihatan di shard ini yang di-rasterize, timeline dimulai dari 0
+        shard_lyrics = generator.shard_lyrics(lyrics, start, end)
+        # Dikurangi sedikit supaya jumlah frame tidak lebih satu karena pembulatan float
+        shard = generator.compose_video(shard_lyrics, end - start - 1e-6, bg_image_path, output_ratio)
+        shard.write_videofile(
+            shard_path,
+            audio=False,
+            logger=None,
+            **generator.encoder_settings(threads=threads, keyframe_interval=generator.SHARD_GOP_FRAMES)
+        )
+        return index, shard_path, None
+    except Exception:
+        return index, None, traceback.format_exc()
+
+def _batch_video_worker(task):
+    """
+    Render satu lagu di worker process (mode batch paralel)
+    """
+    index, generator, lyrics, output_ratio, audio_path, encoder_threads = task
+    try:
+        generator.encoder_threads = encoder_threads
+        # Sudah paralel per lagu, worker pool tidak boleh bikin pool shard lagi
+        generator.render_shards = 1
+        return index, generator.generate_videos(lyrics, output_ratio, audio_path=audio_path), None
+    except Exception:
+        return index, None, traceback.format_exc()
 
 class VideoGenerator:
     """
     Class untuk generate video lirik dari file audio + gambar background
     """
     
+    FPS = 30
+    
+    # Panjang GOP (frame) untuk render per shard, batas shard selalu kelipatan ini
+    SHARD_GOP_FRAMES = 60
+    
+    # Set output standar untuk publish: (ratio, quality)
+    PUBLISH_VARIANTS = [("landscape", "1080p"), ("portrait", "1080p"), ("landscape", "720p")]
+    
     def __init__(self, 
                  audio_path=None,
                  background_image_path=None,
@@ -24,9 +76,32 @@ class VideoGenerator:
                  output_size=(1920, 1080),
                  quality="1080p",
                  text_position="center",  # Posisi teks: top, center, bottom
-                 color_effect="none"):    # Efek warna: none, gradient, pulse, spectrum
+                 color_effect="none",     # Efek warna: none, gradient, pulse, spectrum
+                 variable_frame_rate=False,
+                 render_mode="moviepy",
+                 subtitle_format="mov_text",
+                 language=None,
+                 render_shards=1,
+                 encoder_threads=4,
+                 frame_writer="moviepy",
+                 variants=None):
         """
         Initialize the video generator
+        
+        Parameters:
+            variable_frame_rate (bool): Frame yang identik dengan frame sebelumnya
+                                        dibuang encoder (output VFR)
+            render_mode (str): 'moviepy', 'ass' (ffmpeg + subtitle ASS, fallback
+                               ke moviepy untuk efek yang tidak didukung) atau
+                               'soft' (still + audio + track lirik, tanpa render teks)
+            subtitle_format (str): Track lirik untuk mode 'soft': 'mov_text', 'srt', 'webvtt'
+            language (str): Bahasa lirik (kode Whisper, misalnya 'id'), untuk tag track lirik
+            render_shards (int): Render satu video paralel dalam N potongan waktu (1 = off)
+            encoder_threads (int): Thread encoder x264 untuk render biasa
+            frame_writer (str): 'moviepy' (write_videofile) atau 'ring' (ring buffer
+                                + thread writer ke stdin ffmpeg, audio di-mux terpisah)
+            variants (list): Kalau diisi, tiap lagu dirender ke semua (ratio, quality)
+                             ini dalam satu job, misalnya PUBLISH_VARIANTS
         """
         self.audio_path = audio_path
         self.background_image_path = background_image_path
@@ -37,6 +112,14 @@ class VideoGenerator:
         self.text_effect = text_effect
         self.text_position = text_position
         self.color_effect = color_effect
+        self.variable_frame_rate = variable_frame_rate
+        self.render_mode = render_mode
+        self.subtitle_format = subtitle_format
+        self.language = language
+        self.render_shards = render_shards
+        self.encoder_threads = encoder_threads
+        self.frame_writer = frame_writer
+        self.variants = variants
         
         # Set output size berdasarkan quality
         self.quality_presets = {
@@ -53,6 +136,9 @@ class VideoGenerator:
         # Set quality
         self.quality = quality
         
+        # Text clip dari build terakhir, dipakai ulang untuk baris yang tidak berubah
+        self._text_clip_cache = {}
+        
         # Create output directory if not exists
         if not os.path.exists(output_path):
             os.makedirs(output_path)
@@ -102,171 +188,565 @@ class VideoGenerator:
         # Convert ke array untuk MoviePy
         return np.array(image)
         
-    def make_portrait_video(self, lyrics, audio_clip, bg_image_path):
+    def gradient_colors(self):
+        """
+        Warna gradient: warna font ke warna kebalikannya (kontras)
+        """
+        # Gunakan warna font sebagai warna awal
+        start_color = self.font_color
+        # Buat warna akhir yang kontras
+        # Konversi hex ke RGB dan balik nilainya untuk mendapatkan warna yang kontras
+        hex_color = self.font_color.lstrip('#')
+        rgb = tuple(255 - int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        end_color = '#{:02x}{:02x}{:02x}'.format(rgb[0], rgb[1], rgb[2])
+        return [start_color, end_color]
+        
+    def effect_name(self):
+        """
+        Nama efek LyricEffects yang dipakai (color effect diprioritaskan)
+        """
+        # Tentukan efek yang akan digunakan
+        effect_name = self.text_effect
+        
+        # Jika ada color effect, prioritaskan
+        if self.color_effect != "none":
+            if self.color_effect == "gradient":
+                effect_name = "color_gradient"
+            elif self.color_effect == "pulse":
+                effect_name = "color_pulse"
+            elif self.color_effect == "spectrum":
+                effect_name = "color_spectrum"
+            elif self.color_effect == "rainbow":
+                effect_name = "rainbow"
+        return effect_name
+        
+    def frame_size(self, output_ratio="landscape"):
+        """
+        Ukuran frame output untuk ratio tertentu
+        """
+        if output_ratio.lower() == "portrait":
+            # Set portrait size (e.g., 1080x1920 for 9:16)
+            return (1080, 1920)
+        # Set landscape size berdasarkan quality
+        return self.quality_presets.get(self.quality, (1920, 1080))
+        
+    def _text_clip_key(self, lyric, effect_name, screen_size):
+        """
+        Key cache text clip: teks + style (tanpa timing, timing dicek terpisah
+        lewat _text_clip_timing)
+        """
+        return (lyric['text'], effect_name, tuple(screen_size),
+                self.font, self.font_size, self.font_color, self.text_position)
+        
+    @staticmethod
+    def _text_clip_timing(lyric, effect_name):
+        """
+        Timing yang mempengaruhi isi clip: durasi baris (+ timing kata untuk karaoke),
+        relatif ke awal baris
         """
-        Buat vertical video untuk portrait mode (9:16)
+        start_time = lyric['start']
+        words = ()
+        if effect_name == "karaoke":
+            words = tuple(
+                (word['word'], round(word['start'] - start_time, 3), round(word['end'] - start_time, 3))
+                for word in lyric.get('words', [])
+            )
+        return (round(lyric['end'] - start_time, 3), words)
+        
+    @staticmethod
+    def _in_dirty_range(lyric, dirty_ranges):
+        """
+        True kalau baris overlap dengan salah satu rentang (start, end) yang berubah
+        """
+        return any(lyric['start'] < end and lyric['end'] > start for start, end in dirty_ranges)
+        
+    def _reuse_text_clip(self, key, timing, cached_clips, loose):
         """
-        # Set portrait size (e.g., 1080x1920 for 9:16)
-        portrait_size = (1080, 1920)
+        Cari clip dengan teks/style sama dari build sebelumnya
         
-        # Resize background untuk portrait
-        bg_array = self.resize_background(bg_image_path, portrait_size)
-        bg_clip = ImageClip(bg_array).set_duration(audio_clip.duration)
+        Parameters:
+            loose (bool): Baris tidak berubah menurut diff (di luar dirty range)
+                          dan tampilannya tidak tergantung durasi, clip dengan
+                          timing terdekat boleh dipakai
+        """
+        candidates = cached_clips.get(key, [])
+        for cached_timing, clip in candidates:
+            if cached_timing == timing:
+                return clip
+        if loose and candidates:
+            cached_timing, clip = min(candidates, key=lambda item: abs(item[0][0] - timing[0]))
+            # Selisih durasi cuma sebesar toleransi diff, samakan durasinya
+            return clip.set_duration(timing[0])
+        return None
+        
+    def build_text_clips(self, lyrics, screen_size, dirty_ranges=None):
+        """
+        Bikin text clip untuk semua lirik
         
+        Clip dari build sebelumnya dipakai ulang kalau teks, style dan timing
+        barisnya sama. Kalau dirty_ranges diisi (hasil diff preview vs refine),
+        baris di luar rentang itu dianggap tidak berubah; untuk efek tanpa
+        animasi clip-nya dipakai ulang walaupun timing-nya bergeser sedikit.
+        Baris di dalam rentang (dan baris beranimasi yang durasinya berubah)
+        dibuat ulang. Cache hanya menyimpan clip dari build terakhir.
+        
+        Parameters:
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            screen_size (tuple): Ukuran frame (width, height)
+            dirty_ranges (list): Rentang (start, end) yang berubah sejak build terakhir
+            
+        Returns:
+            list: Text clips yang sudah di-set waktu mulainya
+        """
         # Bikin semua text clips
         text_clips = []
+        # key teks/style -> list of (timing, clip)
+        cache = {}
+        reused = 0
+        
+        effect_name = self.effect_name()
         
         # Parameter warna gradient jika digunakan
-        gradient_colors = None
-        if self.color_effect == "gradient":
-            # Gunakan warna font sebagai warna awal
-            start_color = self.font_color
-            # Buat warna akhir yang kontras
-            # Konversi hex ke RGB dan balik nilainya untuk mendapatkan warna yang kontras
-            hex_color = self.font_color.lstrip('#')
-            rgb = tuple(255 - int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            end_color = '#{:02x}{:02x}{:02x}'.format(rgb[0], rgb[1], rgb[2])
-            gradient_colors = [start_color, end_color]
+        gradient_colors = self.gradient_colors() if self.color_effect == "gradient" else None
         
         for i, lyric in enumerate(lyrics):
             start_time = lyric['start']
             end_time = lyric['end']
             duration = end_time - start_time
             
-            # Tentukan efek yang akan digunakan
-            effect_name = self.text_effect
-            
-            # Jika ada color effect, prioritaskan
-            if self.color_effect != "none":
-                if self.color_effect == "gradient":
-                    effect_name = "color_gradient"
-                elif self.color_effect == "pulse":
-                    effect_name = "color_pulse"
-                elif self.color_effect == "spectrum":
-                    effect_name = "color_spectrum"
-                elif self.color_effect == "rainbow":
-                    effect_name = "rainbow"
-            
-            # Parameter tambahan untuk efek
-            kwargs = {}
-            if effect_name == "color_gradient" and gradient_colors:
-                kwargs["gradient_colors"] = gradient_colors
-            
-            # Apply text effect
-            text_clip = LyricEffects.apply_effect(
-                text=lyric['text'],
-                effect_name=effect_name,
-                font=self.font,
-                fontsize=self.font_size,
-                color=self.font_color,
-                duration=duration,
-                position=self.text_position,
-                screen_size=portrait_size,
-                **kwargs
-            )
+            key = self._text_clip_key(lyric, effect_name, screen_size)
+            timing = self._text_clip_timing(lyric, effect_name)
+            # Clip beranimasi (fade, typing, karaoke, warna) bergantung pada durasi baris,
+            # jadi cuma teks diam yang boleh dipakai ulang dengan durasi berbeda
+            loose = (dirty_ranges is not None and not self._in_dirty_range(lyric, dirty_ranges)
+                     and LyricEffects.static_after(effect_name, duration) == 0)
+            text_clip = self._reuse_text_clip(key, timing, cache, False)
+            if text_clip is None:
+                text_clip = self._reuse_text_clip(key, timing, self._text_clip_cache, loose)
+            
+            if text_clip is not None:
+                reused += 1
+            else:
+                # Parameter tambahan untuk efek
+                kwargs = {}
+                if effect_name == "color_gradient" and gradient_colors:
+                    kwargs["gradient_colors"] = gradient_colors
+                elif effect_name == "karaoke":
+                    # Timestamp per kata dibuat relatif ke awal baris
+                    kwargs["words"] = [
+                        dict(word, start=word['start'] - start_time, end=word['end'] - start_time)
+                        for word in lyric.get('words', [])
+                    ]
+                
+                # Apply text effect
+                text_clip = LyricEffects.apply_effect(
+                    text=lyric['text'],
+                    effect_name=effect_name,
+                    font=self.font,
+                    fontsize=self.font_size,
+                    color=self.font_color,
+                    duration=duration,
+                    position=self.text_position,
+                    screen_size=screen_size,
+                    **kwargs
+                )
+                
+            cache.setdefault(key, []).append((timing, text_clip))
             
             # Set timing
-            text_clip = text_clip.set_start(start_time)
-            text_clips.append(text_clip)
+            text_clips.append(text_clip.set_start(start_time))
             
-        # Gabungkan semua clips
-        final_clip = CompositeVideoClip([bg_clip] + text_clips, size=portrait_size)
+        self._text_clip_cache = cache
+        if reused:
+            print(f"Text clips: {reused} reused, {len(lyrics) - reused} rebuilt")
+            
+        return text_clips
         
-        # Set audio
-        final_clip = final_clip.set_audio(audio_clip)
+    def prepare_text_clips(self, lyrics, output_ratio="landscape", dirty_ranges=None):
+        """
+        Siapkan text clip lebih awal (misalnya dari transkrip preview) supaya
+        render berikutnya cuma membuat ulang baris yang berubah
         
-        return final_clip
+        Parameters:
+            dirty_ranges (list): Rentang (start, end) yang berubah sejak prepare
+                                 sebelumnya (Refinement.dirty_ranges)
+        """
+        self.build_text_clips(lyrics, self.frame_size(output_ratio), dirty_ranges)
         
-    def make_landscape_video(self, lyrics, audio_clip, bg_image_path):
+    def static_offsets(self, lyrics):
         """
-        Buat landscape video untuk 16:9 ratio
+        Per lirik: detik sejak baris mulai sampai tampilannya diam (None = animasi terus)
         """
-        # Set landscape size berdasarkan quality
-        landscape_size = self.quality_presets.get(self.quality, (1920, 1080))
+        effect_name = self.effect_name()
+        return [LyricEffects.static_after(effect_name, lyric['end'] - lyric['start']) for lyric in lyrics]
+        
+    def compose_video(self, lyrics, duration, bg_image_path, output_ratio="landscape", screen_size=None):
+        """
+        Susun clip video (background + lirik) tanpa audio
+        
+        Parameters:
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            duration (float): Durasi video (durasi audio)
+            bg_image_path (str): Path gambar background
+            output_ratio (str): 'landscape' atau 'portrait'
+            screen_size (tuple): Ukuran frame (default: frame_size(output_ratio))
+            
+        Returns:
+            LyricCompositor: Clip video
+        """
+        screen_size = screen_size or self.frame_size(output_ratio)
         
         # Resize background
-        bg_array = self.resize_background(bg_image_path, landscape_size)
-        bg_clip = ImageClip(bg_array).set_duration(audio_clip.duration)
+        bg_array = self.resize_background(bg_image_path, screen_size)
+        bg_clip = ImageClip(bg_array).set_duration(duration)
         
         # Bikin semua text clips
-        text_clips = []
+        text_clips = self.build_text_clips(lyrics, screen_size)
+            
+        # Gabungkan semua clips
+        return LyricCompositor(bg_clip, text_clips, size=screen_size,
+                               static_after=self.static_offsets(lyrics))
         
-        # Parameter warna gradient jika digunakan
-        gradient_colors = None
-        if self.color_effect == "gradient":
-            # Gunakan warna font sebagai warna awal
-            start_color = self.font_color
-            # Buat warna akhir yang kontras
-            # Konversi hex ke RGB dan balik nilainya untuk mendapatkan warna yang kontras
-            hex_color = self.font_color.lstrip('#')
-            rgb = tuple(255 - int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            end_color = '#{:02x}{:02x}{:02x}'.format(rgb[0], rgb[1], rgb[2])
-            gradient_colors = [start_color, end_color]
+    def encoder_settings(self, threads=None, keyframe_interval=None):
+        """
+        Setting encoder untuk write_videofile (sama untuk render biasa dan per shard)
         
-        for i, lyric in enumerate(lyrics):
-            start_time = lyric['start']
-            end_time = lyric['end']
-            duration = end_time - start_time
+        Parameters:
+            threads (int): Thread encoder x264 (default: self.encoder_threads)
+            keyframe_interval (int): Kalau diisi, GOP dibuat tetap (keyframe tiap N frame)
             
-            # Tentukan efek yang akan digunakan
-            effect_name = self.text_effect
-            
-            # Jika ada color effect, prioritaskan
-            if self.color_effect != "none":
-                if self.color_effect == "gradient":
-                    effect_name = "color_gradient"
-                elif self.color_effect == "pulse":
-                    effect_name = "color_pulse"
-                elif self.color_effect == "spectrum":
-                    effect_name = "color_spectrum"
-                elif self.color_effect == "rainbow":
-                    effect_name = "rainbow"
-            
-            # Parameter tambahan untuk efek
-            kwargs = {}
-            if effect_name == "color_gradient" and gradient_colors:
-                kwargs["gradient_colors"] = gradient_colors
-            
-            # Apply text effect
-            text_clip = LyricEffects.apply_effect(
-                text=lyric['text'],
-                effect_name=effect_name,
-                font=self.font,
-                fontsize=self.font_size,
-                color=self.font_color,
-                duration=duration,
-                position=self.text_position,
-                screen_size=landscape_size,
-                **kwargs
-            )
+        Returns:
+            dict: codec, bitrate, fps, threads, preset, ffmpeg_params
+        """
+        ffmpeg_params = []
+        if self.variable_frame_rate:
+            # Buang frame yang persis sama dengan frame sebelumnya, timestamp tetap (VFR)
+            ffmpeg_params += ["-vf", "mpdecimate=hi=1:lo=1:frac=1", "-vsync", "vfr"]
+        if keyframe_interval:
+            ffmpeg_params += ["-g", str(keyframe_interval), "-keyint_min", str(keyframe_interval),
+                              "-sc_threshold", "0"]
             
-            # Set timing
-            text_clip = text_clip.set_start(start_time)
-            text_clips.append(text_clip)
+        return {
+            "codec": "libx264",
+            "bitrate": self.video_bitrate(),
+            "fps": self.FPS,
+            "threads": threads or self.encoder_threads,
+            "preset": "medium",
+            "ffmpeg_params": ffmpeg_params or None,
+        }
+        
+    def render_duration(self, audio_path, lyrics):
+        """
+        Durasi video dari header audio; kalau tidak diketahui pakai akhir lirik
+        terakhir (sama seperti plan_batch)
+        """
+        duration = AudioProbe.get_duration(audio_path)
+        if not duration:
+            duration = max((lyric['end'] for lyric in lyrics), default=0.0)
+            print(f"Audio duration unknown for {os.path.basename(audio_path)}, "
+                  f"using end of last lyric ({duration:.1f}s)")
+        if not duration:
+            raise ValueError(f"Cannot determine duration of {audio_path}")
+        return duration
+        
+    @staticmethod
+    def shard_lyrics(lyrics, start, end):
+        """
+        Lirik yang tampil di [start, end), waktunya digeser relatif ke start
+        
+        Baris yang mulai sebelum start tetap ikut dengan start negatif, jadi
+        animasinya tetap nyambung dengan shard sebelumnya.
+        """
+        shifted = []
+        for lyric in lyrics:
+            if lyric['end'] <= start or lyric['start'] >= end:
+                continue
+            lyric = dict(lyric, start=lyric['start'] - start, end=lyric['end'] - start)
+            if 'words' in lyric:
+                lyric['words'] = [
+                    dict(word, start=word['start'] - start, end=word['end'] - start)
+                    for word in lyric['words']
+                ]
+            shifted.append(lyric)
+        return shifted
+        
+    def shard_ranges(self, duration, shards):
+        """
+        Bagi timeline jadi beberapa shard yang batasnya jatuh di keyframe
+        
+        Returns:
+            list: List of (start, end) dalam detik
+        """
+        total_frames = int(np.ceil(duration * self.FPS))
+        gop = self.SHARD_GOP_FRAMES
+        frames_per_shard = max(1, int(np.ceil(total_frames / float(max(1, shards)) / gop))) * gop
+        
+        return [
+            (first / float(self.FPS), min(duration, min(total_frames, first + frames_per_shard) / float(self.FPS)))
+            for first in range(0, total_frames, frames_per_shard)
+        ]
+        
+    def generate_video_sharded(self, lyrics, output_ratio, audio_path, bg_image_path):
+        """
+        Render satu video secara paralel per potongan waktu
+        
+        Tiap shard dirender di process sendiri dengan setting encoder yang sama
+        dan GOP tetap, lalu disambung dengan concat demuxer ffmpeg tanpa
+        re-encode. Audio di-mux sekali di akhir.
+        
+        Returns:
+            str: Path ke video output
+        """
+        duration = self.render_duration(audio_path, lyrics)
+        output_file = self.output_file_for(audio_path)
+        ranges = self.shard_ranges(duration, self.render_shards)
+        threads = max(1, (os.cpu_count() or 4) // len(ranges))
+        work_dir = tempfile.mkdtemp(prefix="alvg_shards_")
+        
+        print(f"Rendering {len(ranges)} shards in parallel ({threads} encoder thread(s) each)...")
+        
+        audio = None
+        try:
+            audio = AudioMuxer.prepare(audio_path, work_dir)
             
-        # Gabungkan semua clips
-        final_clip = CompositeVideoClip([bg_clip] + text_clips, size=landscape_size)
+            tasks = [
+                (index, self, lyrics, output_ratio, bg_image_path, start, end,
+                 os.path.join(work_dir, f"shard_{index:03d}.mp4"), threads)
+                for index, (start, end) in enumerate(ranges)
+            ]
+            
+            shard_paths = [None] * len(tasks)
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(len(tasks)) as pool:
+                for index, shard_path, error in tqdm(pool.imap_unordered(_render_shard_worker, tasks),
+                                                     total=len(tasks), desc="Rendering shards"):
+                    if error:
+                        raise RuntimeError(f"Shard {index} failed:\n{error}")
+                    shard_paths[index] = shard_path
+                    
+            # Sambung shard tanpa re-encode, audio asli di-mux sekali
+            list_path = os.path.join(work_dir, "shards.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                for shard_path in shard_paths:
+                    f.write(f"file '{os.path.abspath(shard_path)}'\n")
+                    
+            AudioMuxer.mux(ffmpeg.input(list_path, format="concat", safe=0).video, audio, output_file)
+            
+            print(f"✓ Video generated successfully: {output_file}")
+            return output_file
+        finally:
+            if audio is not None:
+                audio.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
+            
+    def generate_video_piped(self, lyrics, output_ratio, audio_path, bg_image_path):
+        """
+        Render lewat RingBufferFrameWriter: frame dikomposisi ke ring buffer
+        sementara thread writer mengirim frame sebelumnya ke ffmpeg
+        
+        Returns:
+            str: Path ke video output
+        """
+        duration = self.render_duration(audio_path, lyrics)
+        output_file = self.output_file_for(audio_path)
+        work_dir = tempfile.mkdtemp(prefix="alvg_pipe_")
         
-        # Set audio
-        final_clip = final_clip.set_audio(audio_clip)
+        audio = None
+        try:
+            # Transcode audio (kalau perlu) jalan bersamaan dengan render video
+            audio = AudioMuxer.prepare(audio_path, work_dir)
+            clip = self.compose_video(lyrics, duration, bg_image_path, output_ratio)
+            settings = self.encoder_settings()
+            video_path = os.path.join(work_dir, "video.mp4")
+            
+            print(f"Rendering video to: {output_file}")
+            writer = RingBufferFrameWriter(
+                video_path,
+                clip.size,
+                fps=settings["fps"],
+                codec=settings["codec"],
+                bitrate=settings["bitrate"],
+                preset=settings["preset"],
+                threads=settings["threads"],
+                ffmpeg_params=settings["ffmpeg_params"]
+            )
+            stats = writer.write(clip, duration)
+            print(f"Frame writer: {stats['frames']} frames at {stats['fps']:.1f} fps, "
+                  f"{stats['allocations_per_frame']:.3f} frame allocations/frame, "
+                  f"{stats['pipe_blocked']:.1f}s blocked on ffmpeg pipe, "
+                  f"{stats['ring_wait']:.1f}s waiting for a free buffer")
+            
+            AudioMuxer.mux(ffmpeg.input(video_path).video, audio, output_file)
+            print(f"✓ Video generated successfully: {output_file}")
+            return output_file
+        finally:
+            if audio is not None:
+                audio.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+    def variant_size(self, output_ratio, quality):
+        """
+        Ukuran frame untuk satu variant; portrait = preset quality yang diputar
+        (1080p -> 1080x1920, 720p -> 720x1280)
+        """
+        width, height = self.quality_presets.get(quality, (1920, 1080))
+        if output_ratio.lower() == "portrait":
+            return (height, width)
+        return (width, height)
+        
+    def unique_variants(self):
+        """
+        self.variants tanpa duplikat, ratio dalam huruf kecil
+        """
+        return list(dict.fromkeys((ratio.lower(), quality) for ratio, quality in self.variants or []))
+        
+    def variant_render_size(self, output_ratio):
+        """
+        Ukuran render untuk ratio di self.variants: variant terbesar dengan ratio
+        itu (variant lain hasil downscale dari ukuran ini)
+        """
+        sizes = [self.variant_size(ratio, quality) for ratio, quality in self.unique_variants()
+                 if ratio == output_ratio.lower()]
+        return max(sizes, key=lambda size: size[0] * size[1])
+        
+    def variant_output_file(self, audio_path, output_ratio, quality):
+        """
+        Path video output untuk satu variant
+        """
+        base = os.path.splitext(self.output_file_for(audio_path))[0]
+        return f"{base}_{output_ratio.lower()}_{quality}.mp4"
+        
+    def generate_video_variants(self, lyrics, variants, audio_path=None, bg_image_path=None):
+        """
+        Render beberapa variant (ratio, quality) dari satu lagu dalam satu job
+        
+        Lirik, background dan audio (copy/transcode) disiapkan sekali untuk semua
+        variant, dan raster teks dipakai bersama lewat cache raster. Variant
+        dengan ratio sama cuma dikomposisi sekali di resolusi terbesar; ffmpeg
+        men-split frame itu, men-scale ke tiap resolusi dan meng-encode semua
+        variant bersamaan di satu process.
+        
+        Parameters:
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            variants (list): List of (output_ratio, quality), misalnya PUBLISH_VARIANTS
+            audio_path (str): Path audio (default: self.audio_path)
+            bg_image_path (str): Gambar background (default: dipilih dari background_image_path)
+            
+        Returns:
+            dict: {(output_ratio, quality): path video output}
+        """
+        audio_path = audio_path or self.audio_path
+        if bg_image_path is None:
+            if os.path.isdir(self.background_image_path):
+                bg_image_path = self.random_background_image(self.background_image_path)
+            else:
+                bg_image_path = self.background_image_path
+                
+        # ratio -> list of (quality, ukuran); satu render per ratio
+        groups = {}
+        for output_ratio, quality in variants:
+            targets = groups.setdefault(output_ratio.lower(), [])
+            target = (quality, self.variant_size(output_ratio, quality))
+            if target not in targets:
+                targets.append(target)
+            
+        duration = self.render_duration(audio_path, lyrics)
+        settings = self.encoder_settings()
+        work_dir = tempfile.mkdtemp(prefix="alvg_variants_")
         
-        return final_clip
+        audio = None
+        outputs = {}
+        try:
+            audio = AudioMuxer.prepare(audio_path, work_dir)
+            
+            for output_ratio, targets in groups.items():
+                targets = sorted(targets, key=lambda target: target[1][0] * target[1][1], reverse=True)
+                render_size = targets[0][1]
+                print(f"Rendering {output_ratio} {render_size[0]}x{render_size[1]} for "
+                      f"{', '.join(quality for quality, _ in targets)}...")
+                
+                clip = self.compose_video(lyrics, duration, bg_image_path, output_ratio, screen_size=render_size)
+                video_paths = [os.path.join(work_dir, f"{output_ratio}_{quality}.mp4") for quality, _ in targets]
+                
+                # VFR lewat filter sebelum split (-vf tidak bisa dipakai bersama filter graph)
+                filters = [("mpdecimate", {"hi": 1, "lo": 1, "frac": 1})] if self.variable_frame_rate else []
+                writer = RingBufferFrameWriter(
+                    video_paths[0],
+                    render_size,
+                    fps=settings["fps"],
+                    codec=settings["codec"],
+                    bitrate=self.video_bitrate(targets[0][0]),
+                    preset=settings["preset"],
+                    threads=settings["threads"],
+                    ffmpeg_params=["-vsync", "vfr"] if self.variable_frame_rate else None,
+                    scaled_outputs=[
+                        (path, size, self.video_bitrate(quality))
+                        for path, (quality, size) in zip(video_paths[1:], targets[1:])
+                    ],
+                    filters=filters
+                )
+                stats = writer.write(clip, duration)
+                print(f"Frame writer: {stats['frames']} frames at {stats['fps']:.1f} fps, "
+                      f"{len(targets)} encoder(s), {stats['pipe_blocked']:.1f}s blocked on ffmpeg pipe")
+                
+                for video_path, (quality, _) in zip(video_paths, targets):
+                    output_file = self.variant_output_file(audio_path, output_ratio, quality)
+                    AudioMuxer.mux(ffmpeg.input(video_path).video, audio, output_file)
+                    outputs[(output_ratio, quality)] = output_file
+                    print(f"✓ Video generated successfully: {output_file}")
+                    
+            stats = get_text_raster_cache().stats()
+            print(f"Text raster cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['entries']} entries ({stats['size_mb']:.1f} MB)")
+            # Key mengikuti input (ratio apa adanya)
+            return {(output_ratio, quality): outputs[(output_ratio.lower(), quality)]
+                    for output_ratio, quality in variants}
+        finally:
+            if audio is not None:
+                audio.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
+            
+    def __getstate__(self):
+        """
+        State untuk dikirim ke worker process (cache text clip tidak ikut di-pickle)
+        """
+        state = self.__dict__.copy()
+        state["_text_clip_cache"] = {}
+        return state
         
-    def generate_video(self, lyrics, output_ratio="landscape"):
+    def generate_video(self, lyrics, output_ratio="landscape", audio_path=None, decoded_audio=None):
         """
         Generate video lirik dengan audio + background + lirik
         
+        Kalau self.variants diisi, semua variant tetap dirender tapi cuma path
+        variant pertama yang dikembalikan; pakai generate_videos untuk semua path.
+        
         Parameters:
             lyrics (list): List of lyric dictionaries dengan timestamps
             output_ratio (str): 'landscape' atau 'portrait'
+            audio_path (str): Path audio untuk video ini (default: self.audio_path)
+            decoded_audio (DecodedAudio): PCM yang sudah di-decode (opsional),
+                                          durasinya dipakai tanpa probe ulang
             
         Returns:
             str: Path ke video output
         """
-        try:
-            # Load audio file
-            audio_clip = AudioFileClip(self.audio_path)
+        output_videos = self.generate_videos(lyrics, output_ratio, audio_path, decoded_audio)
+        return output_videos[0] if output_videos else None
+        
+    def generate_videos(self, lyrics, output_ratio="landscape", audio_path=None, decoded_audio=None):
+        """
+        Generate semua video untuk satu lagu: satu file, atau satu file per
+        variant kalau self.variants diisi (output_ratio diabaikan)
+        
+        Parameters: sama dengan generate_video
             
+        Returns:
+            list: Path video output (kosong kalau gagal)
+        """
+        audio_path = audio_path or self.audio_path
+        
+        try:
             # Load background image
             if os.path.isdir(self.background_image_path):
                 bg_image_path = self.random_background_image(self.background_image_path)
@@ -275,59 +755,363 @@ class VideoGenerator:
                 
             print(f"Using background image: {os.path.basename(bg_image_path)}")
             
-            # Generate video berdasarkan ratio
-            if output_ratio.lower() == "portrait":
-                print("Generating portrait video (9:16)...")
-                final_clip = self.make_portrait_video(lyrics, audio_clip, bg_image_path)
+            if self.variants:
+                variants = ", ".join(f"{ratio} {quality}" for ratio, quality in self.variants)
+                print(f"Rendering variants ({variants}); output ratio '{output_ratio}' is overridden")
+                
+            if self.render_mode == "soft":
+                if self.variants:
+                    return [
+                        self.generate_video_soft(lyrics, ratio, audio_path, bg_image_path, quality=quality)
+                        for ratio, quality in self.unique_variants()
+                    ]
+                return [self.generate_video_soft(lyrics, output_ratio, audio_path, bg_image_path)]
+                
+            if self.render_mode == "ass":
+                effect_name = self.effect_name()
+                if AssRenderer.supports(effect_name):
+                    if self.variants:
+                        return [
+                            self.generate_video_ass(lyrics, ratio, audio_path, bg_image_path, quality=quality)
+                            for ratio, quality in self.unique_variants()
+                        ]
+                    return [self.generate_video_ass(lyrics, output_ratio, audio_path, bg_image_path)]
+                print(f"Effect '{effect_name}' is not supported by ASS render mode, using moviepy")
+                
+            if self.variants:
+                outputs = self.generate_video_variants(lyrics, self.variants, audio_path, bg_image_path)
+                # Urutan sesuai self.variants, tanpa duplikat
+                return list(dict.fromkeys(outputs[(ratio, quality)] for ratio, quality in self.variants))
+                
+            if self.render_shards > 1:
+                return [self.generate_video_sharded(lyrics, output_ratio, audio_path, bg_image_path)]
+                
+            if self.frame_writer == "ring":
+                return [self.generate_video_piped(lyrics, output_ratio, audio_path, bg_image_path)]
+                
+            # Durasi audio (dari PCM yang sudah di-decode atau dari header file)
+            if decoded_audio is not None:
+                duration = decoded_audio.duration
             else:
-                print("Generating landscape video (16:9)...")
-                final_clip = self.make_landscape_video(lyrics, audio_clip, bg_image_path)
+                duration = self.render_duration(audio_path, lyrics)
                 
             # Output filename
-            audio_basename = os.path.splitext(os.path.basename(self.audio_path))[0]
-            output_file = os.path.join(self.output_path, f"{audio_basename}_lyric_video.mp4")
-            
-            # Set codec dan bitrate berdasarkan quality
-            codec = "libx264"
-            if self.quality == "4K":
-                bitrate = "20000k"
-            elif self.quality == "1080p":
-                bitrate = "8000k"
-            else:  # 720p
-                bitrate = "4000k"
-                
-            # Write output video file
-            print(f"Rendering video to: {output_file}")
-            final_clip.write_videofile(
-                output_file,
-                codec=codec,
-                bitrate=bitrate,
-                audio_codec="aac",
-                audio_bitrate="320k",
-                fps=30,
-                threads=4,
-                preset="medium"
-            )
+            output_file = self.output_file_for(audio_path)
+            work_dir = tempfile.mkdtemp(prefix="alvg_render_")
             
+            audio = None
+            try:
+                # Audio di-copy apa adanya, atau di-transcode sekali di background selama video dirender
+                audio = AudioMuxer.prepare(audio_path, work_dir)
+                
+                # Generate video berdasarkan ratio
+                if output_ratio.lower() == "portrait":
+                    print("Generating portrait video (9:16)...")
+                    final_clip = self.compose_video(lyrics, duration, bg_image_path, "portrait")
+                else:
+                    print("Generating landscape video (16:9)...")
+                    final_clip = self.compose_video(lyrics, duration, bg_image_path, "landscape")
+                    
+                if isinstance(final_clip, LyricCompositor):
+                    static_time = sum(end - start for start, end in final_clip.static_runs())
+                    print(f"Static screen time: {static_time:.1f}s of {final_clip.duration:.1f}s")
+                    
+                # Write video (tanpa audio), lalu mux dengan audio tanpa re-encode
+                print(f"Rendering video to: {output_file}")
+                video_path = os.path.join(work_dir, "video.mp4")
+                final_clip.write_videofile(
+                    video_path,
+                    audio=False,
+                    **self.encoder_settings()
+                )
+                AudioMuxer.mux(ffmpeg.input(video_path).video, audio, output_file)
+            finally:
+                if audio is not None:
+                    audio.cancel()
+                shutil.rmtree(work_dir, ignore_errors=True)
+                
             print(f"✓ Video generated successfully: {output_file}")
-            return output_file
+            if isinstance(final_clip, LyricCompositor):
+                layers = final_clip.stats()
+                print(f"Active lyric layers per frame: mean {layers['mean_active']:.2f}, max {layers['max_active']}, "
+                      f"blended area {layers['dirty_fraction'] * 100:.1f}% of frame, "
+                      f"{layers['static_frames']} static frames reused")
+            stats = get_text_raster_cache().stats()
+            print(f"Text raster cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['entries']} entries ({stats['size_mb']:.1f} MB)")
+            return [output_file]
             
         except Exception as e:
             print(f"✗ Error generating video: {str(e)}")
             traceback.print_exc()
-            return None
+            return []
+            
+    def output_file_for(self, audio_path):
+        """
+        Path video output untuk file audio
+        """
+        audio_basename = os.path.splitext(os.path.basename(audio_path))[0]
+        return os.path.join(self.output_path, f"{audio_basename}_lyric_video.mp4")
+        
+    def video_bitrate(self, quality=None):
+        """
+        Bitrate video berdasarkan quality (default: self.quality)
+        """
+        quality = quality or self.quality
+        if quality == "4K":
+            return "20000k"
+        elif quality == "1080p":
+            return "8000k"
+        else:  # 720p
+            return "4000k"
+            
+    def write_background(self, bg_image_path, screen_size, work_dir):
+        """
+        Simpan background yang sudah di-resize/crop ke ukuran video sebagai PNG
+        
+        Returns:
+            str: Path file PNG
+        """
+        background_path = os.path.join(work_dir, "background.png")
+        Image.fromarray(self.resize_background(bg_image_path, screen_size)).convert("RGB").save(background_path)
+        return background_path
+        
+    def generate_video_soft(self, lyrics, output_ratio, audio_path, bg_image_path, quality=None):
+        """
+        Output cepat: background still + audio + lirik sebagai track subtitle
+        
+        Parameters:
+            quality (str): Quality variant (opsional); kalau diisi, ukuran dan
+                           nama file mengikuti variant (ratio, quality)
+        
+        Returns:
+            str: Path ke video output
+        """
+        extension = SoftSubtitleMuxer.output_extension(self.subtitle_format)
+        if quality:
+            screen_size = self.variant_size(output_ratio, quality)
+            output_file = self.variant_output_file(audio_path, output_ratio, quality)
+        else:
+            screen_size = self.frame_size(output_ratio)
+            output_file = self.output_file_for(audio_path)
+        output_file = os.path.splitext(output_file)[0] + extension
+        work_dir = tempfile.mkdtemp(prefix="alvg_soft_")
+        
+        try:
+            background_path = self.write_background(bg_image_path, screen_size, work_dir)
+            
+            print(f"Muxing still + audio + {self.subtitle_format} lyrics to: {output_file}")
+            SoftSubtitleMuxer.mux(background_path, audio_path, lyrics, output_file,
+                                  subtitle_format=self.subtitle_format,
+                                  language=self.language,
+                                  audio_codec=AudioMuxer.audio_codec(audio_path, extension))
+            
+            print(f"✓ Video generated successfully: {output_file}")
+            return output_file
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            
+    def generate_video_ass(self, lyrics, output_ratio, audio_path, bg_image_path, quality=None):
+        """
+        Render video lewat ffmpeg + subtitle ASS (tanpa render frame di Python)
+        
+        Parameters:
+            lyrics (list): List of lyric dictionaries dengan timestamps
+            output_ratio (str): 'landscape' atau 'portrait'
+            audio_path (str): Path audio
+            bg_image_path (str): Gambar background (di-resize/crop sama seperti jalur moviepy)
+            quality (str): Quality variant (opsional); kalau diisi, ukuran, bitrate
+                           dan nama file mengikuti variant (ratio, quality)
+            
+        Returns:
+            str: Path ke video output
+        """
+        if quality:
+            screen_size = self.variant_size(output_ratio, quality)
+            # Script ditulis di ukuran variant terbesar dengan ratio yang sama; libass
+            # men-scale-nya ke ukuran video, sama seperti downscale di jalur moviepy
+            script_size = self.variant_render_size(output_ratio)
+            output_file = self.variant_output_file(audio_path, output_ratio, quality)
+        else:
+            screen_size = script_size = self.frame_size(output_ratio)
+            output_file = self.output_file_for(audio_path)
+        work_dir = tempfile.mkdtemp(prefix="alvg_ass_")
+        
+        try:
+            background_path = self.write_background(bg_image_path, screen_size, work_dir)
+            
+            script_path = os.path.join(work_dir, "lyrics.ass")
+            script = AssRenderer.build_script(
+                lyrics,
+                effect_name=self.effect_name(),
+                font=self.font,
+                font_size=self.font_size,
+                font_color=self.font_color,
+                position=self.text_position,
+                screen_size=script_size,
+                gradient_colors=self.gradient_colors() if self.color_effect == "gradient" else None
+            )
+            with open(script_path, "w", encoding="utf-8") as f:
+                f.write(script)
+                
+            print(f"Rendering video with ffmpeg/ASS to: {output_file}")
+            AssRenderer.render(script_path, background_path, audio_path, output_file,
+                               font=self.font, fps=self.FPS, bitrate=self.video_bitrate(quality),
+                               audio_codec=AudioMuxer.audio_codec(audio_path))
+            
+            print(f"✓ Video generated successfully: {output_file}")
+            return output_file
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            
+    def find_audio_file(self, filename, audio_dir=""):
+        """
+        Cari file audio yang cocok dengan nama file hasil transkripsi
+        
+        Parameters:
+            filename (str): Nama file tanpa ekstensi (key dari lyrics_dict)
+            audio_dir (str): Direktori audio yang dicek pertama kali (opsional)
             
-    def batch_generate(self, lyrics_dict, output_ratio="landscape"):
+        Returns:
+            str or None: Path ke file audio, None kalau tidak ketemu
+        """
+        # Cari file audio yang sesuai dengan nama file dari hasil transkripsi
+        found = False
+        audio_path = None
+        
+        # List ekstensi audio yang mungkin
+        extensions = ['.mp3', '.wav', '.flac', '.ogg', '.m4a']
+        
+        # Debug info for current file
+        print(f"\nTrying to match audio file for: {filename}")
+        
+        # CARA 1: Coba cari di direktori yang sama dengan audio_path yang diatur sebelumnya
+        if audio_dir:
+            for ext in extensions:
+                potential_path = os.path.join(audio_dir, f"{filename}{ext}")
+                print(f"Checking: {potential_path}")
+                if os.path.exists(potential_path):
+                    audio_path = potential_path
+                    found = True
+                    print(f"FOUND at audio_dir: {audio_path}")
+                    break
+        
+        # CARA 2: Jika tidak ditemukan, coba cari di direktori audio yang dipilih (self.audio_folder)
+        if not found and hasattr(self, 'audio_folder') and self.audio_folder:
+            for ext in extensions:
+                potential_path = os.path.join(self.audio_folder, f"{filename}{ext}")
+                print(f"Checking: {potential_path}")
+                if os.path.exists(potential_path):
+                    audio_path = potential_path
+                    found = True
+                    print(f"FOUND at audio_folder: {audio_path}")
+                    break
+        
+            # CARA 2.1: Cari dengan nama file lengkap (bukan hanya base filename)
+            if not found:
+                # List semua file di direktori audio
+                audio_files = [f for f in os.listdir(self.audio_folder) if os.path.splitext(f)[1].lower() in [e.lower() for e in extensions]]
+                for audio_file in audio_files:
+                    base_name = os.path.splitext(audio_file)[0]
+                    if base_name == filename or filename in base_name:
+                        audio_path = os.path.join(self.audio_folder, audio_file)
+                        found = True
+                        print(f"FOUND by similar name: {audio_path}")
+                        break
+        
+        # CARA 3: Jika tidak ditemukan, coba cari di direktori saat ini
+        if not found:
+            for ext in extensions:
+                potential_path = f"{filename}{ext}"
+                print(f"Checking: {potential_path}")
+                if os.path.exists(potential_path):
+                    audio_path = potential_path
+                    found = True
+                    print(f"FOUND at current dir: {audio_path}")
+                    break
+        
+        return audio_path if found else None
+        
+    def plan_batch(self, lyrics_dict, fps=30):
+        """
+        Bikin rencana job batch: cari file audio dan estimasi durasi/frame
+        tiap lagu dari header audio (tanpa decode)
+        
+        Parameters:
+            lyrics_dict (dict): Dictionary {filename: lyrics}
+            fps (int): Frame rate output untuk estimasi jumlah frame
+            
+        Returns:
+            list: List of dict {'filename', 'audio_path', 'lyrics', 'duration', 'frames'}
+        """
+        audio_dir = os.path.dirname(self.audio_path) if self.audio_path else ""
+        jobs = []
+        
+        for filename, lyrics in lyrics_dict.items():
+            audio_path = self.find_audio_file(filename, audio_dir)
+            if audio_path is None:
+                print(f"✗ Cannot find audio file for {filename}")
+                continue
+                
+            try:
+                duration = AudioProbe.get_duration(audio_path)
+            except Exception as e:
+                print(f"Probe failed for {os.path.basename(audio_path)}: {str(e)}")
+                duration = None
+                
+            # Fallback: pakai akhir lirik terakhir sebagai perkiraan
+            if not duration:
+                duration = max((lyric['end'] for lyric in lyrics), default=0.0)
+                
+            jobs.append({
+                'filename': filename,
+                'audio_path': audio_path,
+                'lyrics': lyrics,
+                'duration': duration,
+                'frames': int(duration * fps)
+            })
+            
+        return jobs
+        
+    @staticmethod
+    def plan_cpu_budget(workers, job_count, total_cores=None, min_cores_per_job=2):
+        """
+        Bagi budget core antara jumlah lagu yang jalan bersamaan dan thread encoder
+        
+        Tiap lagu butuh satu core untuk compositing di Python, sisa core jatahnya
+        dipakai thread x264.
+        
+        Parameters:
+            workers (int): Maksimal lagu yang dirender bersamaan
+            job_count (int): Jumlah lagu
+            total_cores (int): Budget core global (default: semua core)
+            min_cores_per_job (int): Minimal core per lagu
+            
+        Returns:
+            tuple: (jumlah worker, thread encoder per worker)
+        """
+        total_cores = total_cores or os.cpu_count() or 1
+        workers = max(1, min(workers, job_count, total_cores // min_cores_per_job))
+        cores_per_job = total_cores // workers
+        # 1 core untuk compositing, sisanya untuk encoder
+        return workers, max(1, cores_per_job - 1)
+        
+    def batch_generate(self, lyrics_dict, output_ratio="landscape", workers=1, total_cores=None):
         """
         Generate multiple videos dari dictionary lyrics
         
         Parameters:
             lyrics_dict (dict): Dictionary {filename: lyrics}
             output_ratio (str): 'landscape' atau 'portrait'
+            workers (int): Jumlah lagu yang dirender bersamaan di worker process (1 = berurutan)
+            total_cores (int): Budget core global untuk mode paralel (default: semua core)
             
         Returns:
             list: List of output video paths
         """
+        if workers and workers > 1 and len(lyrics_dict) > 1:
+            return self._batch_generate_parallel(lyrics_dict, output_ratio, workers, total_cores)
+            
         output_videos = []
         
         # Mendapatkan direktori audio
@@ -342,76 +1126,48 @@ class VideoGenerator:
         
         for filename, lyrics in tqdm(lyrics_dict.items(), desc="Generating videos"):
             try:
-                # Cari file audio yang sesuai dengan nama file dari hasil transkripsi
-                found = False
-                audio_path = None
-                
-                # List ekstensi audio yang mungkin
-                extensions = ['.mp3', '.wav', '.flac', '.ogg', '.m4a']
-                
-                # Debug info for current file
-                print(f"\nTrying to match audio file for: {filename}")
+                audio_path = self.find_audio_file(filename, audio_dir)
                 
-                # CARA 1: Coba cari di direktori yang sama dengan audio_path yang diatur sebelumnya
-                if audio_dir:
-                    for ext in extensions:
-                        potential_path = os.path.join(audio_dir, f"{filename}{ext}")
-                        print(f"Checking: {potential_path}")
-                        if os.path.exists(potential_path):
-                            audio_path = potential_path
-                            found = True
-                            print(f"FOUND at audio_dir: {audio_path}")
-                            break
-                
-                # CARA 2: Jika tidak ditemukan, coba cari di direktori audio yang dipilih (self.audio_folder)
-                if not found and hasattr(self, 'audio_folder') and self.audio_folder:
-                    for ext in extensions:
-                        potential_path = os.path.join(self.audio_folder, f"{filename}{ext}")
-                        print(f"Checking: {potential_path}")
-                        if os.path.exists(potential_path):
-                            audio_path = potential_path
-                            found = True
-                            print(f"FOUND at audio_folder: {audio_path}")
-                            break
-                            
-                    # CARA 2.1: Cari dengan nama file lengkap (bukan hanya base filename)
-                    if not found:
-                        # List semua file di direktori audio
-                        audio_files = [f for f in os.listdir(self.audio_folder) if os.path.splitext(f)[1].lower() in [e.lower() for e in extensions]]
-                        for audio_file in audio_files:
-                            base_name = os.path.splitext(audio_file)[0]
-                            if base_name == filename or filename in base_name:
-                                audio_path = os.path.join(self.audio_folder, audio_file)
-                                found = True
-                                print(f"FOUND by similar name: {audio_path}")
-                                break
-                
-                # CARA 3: Jika tidak ditemukan, coba cari di direktori saat ini
-                if not found:
-                    for ext in extensions:
-                        potential_path = f"{filename}{ext}"
-                        print(f"Checking: {potential_path}")
-                        if os.path.exists(potential_path):
-                            audio_path = potential_path
-                            found = True
-                            print(f"FOUND at current dir: {audio_path}")
-                            break
-                
-                if not found:
+                if audio_path is None:
                     print(f"✗ Cannot find audio file for {filename}")
                     continue
                 
-                # Set audio path untuk generator ini
-                self.audio_path = audio_path
-                
                 # Generate video
                 print(f"Generating video for {filename} using audio: {audio_path}")
-                output_video = self.generate_video(lyrics, output_ratio)
-                if output_video:
-                    output_videos.append(output_video)
+                output_videos.extend(self.generate_videos(lyrics, output_ratio, audio_path=audio_path))
                     
             except Exception as e:
                 print(f"✗ Error processing {filename}: {str(e)}")
                 traceback.print_exc()
                 
-        return output_videos 
\ No newline at end of file
+        return output_videos 
+        
+    def _batch_generate_parallel(self, lyrics_dict, output_ratio, workers, total_cores=None):
+        """
+        Render beberapa lagu bersamaan di worker process
+        
+        Lagu diurutkan dari yang paling panjang supaya lagu panjang tidak
+        tertinggal di akhir sendirian. Hasil dikembalikan sesuai urutan lyrics_dict.
+        """
+        jobs = self.plan_batch(lyrics_dict, fps=self.FPS)
+        if not jobs:
+            return []
+            
+        workers, encoder_threads = self.plan_cpu_budget(workers, len(jobs), total_cores)
+        print(f"Rendering {len(jobs)} videos with {workers} workers, {encoder_threads} encoder thread(s) each")
+        
+        order = sorted(range(len(jobs)), key=lambda i: jobs[i]['duration'], reverse=True)
+        tasks = [(i, self, jobs[i]['lyrics'], output_ratio, jobs[i]['audio_path'], encoder_threads) for i in order]
+        
+        # Per lagu: list path output (satu file, atau satu per variant)
+        results = [[] for _ in jobs]
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers) as pool:
+            # imap_unordered (chunksize=1): worker yang selesai langsung ambil lagu berikutnya
+            for index, output_videos, error in tqdm(pool.imap_unordered(_batch_video_worker, tasks),
+                                                    total=len(tasks), desc="Generating videos"):
+                if error:
+                    print(f"✗ Error processing {jobs[index]['filename']}:\n{error}")
+                results[index] = output_videos or []
+                
+        return [output_video for output_videos in results for output_video in output_videos]
\ No newline at end of file